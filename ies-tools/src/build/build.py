@@ -10,6 +10,8 @@ from typing import List, Optional
 
 import click
 
+from ..cli import LazyGroup
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -43,9 +45,13 @@ class DiagramBuilder:
     }
     OUTPUT_FORMATS = ['.svg', '.png']
 
-    def __init__(self, root_dir: Path):
+    # Upper bound in seconds on a single diagram layout
+    LAYOUT_TIMEOUT = 300
+
+    def __init__(self, root_dir: Path, layout_timeout: Optional[float] = LAYOUT_TIMEOUT):
         """Initialize with project root directory."""
         self.root_dir = Path(root_dir)
+        self.layout_timeout = layout_timeout
         self.docs_diagrams = self.root_dir / 'docs' / 'diagrams'
         self.build_diagrams = self.root_dir / 'build' / 'docs' / 'diagrams'
 
@@ -123,7 +129,8 @@ class DiagramBuilder:
                     str(source)
                 ],
                 capture_output=True,
-                check=True
+                check=True,
+                timeout=self.layout_timeout
             )
             logger.info(f"Generated {output} from {source}")
             return True
@@ -131,6 +138,12 @@ class DiagramBuilder:
         except subprocess.CalledProcessError as e:
             logger.error(f"Failed to generate Graphviz diagram: {e.stderr}")
             return False
+        except subprocess.TimeoutExpired:
+            logger.error(
+                f"Graphviz layout of {source} exceeded {self.layout_timeout}s; "
+                "consider `ies-build diagram-from-ontology` with a lower --sfdp-threshold"
+            )
+            return False
 
     def generate_all_diagrams(self) -> None:
         """Generate all diagrams in specified output formats from docs/diagrams/."""
@@ -168,7 +181,68 @@ class DiagramBuilder:
             raise click.ClickException(f"Diagram generation failed: {e}")
 
 
-@click.group()
+@click.group(
+    cls=LazyGroup,
+    package=__package__,
+    lazy_subcommands={
+        'diagram-from-ontology': (
+            'ontology_diagram:diagram_from_ontology',
+            "Generate the ontology overview diagram from the ontology.",
+        ),
+        'docs': (
+            'reference_docs:docs',
+            "Generate the HTML term reference from the ontology.",
+        ),
+        'endpoint': (
+            'endpoint:endpoint',
+            "Serve the ontology and data over the SPARQL 1.1 protocol.",
+        ),
+        'extract-module': (
+            'import_modules:extract_module',
+            "Extract modules of the imports for the terms the project uses.",
+        ),
+        'find-term': (
+            'term_index:find_term',
+            "Search term labels and definitions.",
+        ),
+        'history': (
+            'history:history',
+            "Ontology metrics for every commit in the history of a branch.",
+        ),
+        'index-terms': (
+            'term_index:index_terms',
+            "Build or update the full-text term index.",
+        ),
+        'lint': (
+            'daemon:lint',
+            "Check the ontology's terms for common modelling issues.",
+        ),
+        'load-turtle': (
+            'turtle_loader:load_turtle_command',
+            "Parse large Turtle files in parallel and report throughput.",
+        ),
+        'query': (
+            'daemon:query',
+            "Run a SPARQL query over the ontology, its imports and the data.",
+        ),
+        'reason': (
+            'reasoner:reason',
+            "Materialise RDFS and OWL 2 RL inferences.",
+        ),
+        'serve': (
+            'daemon:serve',
+            "Keep the ontology loaded and answer check requests over a socket.",
+        ),
+        'test': (
+            'daemon:test_command',
+            "Run the SPARQL tests.",
+        ),
+        'validate': (
+            'daemon:validate',
+            "Run the validation queries and SHACL shapes.",
+        ),
+    },
+)
 def cli():
     """Build tools for documentation and ontology generation."""
     pass
@@ -0,0 +1,255 @@
+"""Lint, SPARQL test and validation checks over a Workspace.
+
+Every check returns plain JSON-friendly data so that the same code serves the
+command line, in-process runs and requests to the `ies-build serve` daemon.
+
+SPARQL test files hold several queries, each introduced by a comment such as
+`# Test 1: ...`, `# Query 2: ...` or `# CQ3: ...`; PREFIX lines before the
+first of them apply to all. A SELECT query is a check for violations and
+passes when it returns no rows, except under `tests/integration`, where
+queries are competency questions and pass when they return rows. An ASK
+query passes when it is true.
+"""
+
+import logging
+import re
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import click
+
+from .ontology import (
+    CLASS_TYPES,
+    PROPERTY_TYPES,
+    RDF_TYPE,
+    RDFS_DOMAIN,
+    RDFS_LABEL,
+    RDFS_RANGE,
+    RDFS_SUBCLASSOF,
+    RDFS_SUBPROPERTYOF,
+    SKOS_DEFINITION,
+    SKOS_PREFLABEL,
+    is_builtin,
+)
+from .workspace import Workspace
+
+logger = logging.getLogger(__name__)
+
+ONTOLOGY_DIR = Path('src') / 'ontology'
+TEST_DIRS = [Path('tests') / 'unit', Path('tests') / 'integration']
+COMPETENCY_DIR = Path('tests') / 'integration'
+VALIDATION_QUERIES_DIR = Path('tests') / 'validation' / 'queries'
+SHAPES_DIR = Path('tests') / 'validation' / 'shapes'
+
+_TITLE = re.compile(r'^#\s*((?:Test|Query|CQ|UC|Use[ -]case)\s*\d+\b.*)$', re.IGNORECASE)
+_PREFIX = re.compile(r'^\s*(PREFIX|BASE)\b', re.IGNORECASE)
+_QUERY_FORM = re.compile(r'\b(SELECT|ASK|CONSTRUCT|DESCRIBE)\b', re.IGNORECASE)
+
+
+@dataclass
+class Issue:
+    """A lint finding."""
+    rule: str
+    severity: str
+    term: str
+    message: str
+
+
+@dataclass
+class QueryCheck:
+    """The outcome of one query from a SPARQL test file."""
+    file: str
+    title: str
+    status: str
+    rows: int
+    message: str = ''
+    elapsed_ms: float = 0.0
+
+
+def split_queries(text: str) -> List[Tuple[str, str]]:
+    """(title, query) pairs from a multi-query SPARQL file."""
+    header: List[str] = []
+    blocks: List[Tuple[str, List[str]]] = []
+    for line in text.splitlines():
+        title = _TITLE.match(line.strip())
+        if title:
+            blocks.append((title.group(1).strip(), []))
+        elif blocks:
+            blocks[-1][1].append(line)
+        else:
+            header.append(line)
+    if not blocks:
+        blocks = [('Query', header)]
+        header = []
+    prefixes = [line for line in header if _PREFIX.match(line)]
+    return [
+        (title, '\n'.join(prefixes + lines).strip())
+        for title, lines in blocks
+        if _QUERY_FORM.search('\n'.join(line for line in lines if not line.lstrip().startswith('#')))
+    ]
+
+
+def sparql_files(root: Path, directories: Sequence[Path]) -> List[Path]:
+    files: List[Path] = []
+    for directory in directories:
+        files += sorted((Path(root) / directory).rglob('*.sparql'))
+    return files
+
+
+def run_query_file(workspace: Workspace, path: Path) -> List[QueryCheck]:
+    """Run every query in a SPARQL test file and judge the results."""
+    path = Path(path) if Path(path).is_absolute() else workspace.root / path
+    try:
+        relative = path.resolve().relative_to(workspace.root)
+    except ValueError:
+        relative = path
+    competency = relative.parts[:len(COMPETENCY_DIR.parts)] == COMPETENCY_DIR.parts
+    checks = []
+    for title, query in split_queries(path.read_text(encoding='utf-8')):
+        start = time.perf_counter()
+        try:
+            result = workspace.query(query)
+        except click.ClickException as e:
+            checks.append(QueryCheck(str(relative), title, 'error', 0, e.message))
+            continue
+        elapsed = round((time.perf_counter() - start) * 1000, 2)
+        if result['type'] == 'ASK':
+            passed, rows = result['boolean'], int(result['boolean'])
+            message = '' if passed else 'ASK returned false'
+        elif result['type'] == 'SELECT':
+            rows = len(result['rows'])
+            passed = rows > 0 if competency else rows == 0
+            message = '' if passed else ('no answers' if competency else f"{rows} violation(s)")
+        else:
+            passed, rows, message = True, 0, ''
+        checks.append(QueryCheck(str(relative), title, 'pass' if passed else 'fail', rows, message, elapsed))
+    return checks
+
+
+def run_tests(workspace: Workspace, paths: Optional[Sequence[Path]] = None) -> Dict[str, object]:
+    """Run the SPARQL test suites (or the given files) against the workspace."""
+    files = [Path(p) for p in paths] if paths else sparql_files(workspace.root, TEST_DIRS)
+    checks: List[QueryCheck] = []
+    for path in files:
+        checks += run_query_file(workspace, path)
+    return _summary(checks)
+
+
+def _summary(checks: List[QueryCheck]) -> Dict[str, object]:
+    return {
+        'ok': all(c.status == 'pass' for c in checks),
+        'passed': sum(c.status == 'pass' for c in checks),
+        'failed': sum(c.status == 'fail' for c in checks),
+        'errors': sum(c.status == 'error' for c in checks),
+        'checks': [asdict(c) for c in checks],
+    }
+
+
+def local_ontology_files(workspace: Workspace) -> List[Path]:
+    """Loaded files that belong to this repository's ontology (src/ontology)."""
+    ontology_dir = (workspace.root / ONTOLOGY_DIR).resolve()
+    return [p for p in workspace.loaded if ontology_dir in p.parents]
+
+
+def lint(workspace: Workspace) -> Dict[str, object]:
+    """Modelling issues in the terms declared by the local ontology."""
+    from rdflib import URIRef
+
+    union = workspace.graph()
+    declared = {str(s) for s in union.subjects(URIRef(RDF_TYPE), None) if isinstance(s, URIRef)}
+    term_types = CLASS_TYPES | PROPERTY_TYPES
+
+    local_terms: Dict[str, str] = {}
+    for path in local_ontology_files(workspace):
+        graph = workspace.graph(path)
+        for subject, type_iri in graph.subject_objects(URIRef(RDF_TYPE)):
+            if isinstance(subject, URIRef) and str(type_iri) in term_types and not is_builtin(str(subject)):
+                local_terms.setdefault(str(subject), str(type_iri))
+
+    issues: List[Issue] = []
+    labels: Dict[str, List[str]] = {}
+    for term in sorted(local_terms):
+        node = URIRef(term)
+        term_labels = [str(o) for p in (RDFS_LABEL, SKOS_PREFLABEL) for o in union.objects(node, URIRef(p))]
+        if not term_labels:
+            issues.append(Issue('missing-label', 'error', term, "No rdfs:label or skos:prefLabel"))
+        for label in set(term_labels):
+            labels.setdefault(label.lower(), []).append(term)
+        if not any(True for _ in union.objects(node, URIRef(SKOS_DEFINITION))):
+            issues.append(Issue('missing-definition', 'warning', term, "No skos:definition"))
+        for predicate in (RDFS_SUBCLASSOF, RDFS_SUBPROPERTYOF, RDFS_DOMAIN, RDFS_RANGE):
+            for target in union.objects(node, URIRef(predicate)):
+                if isinstance(target, URIRef) and not is_builtin(str(target)) and str(target) not in declared:
+                    issues.append(Issue(
+                        'undefined-reference',
+                        'warning' if workspace.unresolved_imports else 'error',
+                        term,
+                        f"{predicate.rsplit('#', 1)[-1]} refers to undeclared {target}",
+                    ))
+    for label, terms in sorted(labels.items()):
+        if len(terms) > 1:
+            for term in terms:
+                issues.append(Issue('duplicate-label', 'warning', term, f"Label '{label}' is shared by {len(terms)} terms"))
+    for iri in sorted(workspace.unresolved_imports):
+        issues.append(Issue('unresolved-import', 'warning', iri, "owl:imports not mapped to a local file in catalog.xml"))
+
+    return {
+        'ok': not any(i.severity == 'error' for i in issues),
+        'terms': len(local_terms),
+        'issues': [asdict(i) for i in issues],
+    }
+
+
+def validate(workspace: Workspace) -> Dict[str, object]:
+    """Validation queries, plus SHACL shapes when pyshacl is installed."""
+    checks: List[QueryCheck] = []
+    for path in sparql_files(workspace.root, [VALIDATION_QUERIES_DIR]):
+        checks += run_query_file(workspace, path)
+    summary = _summary(checks)
+
+    shapes = sorted((workspace.root / SHAPES_DIR).glob('*.ttl'))
+    summary['shacl'] = validate_shapes(workspace, shapes) if shapes else None
+    if summary['shacl'] and summary['shacl'].get('conforms') is False:
+        summary['ok'] = False
+    return summary
+
+
+def validate_shapes(workspace: Workspace, shapes: Sequence[Path]) -> Dict[str, object]:
+    try:
+        from pyshacl import validate as shacl_validate
+    except ImportError:
+        return {'skipped': "pyshacl is not installed"}
+    from rdflib import Graph
+
+    shapes_graph = Graph()
+    for path in shapes:
+        shapes_graph.parse(path, format='turtle')
+    conforms, _, text = shacl_validate(workspace.graph(), shacl_graph=shapes_graph)
+    return {'conforms': bool(conforms), 'report': '' if conforms else text}
+
+
+def find_term(workspace: Workspace, query: str, limit: int = 10) -> Dict[str, object]:
+    """Term search over the closure, reusing the persistent term index."""
+    matches = workspace.term_index().search(query, limit=limit)
+    return {'matches': [dict(m.record, score=round(m.score, 3)) for m in matches]}
+
+
+# Request name -> handler(workspace, args)
+OPERATIONS: Dict[str, Callable[[Workspace, Dict[str, object]], object]] = {
+    'lint': lambda ws, args: lint(ws),
+    'test': lambda ws, args: run_tests(ws, args.get('paths')),
+    'validate': lambda ws, args: validate(ws),
+    'query': lambda ws, args: ws.query(str(args['query'])),
+    'find-term': lambda ws, args: find_term(ws, str(args['query']), int(args.get('limit', 10))),
+    'status': lambda ws, args: ws.status(),
+}
+
+
+def handle(workspace: Workspace, op: str, args: Optional[Dict[str, object]] = None) -> object:
+    """Bring the workspace up to date and run one operation."""
+    if op not in OPERATIONS:
+        raise click.ClickException(f"Unknown operation: {op}")
+    workspace.refresh()
+    return OPERATIONS[op](workspace, args or {})
@@ -0,0 +1,360 @@
+"""Resident daemon that keeps the workspace warm, and its thin client.
+
+`ies-build serve` loads the imports closure once and answers requests over a
+Unix domain socket. Before each request it re-parses only the files that
+changed since the last one, so pre-commit hooks and editors pay neither for
+process start-up nor for parsing an unchanged ontology.
+
+The protocol is one JSON object per line in each direction:
+
+    -> {"version": 1, "root": "/path/to/repo", "reasoning": false, "modules": false, "op": "lint", "args": {}}
+    <- {"ok": true, "result": {...}}
+    <- {"ok": false, "error": "message"}
+
+Besides the operations in checks.OPERATIONS the daemon understands `ping`
+and `shutdown`. The `lint`, `test`, `validate` and `query` commands use the
+daemon when one is serving this repository in the same mode (`--reasoning`,
+`--modules`) and otherwise run in-process.
+"""
+
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import click
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = Path('.ies-build.sock')
+PROTOCOL_VERSION = 1
+CONNECT_TIMEOUT = 1.0
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is serving this repository on the socket."""
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.dispatch(line)
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Serves requests one at a time against a single Workspace."""
+
+    def __init__(self, socket_path: Path, workspace):
+        self.workspace = workspace
+        self.running = True
+        self.last_request = time.monotonic()
+        self.requests = 0
+        super().__init__(str(socket_path), _RequestHandler)
+
+    def dispatch(self, line: bytes) -> Dict[str, object]:
+        from .checks import handle
+
+        self.last_request = time.monotonic()
+        self.requests += 1
+        try:
+            request = json.loads(line)
+            if request.get('version') != PROTOCOL_VERSION:
+                return {'ok': False, 'error': f"Unsupported protocol version {request.get('version')}"}
+            if request.get('root') and Path(request['root']).resolve() != self.workspace.root:
+                return {'ok': False, 'error': 'wrong-root', 'root': str(self.workspace.root)}
+            op = request.get('op')
+            if op == 'ping':
+                return {'ok': True, 'result': {'pid': os.getpid(), 'root': str(self.workspace.root)}}
+            if op == 'shutdown':
+                self.running = False
+                return {'ok': True, 'result': None}
+            mode = (self.workspace.reasoning, self.workspace.modules)
+            if (bool(request.get('reasoning')), bool(request.get('modules'))) != mode:
+                return {'ok': False, 'error': 'wrong-mode', 'reasoning': self.workspace.reasoning,
+                        'modules': self.workspace.modules}
+            start = time.perf_counter()
+            result = handle(self.workspace, op, request.get('args') or {})
+            logger.info(f"{op} answered in {(time.perf_counter() - start) * 1000:.1f}ms")
+            return {'ok': True, 'result': result}
+        except click.ClickException as e:
+            return {'ok': False, 'error': e.message}
+        except Exception as e:
+            logger.exception(f"Request failed: {line[:200]!r}")
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+
+    def serve_until_stopped(self, idle_timeout: Optional[float] = None) -> None:
+        self.timeout = 1.0
+        while self.running:
+            self.handle_request()
+            if idle_timeout and time.monotonic() - self.last_request > idle_timeout:
+                logger.info(f"Idle for {idle_timeout:.0f}s, stopping")
+                break
+
+
+def send_request(
+        op: str,
+        args: Optional[Dict[str, object]] = None,
+        socket_path: Path = DEFAULT_SOCKET,
+        root: Path = Path('.'),
+        timeout: Optional[float] = None,
+        reasoning: bool = False,
+        modules: bool = False,
+) -> object:
+    """Send one request to the daemon and return its result.
+
+    Raises DaemonUnavailable when nothing is listening or the daemon serves a
+    different repository or mode, and ClickException when the
+    request itself failed.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(str(socket_path))
+        except OSError as e:
+            raise DaemonUnavailable(str(e))
+        sock.settimeout(timeout)
+        request = {'version': PROTOCOL_VERSION, 'root': str(Path(root).resolve()), 'reasoning': reasoning,
+                   'modules': modules, 'op': op, 'args': args or {}}
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as stream:
+            line = stream.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise DaemonUnavailable("daemon closed the connection")
+    response = json.loads(line)
+    if not response.get('ok'):
+        if response.get('error') == 'wrong-root':
+            raise DaemonUnavailable(f"daemon serves {response.get('root')}")
+        if response.get('error') == 'wrong-mode':
+            raise DaemonUnavailable(f"daemon runs with reasoning={response.get('reasoning')}, "
+                                    f"modules={response.get('modules')}")
+        raise click.ClickException(response.get('error', 'daemon request failed'))
+    return response.get('result')
+
+
+def run_request(
+        op: str,
+        args: Optional[Dict[str, object]] = None,
+        socket_path: Path = DEFAULT_SOCKET,
+        use_daemon: bool = True,
+        reasoning: bool = False,
+        modules: bool = False,
+) -> Tuple[object, bool]:
+    """Run an operation on the daemon if one is up, else in this process.
+
+    Returns the result and whether the daemon answered.
+    """
+    if use_daemon and Path(socket_path).exists():
+        try:
+            return send_request(op, args, socket_path, reasoning=reasoning, modules=modules), True
+        except DaemonUnavailable as e:
+            logger.debug(f"Daemon unavailable ({e}); running in-process")
+    from .checks import handle
+    from .workspace import Workspace
+
+    return handle(Workspace(Path('.'), reasoning=reasoning, modules=modules), op, args), False
+
+
+def _daemon_alive(socket_path: Path) -> bool:
+    try:
+        send_request('ping', socket_path=socket_path)
+        return True
+    except (DaemonUnavailable, click.ClickException):
+        return False
+
+
+_socket_option = click.option(
+    '--socket',
+    'socket_path',
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_SOCKET,
+    show_default=True,
+    help="Unix domain socket of the ies-build daemon"
+)
+_no_daemon_option = click.option('--no-daemon', is_flag=True, help="Always run in this process")
+_json_option = click.option('--json', 'as_json', is_flag=True, help="Print the result as JSON")
+_reasoning_option = click.option('--reasoning', is_flag=True,
+                                 help="Include RDFS and OWL 2 RL inferences")
+_modules_option = click.option('--modules', is_flag=True,
+                               help="Load the modules from `ies-build extract-module` in place of the imports")
+
+
+@click.command()
+@_socket_option
+@click.option('--idle-timeout', type=float, help="Stop after this many seconds without requests")
+@click.option('--stop', is_flag=True, help="Stop the daemon serving this socket")
+@_reasoning_option
+@_modules_option
+def serve(socket_path: Path, idle_timeout: Optional[float], stop: bool, reasoning: bool, modules: bool):
+    """Keep the ontology loaded and answer check requests over a socket."""
+    try:
+        if stop:
+            try:
+                send_request('shutdown', socket_path=socket_path)
+                click.echo("✅ Daemon stopped")
+            except DaemonUnavailable:
+                click.echo("No daemon is running")
+            return
+
+        if socket_path.exists():
+            if _daemon_alive(socket_path):
+                raise click.ClickException(f"A daemon is already serving {socket_path}")
+            socket_path.unlink()
+
+        from .workspace import Workspace
+
+        workspace = Workspace(Path('.'), reasoning=reasoning, modules=modules)
+        start = time.perf_counter()
+        workspace.refresh()
+        click.echo(f"📦 Loaded {len(workspace.loaded)} file(s) in {time.perf_counter() - start:.1f}s")
+
+        server = DaemonServer(socket_path, workspace)
+        signal.signal(signal.SIGTERM, lambda *_: setattr(server, 'running', False))
+        click.echo(f"🚀 Serving {workspace.root} on {socket_path} (pid {os.getpid()})")
+        try:
+            server.serve_until_stopped(idle_timeout)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            socket_path.unlink(missing_ok=True)
+        click.echo(f"👋 Daemon stopped after {server.requests} request(s)")
+
+    except click.ClickException as e:
+        click.echo(f"❌ Error: {str(e)}", err=True)
+        raise click.Abort()
+
+
+def _echo_checks(result: Dict[str, object]) -> None:
+    for check in result['checks']:
+        icon = {'pass': '✅', 'fail': '❌', 'error': '⚠️'}[check['status']]
+        detail = f" — {check['message']}" if check['message'] else ''
+        click.echo(f"{icon} {check['file']}: {check['title']}{detail}")
+    click.echo(f"\n{result['passed']} passed, {result['failed']} failed, {result['errors']} error(s)")
+
+
+@click.command()
+@_socket_option
+@_no_daemon_option
+@_reasoning_option
+@_modules_option
+@_json_option
+def lint(socket_path: Path, no_daemon: bool, reasoning: bool, modules: bool, as_json: bool):
+    """Check the ontology's terms for common modelling issues."""
+    try:
+        result, _ = run_request('lint', socket_path=socket_path, use_daemon=not no_daemon, reasoning=reasoning,
+                                modules=modules)
+        if as_json:
+            click.echo(json.dumps(result, indent=2))
+        else:
+            for issue in result['issues']:
+                icon = '❌' if issue['severity'] == 'error' else '⚠️'
+                click.echo(f"{icon} {issue['rule']}: {issue['term']} — {issue['message']}")
+            click.echo(f"\n{result['terms']} term(s) checked, {len(result['issues'])} issue(s)")
+        if not result['ok']:
+            raise click.ClickException("Lint found errors")
+
+    except click.ClickException as e:
+        click.echo(f"❌ Error: {str(e)}", err=True)
+        raise click.Abort()
+
+
+@click.command('test')
+@click.argument('paths', nargs=-1, type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@_socket_option
+@_no_daemon_option
+@_reasoning_option
+@_modules_option
+@_json_option
+def test_command(paths: Tuple[Path, ...], socket_path: Path, no_daemon: bool, reasoning: bool, modules: bool,
+                 as_json: bool):
+    """Run the SPARQL tests (all of tests/unit and tests/integration by default)."""
+    try:
+        args = {'paths': [str(p.resolve()) for p in paths]} if paths else {}
+        result, _ = run_request('test', args, socket_path=socket_path, use_daemon=not no_daemon,
+                                reasoning=reasoning, modules=modules)
+        if as_json:
+            click.echo(json.dumps(result, indent=2))
+        else:
+            _echo_checks(result)
+        if not result['ok']:
+            raise click.ClickException("Some SPARQL tests did not pass")
+
+    except click.ClickException as e:
+        click.echo(f"❌ Error: {str(e)}", err=True)
+        raise click.Abort()
+
+
+@click.command()
+@_socket_option
+@_no_daemon_option
+@_reasoning_option
+@_modules_option
+@_json_option
+def validate(socket_path: Path, no_daemon: bool, reasoning: bool, modules: bool, as_json: bool):
+    """Run the validation queries and SHACL shapes against the ontology and data."""
+    try:
+        result, _ = run_request('validate', socket_path=socket_path, use_daemon=not no_daemon,
+                                reasoning=reasoning, modules=modules)
+        if as_json:
+            click.echo(json.dumps(result, indent=2))
+        else:
+            _echo_checks(result)
+            shacl = result.get('shacl')
+            if shacl and 'skipped' in shacl:
+                click.echo(f"⚠️ SHACL validation skipped: {shacl['skipped']}")
+            elif shacl:
+                click.echo("✅ SHACL shapes conform" if shacl['conforms'] else f"❌ SHACL:\n{shacl['report']}")
+        if not result['ok']:
+            raise click.ClickException("Validation failed")
+
+    except click.ClickException as e:
+        click.echo(f"❌ Error: {str(e)}", err=True)
+        raise click.Abort()
+
+
+@click.command()
+@click.argument('query', required=False)
+@click.option('--file', '-f', 'query_file', type=click.Path(exists=True, dir_okay=False, path_type=Path),
+              help="Read the SPARQL query from a file")
+@_socket_option
+@_no_daemon_option
+@_reasoning_option
+@_modules_option
+@_json_option
+def query(query: Optional[str], query_file: Optional[Path], socket_path: Path, no_daemon: bool,
+          reasoning: bool, modules: bool, as_json: bool):
+    """Run a SPARQL query over the ontology, its imports and the data."""
+    try:
+        if query_file:
+            query = query_file.read_text(encoding='utf-8')
+        if not query:
+            raise click.ClickException("Give a QUERY or --file")
+        result, _ = run_request('query', {'query': query}, socket_path=socket_path, use_daemon=not no_daemon,
+                                reasoning=reasoning, modules=modules)
+        if as_json:
+            click.echo(json.dumps(result, indent=2))
+        elif result['type'] == 'SELECT':
+            click.echo('\t'.join(result['vars']))
+            for row in result['rows']:
+                click.echo('\t'.join('' if value is None else value for value in row))
+        elif result['type'] == 'ASK':
+            click.echo('true' if result['boolean'] else 'false')
+        else:
+            click.echo(result['turtle'])
+
+    except click.ClickException as e:
+        click.echo(f"❌ Error: {str(e)}", err=True)
+        raise click.Abort()
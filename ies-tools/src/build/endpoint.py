@@ -0,0 +1,419 @@
+"""Read-only SPARQL 1.1 protocol endpoint over the workspace.
+
+`ies-build endpoint` serves the ontology, its imports closure and the data
+over HTTP so that integration tests and downstream applications can query it
+without a triplestore:
+
+    GET  /sparql?query=...
+    POST /sparql   (application/x-www-form-urlencoded or application/sparql-query)
+    GET  /metrics  (Prometheus text format)
+
+Requests are handled on a fixed pool of worker threads. Queries are parsed
+one at a time and evaluated concurrently under a shared read lock; reloading
+changed files takes the write lock and bumps the workspace version, which is
+part of every result cache key. Serialised responses are kept in an LRU
+cache keyed by that version, the normalised query text and the negotiated
+result format.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import click
+
+from .workspace import DEFAULT_CACHE_SIZE, Workspace
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 3030
+DEFAULT_WORKERS = 4
+DEFAULT_RELOAD_INTERVAL = 2.0
+
+SPARQL_PATH = '/sparql'
+METRICS_PATH = '/metrics'
+
+# Media type -> rdflib result serialisation format, in order of preference
+RESULT_FORMATS = {
+    'application/sparql-results+json': 'json',
+    'application/json': 'json',
+    'application/sparql-results+xml': 'xml',
+    'application/xml': 'xml',
+    'text/csv': 'csv',
+}
+GRAPH_FORMATS = {
+    'text/turtle': 'turtle',
+    'application/n-triples': 'nt',
+    'application/ld+json': 'json-ld',
+    'application/rdf+xml': 'xml',
+}
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class ReadWriteLock:
+    """Many concurrent readers or one writer; waiting writers block new readers."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self) -> None:
+        with self._condition:
+            while self._writer or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram per label, in Prometheus style."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+
+    def observe(self, label: str, seconds: float) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(label, [0] * (len(self.buckets) + 1))
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+            counts[-1] += 1
+            self._sums[label] = self._sums.get(label, 0.0) + seconds
+
+    def render(self, name: str, label_name: str) -> List[str]:
+        lines = [f'# HELP {name} SPARQL query latency in seconds.', f'# TYPE {name} histogram']
+        with self._lock:
+            for label in sorted(self._counts):
+                counts = self._counts[label]
+                for bound, count in zip(self.buckets, counts):
+                    lines.append(f'{name}_bucket{{{label_name}="{label}",le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{{label_name}="{label}",le="+Inf"}} {counts[-1]}')
+                lines.append(f'{name}_sum{{{label_name}="{label}"}} {self._sums[label]:.6f}')
+                lines.append(f'{name}_count{{{label_name}="{label}"}} {counts[-1]}')
+        return lines
+
+
+def negotiate(accept: str, formats: Dict[str, str]) -> Optional[Tuple[str, str]]:
+    """(media type, rdflib format) best matching an Accept header, or None."""
+    if not accept:
+        media_type = next(iter(formats))
+        return media_type, formats[media_type]
+    ranges = []
+    for position, item in enumerate(accept.split(',')):
+        parts = [p.strip() for p in item.split(';')]
+        quality = 1.0
+        for param in parts[1:]:
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        ranges.append((-quality, position, parts[0].lower()))
+    for negative_quality, _, media_range in sorted(ranges):
+        if negative_quality == 0:
+            break
+        if media_range in ('*/*', ''):
+            media_type = next(iter(formats))
+            return media_type, formats[media_type]
+        for media_type, fmt in formats.items():
+            if media_range == media_type or (
+                    media_range.endswith('/*') and media_type.startswith(media_range[:-1])):
+                return media_type, fmt
+    return None
+
+
+class SparqlEndpoint:
+    """The workspace, its result cache and the endpoint metrics."""
+
+    def __init__(self, workspace: Workspace, reload_interval: Optional[float] = DEFAULT_RELOAD_INTERVAL,
+                 cors_origin: Optional[str] = None):
+        self.workspace = workspace
+        self.reload_interval = reload_interval
+        # Origin allowed to read responses from a browser; none unless configured
+        self.cors_origin = cors_origin
+        self.lock = ReadWriteLock()
+        self.latency = LatencyHistogram()
+        self.responses: Dict[int, int] = {}
+        self._counter_lock = threading.Lock()
+        self._parse_lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def reload(self) -> List[Path]:
+        self.lock.acquire_write()
+        try:
+            return self.workspace.refresh()
+        finally:
+            self.lock.release_write()
+
+    def watch(self) -> None:
+        """Reload changed files until stopped."""
+        while not self._stopped.wait(self.reload_interval):
+            try:
+                changed = self.reload()
+                if changed:
+                    logger.info(f"Reloaded {len(changed)} file(s); snapshot version {self.workspace.version}")
+            except click.ClickException as e:
+                logger.error(f"Reload failed, still serving the previous files where possible: {e.message}")
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def count_response(self, status: int) -> None:
+        with self._counter_lock:
+            self.responses[status] = self.responses.get(status, 0) + 1
+
+    def prepare(self, query: str):
+        """Parse a query; the SPARQL parser is not thread-safe, evaluation is."""
+        from rdflib.plugins.sparql import prepareQuery
+
+        with self._parse_lock:
+            return prepareQuery(query, initNs=dict(self.workspace.dataset.namespaces()))
+
+    def execute(self, query: str, accept: str) -> Tuple[int, str, bytes]:
+        """Run a query and serialise the result; returns (status, content type, body)."""
+        cache = self.workspace.cache
+        start = time.perf_counter()
+        # Negotiated before the query form is known, so equivalent Accept headers share a cache entry
+        negotiated = {
+            'result': negotiate(accept, RESULT_FORMATS),
+            'graph': negotiate(accept, GRAPH_FORMATS),
+        }
+        variant = 'http ' + ' '.join(media[0] if media else '-' for media in negotiated.values())
+        self.lock.acquire_read()
+        try:
+            version = self.workspace.version
+            cached = cache.get(version, query, variant=variant)
+            if cached is not None:
+                self.latency.observe('hit', time.perf_counter() - start)
+                return cached
+            try:
+                result = self.workspace.dataset.query(self.prepare(query))
+            except Exception as e:
+                return HTTPStatus.BAD_REQUEST, 'text/plain', f"Query failed: {e}\n".encode('utf-8')
+            form = 'result' if result.type in ('SELECT', 'ASK') else 'graph'
+            if negotiated[form] is None:
+                formats = RESULT_FORMATS if form == 'result' else GRAPH_FORMATS
+                return (HTTPStatus.NOT_ACCEPTABLE, 'text/plain',
+                        f"Cannot produce {accept}; available: {', '.join(formats)}\n".encode('utf-8'))
+            media_type, fmt = negotiated[form]
+            body = result.serialize(format=fmt)
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            response = (HTTPStatus.OK, f'{media_type}; charset=utf-8', body)
+            cache.put(version, query, response, variant=variant)
+            self.latency.observe('miss', time.perf_counter() - start)
+            return response
+        finally:
+            self.lock.release_read()
+
+    def metrics(self) -> str:
+        workspace = self.workspace
+        lines = self.latency.render('ies_sparql_query_duration_seconds', 'cache')
+        lines += [
+            '# HELP ies_sparql_responses_total HTTP responses by status code.',
+            '# TYPE ies_sparql_responses_total counter',
+        ]
+        with self._counter_lock:
+            lines += [f'ies_sparql_responses_total{{code="{code}"}} {count}'
+                      for code, count in sorted(self.responses.items())]
+        lines += [
+            '# HELP ies_sparql_cache_hits_total Result cache hits.',
+            '# TYPE ies_sparql_cache_hits_total counter',
+            f'ies_sparql_cache_hits_total {workspace.cache.hits}',
+            '# HELP ies_sparql_cache_misses_total Result cache misses.',
+            '# TYPE ies_sparql_cache_misses_total counter',
+            f'ies_sparql_cache_misses_total {workspace.cache.misses}',
+            '# HELP ies_sparql_cache_entries Entries in the result cache.',
+            '# TYPE ies_sparql_cache_entries gauge',
+            f'ies_sparql_cache_entries {len(workspace.cache.entries)}',
+            '# HELP ies_sparql_snapshot_version Version of the loaded graph.',
+            '# TYPE ies_sparql_snapshot_version gauge',
+            f'ies_sparql_snapshot_version {workspace.version}',
+            '# HELP ies_sparql_triples Triples per loaded file.',
+            '# TYPE ies_sparql_triples gauge',
+        ]
+        lines += [f'ies_sparql_triples{{source="{state.path}"}} {state.triples}'
+                  for state in workspace.loaded.values()]
+        return '\n'.join(lines) + '\n'
+
+
+class _SparqlHandler(BaseHTTPRequestHandler):
+    server_version = 'ies-build-sparql/1'
+
+    @property
+    def endpoint(self) -> SparqlEndpoint:
+        return self.server.endpoint
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        self.endpoint.count_response(int(status))
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if self.endpoint.cors_origin:
+            self.send_header('Access-Control-Allow-Origin', self.endpoint.cors_origin)
+        if status == HTTPStatus.OK and content_type.split(';')[0] in {**RESULT_FORMATS, **GRAPH_FORMATS}:
+            self.send_header('Vary', 'Accept')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _error(self, status: int, message: str) -> None:
+        self._send(status, 'text/plain; charset=utf-8', (message + '\n').encode('utf-8'))
+
+    def _answer(self, params: Dict[str, List[str]], query: Optional[str] = None) -> None:
+        if 'update' in params:
+            return self._error(HTTPStatus.FORBIDDEN, "This endpoint is read-only")
+        if 'default-graph-uri' in params or 'named-graph-uri' in params:
+            return self._error(HTTPStatus.BAD_REQUEST, "default-graph-uri and named-graph-uri are not supported")
+        queries = [query] if query is not None else params.get('query', [])
+        if len(queries) != 1 or not queries[0].strip():
+            return self._error(HTTPStatus.BAD_REQUEST, "Exactly one 'query' parameter is required")
+        self._send(*self.endpoint.execute(queries[0], self.headers.get('Accept', '')))
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == METRICS_PATH:
+            body = self.endpoint.metrics().encode('utf-8')
+            return self._send(HTTPStatus.OK, 'text/plain; version=0.0.4; charset=utf-8', body)
+        if url.path != SPARQL_PATH:
+            return self._error(HTTPStatus.NOT_FOUND, f"Try {SPARQL_PATH} or {METRICS_PATH}")
+        self._answer(parse_qs(url.query))
+
+    do_HEAD = do_GET
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != SPARQL_PATH:
+            return self._error(HTTPStatus.NOT_FOUND, f"Try {SPARQL_PATH}")
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            return self._error(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        try:
+            body = self.rfile.read(length).decode('utf-8')
+        except UnicodeDecodeError:
+            return self._error(HTTPStatus.BAD_REQUEST, "The request body is not valid UTF-8")
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type == 'application/x-www-form-urlencoded':
+            self._answer(parse_qs(body))
+        elif content_type == 'application/sparql-query':
+            self._answer(parse_qs(url.query), query=body)
+        elif content_type == 'application/sparql-update':
+            self._error(HTTPStatus.FORBIDDEN, "This endpoint is read-only")
+        else:
+            self._error(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, f"Unsupported Content-Type: {content_type}")
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTP server that handles each connection on a fixed pool of worker threads."""
+
+    def __init__(self, address: Tuple[str, int], endpoint: SparqlEndpoint, workers: int = DEFAULT_WORKERS):
+        self.endpoint = endpoint
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sparql')
+        super().__init__(address, _SparqlHandler)
+
+    def process_request(self, request, client_address) -> None:
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+@click.command()
+@click.option('--host', default=DEFAULT_HOST, show_default=True, help="Interface to listen on")
+@click.option('--port', default=DEFAULT_PORT, show_default=True, help="Port to listen on")
+@click.option('--workers', default=DEFAULT_WORKERS, show_default=True, help="Worker threads answering queries")
+@click.option('--cache-size', default=DEFAULT_CACHE_SIZE, show_default=True, help="Cached query results")
+@click.option(
+    '--source',
+    'sources',
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="RDF file to serve (repeatable; default: the ontology with its imports and the data)"
+)
+@click.option('--reload-interval', default=DEFAULT_RELOAD_INTERVAL, show_default=True,
+              help="Seconds between checks for changed files (0 to never reload)")
+@click.option('--reasoning', is_flag=True, help="Also serve RDFS and OWL 2 RL inferences")
+@click.option('--modules', is_flag=True,
+              help="Load the modules from `ies-build extract-module` in place of the imports")
+@click.option('--cors-origin', help="Let web pages from this origin (or '*' for any) read the results")
+def endpoint(host: str, port: int, workers: int, cache_size: int, sources: Tuple[Path, ...],
+             reload_interval: float, reasoning: bool, modules: bool, cors_origin: Optional[str]):
+    """Serve the ontology and data over the SPARQL 1.1 protocol."""
+    try:
+        workspace = Workspace(Path('.'), sources=sources or None, cache_size=cache_size, reasoning=reasoning,
+                              modules=modules)
+        workspace.refresh()
+        triples = sum(state.triples for state in workspace.loaded.values())
+        click.echo(f"📦 Loaded {len(workspace.loaded)} file(s), {triples} triples")
+        if reasoning:
+            click.echo(f"🧠 Materialised {workspace.reasoner.inferred_count} inferred triples")
+
+        service = SparqlEndpoint(workspace, reload_interval or None, cors_origin)
+        try:
+            server = PooledHTTPServer((host, port), service, workers)
+        except OSError as e:
+            raise click.ClickException(f"Cannot listen on {host}:{port}: {e}")
+        if reload_interval:
+            threading.Thread(target=service.watch, name='reload', daemon=True).start()
+
+        click.echo(f"🚀 SPARQL endpoint on http://{host}:{server.server_port}{SPARQL_PATH} "
+                   f"(metrics on {METRICS_PATH}, {workers} workers)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.stop()
+            server.server_close()
+        click.echo("👋 Endpoint stopped")
+
+    except click.ClickException as e:
+        click.echo(f"❌ Error: {str(e)}", err=True)
+        raise click.Abort()
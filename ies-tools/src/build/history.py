@@ -0,0 +1,557 @@
+"""Ontology metrics across the git history.
+
+`ies-build history` reports, for each commit on a branch, the number of
+classes and properties, terms without a label or definition, the depth of
+the class hierarchy and the size of the imports closure. The time series is
+written as CSV and JSON, and as Mermaid line charts rendered by
+DiagramBuilder.
+
+Files are summarised once per git blob: the terms, labels, definitions,
+subclass edges and imports of each file version are cached in
+build/history/blobs/<sha>.json, and a commit's metrics are combined from the
+summaries of the blobs in its tree. Commits that leave the ontology
+unchanged cost no parsing, and a rerun only parses blobs added since.
+Commit trees are listed concurrently and uncached blobs are parsed in
+parallel processes.
+
+Imports are resolved through the catalogs as they were at each commit.
+Imports inside a submodule (such as core) are read from the submodule's
+repository at the recorded commit when it is checked out, and are
+otherwise counted as unresolved.
+"""
+
+import csv
+import json
+import logging
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import click
+
+from .checks import ONTOLOGY_DIR
+from .ontology import (
+    ANNOTATION_PROPERTY,
+    CLASS_TYPES,
+    DATATYPE_PROPERTY,
+    OBJECT_PROPERTY,
+    RDF,
+    RDF_FORMATS,
+    RDF_TYPE,
+    RDFS_LABEL,
+    RDFS_SUBCLASSOF,
+    SKOS_DEFINITION,
+    SKOS_PREFLABEL,
+    is_builtin,
+)
+from .workspace import CATALOG_FILE, IMPORTS_CATALOG, OWL_IMPORTS, parse_catalog
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = Path('build') / 'history'
+BLOBS_DIR = 'blobs'
+HISTORY_NAME = 'ontology-history'
+# Bumped when the blob summary changes, so older cache entries are recomputed
+SUMMARY_VERSION = 1
+
+GITLINK_MODE = '160000'
+
+# Term kinds by rdf:type; a term with several types counts as the first kind listed
+TERM_KINDS = {
+    **{t: 'class' for t in CLASS_TYPES},
+    OBJECT_PROPERTY: 'object_property',
+    DATATYPE_PROPERTY: 'datatype_property',
+    ANNOTATION_PROPERTY: 'annotation_property',
+    RDF + 'Property': 'property',
+}
+KIND_ORDER = ['class', 'object_property', 'datatype_property', 'annotation_property', 'property']
+
+CHART_METRICS = ['classes', 'properties', 'missing_labels', 'missing_definitions', 'hierarchy_depth',
+                 'import_triples']
+
+
+@dataclass
+class Commit:
+    sha: str
+    date: str
+    subject: str
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    """A file version in the project or in a submodule's repository."""
+    repo: Path
+    sha: str
+    format: str
+
+
+@dataclass
+class Revision:
+    """The files of one commit that the metrics are computed from."""
+    commit: Commit
+    ontology: List[BlobRef] = field(default_factory=list)
+    catalog: Dict[str, Path] = field(default_factory=dict)
+    blobs: Dict[str, BlobRef] = field(default_factory=dict)
+    gitlinks: Dict[str, str] = field(default_factory=dict)
+    # Catalogs that could not be parsed, and were read as empty
+    catalog_errors: int = 0
+
+
+@dataclass
+class RevisionMetrics:
+    commit: str
+    date: str
+    subject: str
+    classes: int = 0
+    object_properties: int = 0
+    datatype_properties: int = 0
+    annotation_properties: int = 0
+    properties: int = 0
+    missing_labels: int = 0
+    missing_definitions: int = 0
+    hierarchy_depth: int = 0
+    imports: int = 0
+    unresolved_imports: int = 0
+    import_triples: int = 0
+    triples: int = 0
+    parse_errors: int = 0
+
+
+def git(repo: Path, *args: str) -> str:
+    try:
+        return subprocess.run(['git', '-C', str(repo), *args], capture_output=True, text=True,
+                              check=True).stdout
+    except FileNotFoundError:
+        raise click.ClickException("git not found")
+    except subprocess.CalledProcessError as e:
+        raise click.ClickException(f"git {' '.join(args)} failed: {e.stderr.strip()}")
+
+
+def commits(root: Path, rev: str, max_count: Optional[int] = None) -> List[Commit]:
+    """First-parent history of rev, oldest first."""
+    args = ['log', '--first-parent', '--reverse', '--format=%H%x1f%cI%x1f%s']
+    if max_count:
+        args.append(f'--max-count={max_count}')
+    return [Commit(*line.split('\x1f', 2)) for line in git(root, *args, rev, '--').splitlines() if line]
+
+
+def read_blobs(repo: Path, shas: Sequence[str]) -> List[bytes]:
+    """Contents of the blobs, read with one `git cat-file --batch`.
+
+    The process is finished before parse workers are forked, so they never
+    hold its stdin open.
+    """
+    if not shas:
+        return []
+    try:
+        output = subprocess.run(['git', '-C', str(repo), 'cat-file', '--batch'],
+                                input=''.join(f'{sha}\n' for sha in shas).encode('ascii'),
+                                capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise click.ClickException(f"git cat-file failed in {repo}: {e.stderr.decode(errors='replace').strip()}")
+    blobs, offset = [], 0
+    for sha in shas:
+        end = output.index(b'\n', offset)
+        header = output[offset:end].split()
+        if len(header) != 3 or header[1] != b'blob':
+            raise click.ClickException(f"Blob {sha} not found in {repo}")
+        size = int(header[2])
+        blobs.append(output[end + 1:end + 1 + size])
+        offset = end + 2 + size
+    return blobs
+
+
+class BlobCache:
+    """Blob summaries on disk, keyed by git blob SHA."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.summaries: Dict[str, Dict[str, object]] = {}
+
+    def get(self, sha: str) -> Optional[Dict[str, object]]:
+        if sha not in self.summaries:
+            try:
+                summary = json.loads((self.directory / f'{sha}.json').read_text())
+            except (OSError, json.JSONDecodeError):
+                return None
+            if summary.get('version') != SUMMARY_VERSION:
+                return None
+            self.summaries[sha] = summary
+        return self.summaries[sha]
+
+    def put(self, sha: str, summary: Dict[str, object]) -> None:
+        self.summaries[sha] = summary
+        (self.directory / f'{sha}.json').write_text(json.dumps(summary, separators=(',', ':')))
+
+
+def summarise(data: bytes, rdf_format: str) -> Dict[str, object]:
+    """Terms, labels, definitions, subclass edges and imports of one file version."""
+    from rdflib import Graph, URIRef
+
+    graph = Graph()
+    try:
+        graph.parse(data=data, format=rdf_format)
+    except Exception as e:
+        return {'version': SUMMARY_VERSION, 'error': f"{type(e).__name__}: {e}"}
+
+    terms: Dict[str, str] = {}
+    for subject, type_iri in graph.subject_objects(URIRef(RDF_TYPE)):
+        kind = TERM_KINDS.get(str(type_iri))
+        if kind and isinstance(subject, URIRef) and not is_builtin(str(subject)):
+            current = terms.get(str(subject))
+            if current is None or KIND_ORDER.index(kind) < KIND_ORDER.index(current):
+                terms[str(subject)] = kind
+
+    def subjects(*predicates: str) -> List[str]:
+        return sorted({str(s) for p in predicates for s in graph.subjects(URIRef(p)) if isinstance(s, URIRef)})
+
+    return {
+        'version': SUMMARY_VERSION,
+        'triples': len(graph),
+        'terms': dict(sorted(terms.items())),
+        'labelled': subjects(RDFS_LABEL, SKOS_PREFLABEL),
+        'defined': subjects(SKOS_DEFINITION),
+        'subclass': sorted([str(s), str(o)] for s, o in graph.subject_objects(URIRef(RDFS_SUBCLASSOF))
+                           if isinstance(s, URIRef) and isinstance(o, URIRef) and s != o),
+        'imports': sorted({str(o) for o in graph.objects(None, URIRef(OWL_IMPORTS))}),
+    }
+
+
+def _summarise_blob(args: Tuple[bytes, str]) -> Dict[str, object]:
+    """Process pool worker: summarise one blob."""
+    return summarise(*args)
+
+
+def summarise_blobs(refs: Iterable[BlobRef], cache: BlobCache, jobs: Optional[int] = None) -> int:
+    """Summarise the blobs that are not cached yet; returns how many were parsed."""
+    missing: Dict[str, BlobRef] = {}
+    for ref in refs:
+        if ref.sha not in missing and cache.get(ref.sha) is None:
+            missing[ref.sha] = ref
+    if not missing:
+        return 0
+
+    jobs = min(jobs or os.cpu_count() or 1, len(missing))
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        pending = list(missing.values())
+        # Batches bound how many blob contents are held in memory at once
+        batch_size = jobs * 4
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            contents: Dict[str, bytes] = {}
+            for repo in {ref.repo for ref in batch}:
+                shas = [ref.sha for ref in batch if ref.repo == repo]
+                contents.update(zip(shas, read_blobs(repo, shas)))
+            work = [(contents[ref.sha], ref.format) for ref in batch]
+            results = pool.map(_summarise_blob, work) if pool else map(_summarise_blob, work)
+            for ref, summary in zip(batch, results):
+                cache.put(ref.sha, summary)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+    return len(missing)
+
+
+def _catalog(
+        entries: Dict[str, Tuple[str, str]],
+        catalogs: Dict[str, Optional[Dict[str, Path]]],
+) -> Tuple[Dict[str, Path], int]:
+    """The project catalog of a commit, as workspace.project_catalog reads it from disk.
+
+    Returns the mapping and the number of catalogs that could not be parsed
+    (None in catalogs), which contribute no entries.
+    """
+    mapping: Dict[str, Path] = {}
+    errors = 0
+    for catalog in (IMPORTS_CATALOG, CATALOG_FILE):
+        entry = entries.get(catalog.as_posix())
+        if entry:
+            parsed = catalogs[entry[1]]
+            if parsed is None:
+                errors += 1
+            else:
+                mapping.update(parsed)
+    return mapping, errors
+
+
+def _parse_catalog_blob(data: bytes, source: Path, sha: str) -> Optional[Dict[str, Path]]:
+    """A catalog version's mapping, or None if it is malformed."""
+    try:
+        return parse_catalog(Path(), data, source)
+    except click.ClickException as e:
+        # An old broken commit must not stop the report
+        logger.warning(f"Ignoring {source} blob {sha[:12]}: {e.message}")
+        return None
+
+
+def list_tree(root: Path, commit: str) -> Dict[str, Tuple[str, str]]:
+    """Path to (mode, object SHA) for every file and submodule in a commit."""
+    entries = {}
+    for record in git(root, 'ls-tree', '-r', '-z', '--full-tree', commit).split('\0'):
+        if record:
+            meta, path = record.split('\t', 1)
+            mode, _, sha = meta.split()
+            entries[path] = (mode, sha)
+    return entries
+
+
+def list_revisions(root: Path, history: Sequence[Commit], jobs: Optional[int] = None) -> List[Revision]:
+    """The ontology files, RDF blobs, catalog and submodules of each commit, listed concurrently."""
+    with ThreadPoolExecutor(max_workers=jobs or min(8, (os.cpu_count() or 1) + 4)) as pool:
+        trees = list(pool.map(lambda commit: list_tree(root, commit.sha), history))
+
+    catalog_files = {entries[c.as_posix()][1]: c for entries in trees for c in (IMPORTS_CATALOG, CATALOG_FILE)
+                     if c.as_posix() in entries}
+    catalogs = {sha: _parse_catalog_blob(data, catalog_files[sha], sha)
+                for sha, data in zip(catalog_files, read_blobs(root, list(catalog_files)))}
+
+    result = []
+    for commit, entries in zip(history, trees):
+        catalog, catalog_errors = _catalog(entries, catalogs)
+        revision = Revision(commit, catalog=catalog, catalog_errors=catalog_errors)
+        for path, (mode, sha) in entries.items():
+            if mode == GITLINK_MODE:
+                revision.gitlinks[path] = sha
+                continue
+            rdf_format = RDF_FORMATS.get(Path(path).suffix.lower())
+            if rdf_format is None:
+                continue
+            ref = BlobRef(root, sha, rdf_format)
+            revision.blobs[path] = ref
+            if Path(path).is_relative_to(ONTOLOGY_DIR):
+                revision.ontology.append(ref)
+        result.append(revision)
+    return result
+
+
+class ImportResolver:
+    """Finds the blob an import IRI maps to at a commit, including inside submodules."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.submodule_files: Dict[Tuple[str, str], Dict[str, Tuple[str, str]]] = {}
+
+    def _submodule_tree(self, path: str, commit: str) -> Dict[str, Tuple[str, str]]:
+        key = (path, commit)
+        if key not in self.submodule_files:
+            repo = self.root / path
+            try:
+                self.submodule_files[key] = list_tree(repo, commit) if (repo / '.git').exists() else {}
+            except click.ClickException:
+                logger.info(f"Submodule {path} does not have commit {commit}")
+                self.submodule_files[key] = {}
+        return self.submodule_files[key]
+
+    def resolve(self, revision: Revision, iri: str) -> Optional[BlobRef]:
+        local = revision.catalog.get(iri) or revision.catalog.get(iri.rstrip('#/'))
+        if local is None:
+            return None
+        path = local.as_posix()
+        rdf_format = RDF_FORMATS.get(local.suffix.lower())
+        if path in revision.blobs:
+            return revision.blobs[path]
+        for submodule, commit in revision.gitlinks.items():
+            if rdf_format and path.startswith(submodule + '/'):
+                entry = self._submodule_tree(submodule, commit).get(path[len(submodule) + 1:])
+                if entry:
+                    return BlobRef(self.root / submodule, entry[1], rdf_format)
+        return None
+
+
+def imports_closure(
+        revisions: Sequence[Revision],
+        cache: BlobCache,
+        resolver: ImportResolver,
+        jobs: Optional[int] = None,
+) -> Tuple[List[Dict[str, Optional[BlobRef]]], int]:
+    """Import IRI to blob (None if unresolved) for each revision, and the number of blobs parsed.
+
+    The closure is found a level at a time across all revisions, so each
+    level's new blobs are parsed in one parallel batch.
+    """
+    closures: List[Dict[str, Optional[BlobRef]]] = [{} for _ in revisions]
+    frontiers: List[List[BlobRef]] = [list(r.ontology) for r in revisions]
+    parsed = 0
+    while any(frontiers):
+        parsed += summarise_blobs((ref for frontier in frontiers for ref in frontier), cache, jobs)
+        for i, revision in enumerate(revisions):
+            level = []
+            for ref in frontiers[i]:
+                for iri in cache.get(ref.sha).get('imports', []):
+                    if iri in closures[i]:
+                        continue
+                    closures[i][iri] = resolved = resolver.resolve(revision, iri)
+                    if resolved and resolved not in revision.ontology:
+                        level.append(resolved)
+            frontiers[i] = level
+    return closures, parsed
+
+
+def hierarchy_depth(classes: Iterable[str], parents: Dict[str, Set[str]]) -> int:
+    """Longest rdfs:subClassOf chain, in edges, from any of the classes; cycles are cut."""
+    depth: Dict[str, int] = {}
+    for start in classes:
+        if start in depth:
+            continue
+        stack = [(start, iter(parents.get(start, ())))]
+        on_path = {start}
+        while stack:
+            node, remaining = stack[-1]
+            parent = next(remaining, None)
+            if parent is None:
+                stack.pop()
+                on_path.discard(node)
+                depth[node] = max((depth[p] + 1 for p in parents.get(node, ()) if p in depth), default=0)
+            elif parent not in depth and parent not in on_path:
+                on_path.add(parent)
+                stack.append((parent, iter(parents.get(parent, ()))))
+    return max((depth[c] for c in classes), default=0)
+
+
+def revision_metrics(revision: Revision, imports: Dict[str, Optional[BlobRef]], cache: BlobCache) -> RevisionMetrics:
+    """Combine the summaries of a commit's ontology files and imports."""
+    metrics = RevisionMetrics(revision.commit.sha, revision.commit.date, revision.commit.subject)
+    local = [cache.get(ref.sha) for ref in revision.ontology]
+    imported = [cache.get(ref.sha) for ref in {ref for ref in imports.values() if ref and ref not in revision.ontology}]
+    metrics.parse_errors = sum('error' in s for s in local + imported) + revision.catalog_errors
+    local = [s for s in local if 'error' not in s]
+    imported = [s for s in imported if 'error' not in s]
+
+    terms: Dict[str, str] = {}
+    for summary in local:
+        for term, kind in summary['terms'].items():
+            if term not in terms or KIND_ORDER.index(kind) < KIND_ORDER.index(terms[term]):
+                terms[term] = kind
+    kinds = list(terms.values())
+    metrics.classes = kinds.count('class')
+    metrics.object_properties = kinds.count('object_property')
+    metrics.datatype_properties = kinds.count('datatype_property')
+    metrics.annotation_properties = kinds.count('annotation_property')
+    metrics.properties = len(kinds) - metrics.classes
+
+    # Labels, definitions and superclasses may come from the imports, as in lint
+    everything = local + imported
+    labelled = set().union(*(s['labelled'] for s in everything))
+    defined = set().union(*(s['defined'] for s in everything))
+    metrics.missing_labels = sum(term not in labelled for term in terms)
+    metrics.missing_definitions = sum(term not in defined for term in terms)
+    parents: Dict[str, Set[str]] = {}
+    for summary in everything:
+        for child, parent in summary['subclass']:
+            if not is_builtin(parent):
+                parents.setdefault(child, set()).add(parent)
+    metrics.hierarchy_depth = hierarchy_depth([t for t, kind in terms.items() if kind == 'class'], parents)
+
+    metrics.imports = len(imports)
+    metrics.unresolved_imports = sum(ref is None for ref in imports.values())
+    metrics.import_triples = sum(s['triples'] for s in imported)
+    metrics.triples = sum(s['triples'] for s in local)
+    return metrics
+
+
+def ontology_history(
+        root: Path,
+        rev: str = 'HEAD',
+        max_count: Optional[int] = None,
+        cache_dir: Optional[Path] = None,
+        jobs: Optional[int] = None,
+) -> Tuple[List[RevisionMetrics], int]:
+    """Metrics of each commit in the first-parent history of rev, and how many blobs were parsed."""
+    root = Path(git(root, 'rev-parse', '--show-toplevel').strip())
+    history = commits(root, rev, max_count)
+    if not history:
+        raise click.ClickException(f"No commits found for {rev}")
+    cache = BlobCache(cache_dir or root / DEFAULT_OUTPUT_DIR / BLOBS_DIR)
+    revisions = list_revisions(root, history, jobs)
+    closures, parsed = imports_closure(revisions, cache, ImportResolver(root), jobs)
+    return [revision_metrics(r, imports, cache) for r, imports in zip(revisions, closures)], parsed
+
+
+def write_csv(metrics: Sequence[RevisionMetrics], path: Path) -> None:
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=[f.name for f in fields(RevisionMetrics)])
+        writer.writeheader()
+        writer.writerows(asdict(m) for m in metrics)
+
+
+def write_json(metrics: Sequence[RevisionMetrics], path: Path) -> None:
+    path.write_text(json.dumps([asdict(m) for m in metrics], indent=2))
+
+
+def chart_source(metrics: Sequence[RevisionMetrics], metric: str, rev: str) -> str:
+    """A Mermaid line chart of one metric against commit number."""
+    title = metric.replace('_', ' ').capitalize()
+    values = ', '.join(str(getattr(m, metric)) for m in metrics)
+    return '\n'.join([
+        'xychart-beta',
+        f'    title "{title} on {rev} ({metrics[0].commit[:7]}..{metrics[-1].commit[:7]})"',
+        f'    x-axis "Commit" 1 --> {max(len(metrics), 2)}',
+        f'    y-axis "{title}"',
+        f'    line [{values}]',
+        '',
+    ])
+
+
+def write_charts(metrics: Sequence[RevisionMetrics], output_dir: Path, rev: str) -> List[Path]:
+    """Write a Mermaid chart per metric and render each to SVG with DiagramBuilder."""
+    from .build import DiagramBuilder
+
+    sources = []
+    for metric in CHART_METRICS:
+        source = output_dir / f"{HISTORY_NAME}-{metric.replace('_', '-')}.mmd"
+        source.write_text(chart_source(metrics, metric, rev))
+        sources.append(source)
+    if shutil.which('mmdc') is None:
+        logger.warning("mermaid-cli not found; chart sources written but not rendered. "
+                       "Install with: npm install -g @mermaid-js/mermaid-cli")
+        return sources
+
+    builder = DiagramBuilder(Path('.'))
+    return [source.with_suffix('.svg') for source in sources
+            if builder.generate_mermaid_diagram(source, source.with_suffix('.svg'))]
+
+
+@click.command('history')
+@click.option('--rev', default='HEAD', show_default=True, help="Branch or commit whose first-parent history is used")
+@click.option('--max-count', '-n', type=int, help="Only the most recent N commits")
+@click.option('--output-dir', type=click.Path(file_okay=False, path_type=Path), default=DEFAULT_OUTPUT_DIR,
+              show_default=True, help="Where the CSV, JSON, charts and blob cache are written")
+@click.option('--jobs', '-j', type=int, help="Worker processes for parsing (default: CPU count)")
+@click.option('--chart/--no-chart', default=True, show_default=True, help="Write and render the charts")
+@click.option('--json', 'as_json', is_flag=True, help="Print the time series as JSON")
+def history(rev: str, max_count: Optional[int], output_dir: Path, jobs: Optional[int], chart: bool,
+            as_json: bool):
+    """Ontology metrics for every commit in the history of a branch."""
+    try:
+        start = time.perf_counter()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        metrics, parsed = ontology_history(Path('.'), rev, max_count, output_dir / BLOBS_DIR, jobs)
+        write_csv(metrics, output_dir / f'{HISTORY_NAME}.csv')
+        write_json(metrics, output_dir / f'{HISTORY_NAME}.json')
+        charts = write_charts(metrics, output_dir, rev) if chart else []
+        if as_json:
+            click.echo(json.dumps([asdict(m) for m in metrics], indent=2))
+            return
+
+        click.echo(f"📜 {len(metrics)} commit(s) of {rev}, {parsed} file version(s) parsed "
+                   f"({time.perf_counter() - start:.1f}s)")
+        first, last = metrics[0], metrics[-1]
+        for name in ['classes', 'properties', 'missing_labels', 'missing_definitions', 'hierarchy_depth',
+                     'imports', 'import_triples']:
+            click.echo(f"  {name.replace('_', ' ')}: {getattr(first, name)} → {getattr(last, name)}")
+        if last.parse_errors:
+            click.echo(f"⚠️  {last.parse_errors} file(s) at {last.commit[:7]} could not be parsed", err=True)
+        click.echo(f"✅ Time series written to {output_dir / HISTORY_NAME}.csv and .json")
+        if charts:
+            click.echo(f"📈 {len(charts)} chart(s) written to {output_dir}")
+
+    except click.ClickException as e:
+        click.echo(f"❌ Error: {str(e)}", err=True)
+        raise click.Abort()
@@ -0,0 +1,632 @@
+"""Locality-based modules of the imported ontologies for the terms the project uses."""
+
+import json
+import logging
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import click
+
+from .ontology import (
+    ANNOTATION_PROPERTY, BUILTIN_NAMESPACES, CLASS_TYPES, CORE_ONTOLOGY, DATATYPE_PROPERTY, OBJECT_PROPERTY,
+    OWL, PROPERTY_TYPES, RDF, RDF_FORMATS, RDF_TYPE, RDFS, RDFS_DOMAIN, RDFS_RANGE, RDFS_SUBCLASSOF,
+    RDFS_SUBPROPERTYOF, rdf_format,
+)
+from .workspace import MODULE_CATALOG, OWL_IMPORTS, project_catalog
+
+if TYPE_CHECKING:
+    from rdflib import Graph
+    from rdflib.term import Node
+
+logger = logging.getLogger(__name__)
+
+MODULE_DIR = MODULE_CATALOG.parent
+# The project's own sources, whose terms make up the seed signature
+LOCAL_SOURCES = (Path('src') / 'ontology', Path('src') / 'data')
+MODULE_TYPES = ('bottom', 'star', 'top')
+CATALOG_NAMESPACE = 'urn:oasis:names:tc:entity:xmlns:xml:catalog'
+
+BOTTOM, TOP = 'bottom', 'top'
+
+RDF_FIRST, RDF_REST, RDF_NIL = RDF + 'first', RDF + 'rest', RDF + 'nil'
+OWL_THING, OWL_NOTHING = OWL + 'Thing', OWL + 'Nothing'
+OWL_ONTOLOGY = OWL + 'Ontology'
+TOP_PROPERTIES = {OWL + 'topObjectProperty', OWL + 'topDataProperty'}
+BOTTOM_PROPERTIES = {OWL + 'bottomObjectProperty', OWL + 'bottomDataProperty'}
+
+CARDINALITIES = {
+    'min': ('minCardinality', 'minQualifiedCardinality'),
+    'max': ('maxCardinality', 'maxQualifiedCardinality'),
+    'exact': ('cardinality', 'qualifiedCardinality'),
+}
+# Property characteristics, by the values of P for which they hold trivially
+CHARACTERISTICS = {
+    OWL + 'TransitiveProperty': (BOTTOM, TOP),
+    OWL + 'SymmetricProperty': (BOTTOM, TOP),
+    OWL + 'FunctionalProperty': (BOTTOM,),
+    OWL + 'InverseFunctionalProperty': (BOTTOM,),
+    OWL + 'IrreflexiveProperty': (BOTTOM,),
+    OWL + 'AsymmetricProperty': (BOTTOM,),
+    OWL + 'ReflexiveProperty': (TOP,),
+}
+DECLARATION_TYPES = CLASS_TYPES | PROPERTY_TYPES | {
+    OWL + 'NamedIndividual', RDFS + 'Datatype', OWL + 'OntologyProperty',
+    OWL + 'DeprecatedClass', OWL + 'DeprecatedProperty',
+}
+# Predicates that are annotations wherever they are used
+ANNOTATION_PREDICATES = {
+    RDFS + 'label', RDFS + 'comment', RDFS + 'seeAlso', RDFS + 'isDefinedBy',
+    OWL + 'versionInfo', OWL + 'deprecated', OWL + 'priorVersion', OWL + 'backwardCompatibleWith',
+    OWL + 'incompatibleWith',
+}
+ANNOTATION_NAMESPACES = (
+    'http://www.w3.org/2004/02/skos/core#', 'http://purl.org/dc/elements/1.1/', 'http://purl.org/dc/terms/',
+    'http://purl.org/vocab/vann/',
+)
+
+
+@dataclass
+class Axiom:
+    """The triples of one OWL axiom and what its locality depends on.
+
+    `kind` is 'declaration' or 'annotation' for the non-logical axioms, which
+    follow their subject into the module, and otherwise names the locality
+    rule; `args` are its class expressions and property expressions.
+    """
+    kind: str
+    subject: Optional['Node']
+    args: tuple
+    triples: List[Tuple['Node', 'Node', 'Node']]
+    signature: frozenset
+
+
+@dataclass
+class ModuleReport:
+    """Sizes and load times of one imported file and its module."""
+    iri: str
+    source: str
+    module: str
+    source_triples: int
+    module_triples: int
+    source_load_s: float
+    module_load_s: float
+
+    @property
+    def reduction(self) -> float:
+        return 1 - self.module_triples / max(self.source_triples, 1)
+
+
+def _members(graph: 'Graph', head: 'Node') -> List['Node']:
+    from rdflib import URIRef
+
+    first, rest, nil = URIRef(RDF_FIRST), URIRef(RDF_REST), URIRef(RDF_NIL)
+    members, seen = [], set()
+    while head is not None and head != nil and head not in seen:
+        seen.add(head)
+        member = graph.value(head, first)
+        if member is not None:
+            members.append(member)
+        head = graph.value(head, rest)
+    return members
+
+
+def _blank_closure(graph: 'Graph', node: 'Node', triples: List[tuple], seen: Set['Node']) -> None:
+    """Append the triples reachable from a blank node through blank nodes."""
+    from rdflib import BNode
+
+    if not isinstance(node, BNode) or node in seen:
+        return
+    seen.add(node)
+    for _, p, o in graph.triples((node, None, None)):
+        triples.append((node, p, o))
+        _blank_closure(graph, o, triples, seen)
+
+
+def _is_builtin(node: 'Node') -> bool:
+    return str(node).startswith(BUILTIN_NAMESPACES)
+
+
+def _signature(triples: Iterable[tuple]) -> frozenset:
+    from rdflib import URIRef
+
+    return frozenset(
+        term for triple in triples for term in triple
+        if isinstance(term, URIRef) and not _is_builtin(term)
+    )
+
+
+def axioms(graph: 'Graph') -> List[Axiom]:
+    """Group the triples of a graph into OWL axioms.
+
+    A triple with a named subject is one axiom together with the blank node
+    structure of its object; blank nodes that are nobody's object
+    (owl:AllDisjointClasses, owl:Axiom, general class axioms and the like)
+    are one axiom each. Ontology headers are skipped.
+    """
+    from rdflib import BNode, URIRef
+
+    def uri(iri: str) -> URIRef:
+        return URIRef(iri)
+
+    type_ = uri(RDF_TYPE)
+    headers = set(graph.subjects(type_, uri(OWL_ONTOLOGY)))
+    declared: Dict['Node', Set[str]] = {}
+    for s, o in graph.subject_objects(type_):
+        declared.setdefault(s, set()).add(str(o))
+    logical = {
+        s for s, types in declared.items()
+        if types & {OBJECT_PROPERTY, DATATYPE_PROPERTY} and ANNOTATION_PROPERTY not in types
+    }
+    annotation_properties = {s for s, types in declared.items() if ANNOTATION_PROPERTY in types}
+    terms = {s for s, types in declared.items() if types & (CLASS_TYPES | PROPERTY_TYPES)}
+
+    def is_annotation(subject: 'Node', predicate: 'Node') -> bool:
+        iri = str(predicate)
+        if iri in ANNOTATION_PREDICATES or iri.startswith(ANNOTATION_NAMESPACES):
+            return predicate not in logical
+        if predicate in annotation_properties:
+            return True
+        if iri.startswith(BUILTIN_NAMESPACES):
+            return False
+        # Undeclared predicates on classes and properties are documentation
+        return subject in terms and predicate not in logical
+
+    def named(s: 'Node', p: 'Node', o: 'Node') -> Tuple[str, tuple]:
+        iri, obj = str(p), str(o)
+        if iri == RDF_TYPE:
+            if obj in DECLARATION_TYPES:
+                return 'declaration', ()
+            if obj in CHARACTERISTICS:
+                return 'characteristic', (s, obj)
+            return 'class-assertion', (o,)
+        rule = {
+            RDFS_SUBCLASSOF: ('subclass', (s, o)),
+            OWL + 'equivalentClass': ('equivalent', (s, o)),
+            OWL + 'disjointWith': ('disjoint', (s, o)),
+            RDFS_SUBPROPERTYOF: ('subproperty', (s, o)),
+            OWL + 'equivalentProperty': ('equivalent-property', (s, o)),
+            OWL + 'inverseOf': ('equivalent-property', (s, o)),
+            OWL + 'propertyDisjointWith': ('disjoint-property', (s, o)),
+            RDFS_DOMAIN: ('domain', (s, o)),
+            RDFS_RANGE: ('domain', (s, o)),
+            OWL + 'hasKey': ('key', (s,)),
+        }.get(iri)
+        if rule:
+            return rule
+        if iri == OWL + 'disjointUnionOf':
+            return 'disjoint-union', (s, *_members(graph, o))
+        if iri == OWL + 'propertyChainAxiom':
+            return 'chain', (s, *_members(graph, o))
+        if is_annotation(s, p):
+            return 'annotation', ()
+        if iri.startswith(BUILTIN_NAMESPACES):
+            # sameAs, differentFrom and class definitions spelt directly on
+            # a named class are never local
+            return 'nonlocal', ()
+        return 'property-assertion', (p,)
+
+    def root(b: 'Node') -> Tuple[str, Optional['Node'], tuple]:
+        types = {str(o) for o in graph.objects(b, type_)}
+        if OWL + 'AllDisjointClasses' in types:
+            return 'disjoint', None, tuple(_members(graph, graph.value(b, uri(OWL + 'members'))))
+        if OWL + 'AllDisjointProperties' in types:
+            return 'disjoint-property', None, tuple(_members(graph, graph.value(b, uri(OWL + 'members'))))
+        if OWL + 'Axiom' in types or OWL + 'Annotation' in types:
+            return 'annotation', graph.value(b, uri(OWL + 'annotatedSource')), ()
+        if OWL + 'NegativePropertyAssertion' in types:
+            return 'negative-assertion', None, (graph.value(b, uri(OWL + 'assertionProperty')),)
+        if OWL + 'AllDifferent' in types:
+            return 'nonlocal', None, ()
+        for p, o in graph.predicate_objects(b):
+            if str(p) == RDFS_SUBCLASSOF:
+                return 'subclass', None, (b, o)
+            if str(p) == OWL + 'equivalentClass':
+                return 'equivalent', None, (b, o)
+            if str(p) == OWL + 'disjointWith':
+                return 'disjoint', None, (b, o)
+        return '', None, ()
+
+    result: List[Axiom] = []
+    for s in set(graph.subjects()):
+        if s in headers:
+            continue
+        if isinstance(s, BNode):
+            if next(graph.subjects(None, s), None) is not None:
+                continue
+            kind, subject, args = root(s)
+            if not kind:
+                logger.debug(f"Dropping blank node structure that is no OWL axiom: {s}")
+                continue
+            triples: List[tuple] = []
+            _blank_closure(graph, s, triples, set())
+            result.append(Axiom(kind, subject, args, triples, _signature(triples)))
+            continue
+        for p, o in graph.predicate_objects(s):
+            triples = [(s, p, o)]
+            _blank_closure(graph, o, triples, set())
+            kind, args = named(s, p, o)
+            subject = s if kind in ('declaration', 'annotation') else None
+            result.append(Axiom(kind, subject, args, triples, _signature(triples)))
+    return result
+
+
+class Locality:
+    """Syntactic ⊥- or ⊤-locality of axioms with respect to a signature."""
+
+    def __init__(self, graph: 'Graph', mode: str, signature: Set['Node']):
+        from rdflib import URIRef
+
+        self.graph = graph
+        self.mode = mode
+        self.signature = signature
+        self._uri = URIRef
+
+    def _value(self, node: 'Node', predicate: str) -> Optional['Node']:
+        return self.graph.value(node, self._uri(predicate))
+
+    def _entity(self, node: 'Node') -> Optional[str]:
+        if node in self.signature or _is_builtin(node):
+            return None
+        return self.mode
+
+    def prop(self, node: Optional['Node']) -> Optional[str]:
+        """BOTTOM or TOP when the property expression is equivalent to it, else None."""
+        from rdflib import URIRef
+
+        if node is None:
+            return None
+        if isinstance(node, URIRef):
+            if str(node) in TOP_PROPERTIES:
+                return TOP
+            if str(node) in BOTTOM_PROPERTIES:
+                return BOTTOM
+            return self._entity(node)
+        inverse = self._value(node, OWL + 'inverseOf')
+        return self.prop(inverse) if inverse is not None else None
+
+    def cls(self, node: Optional['Node']) -> Optional[str]:
+        """BOTTOM or TOP when the class expression is equivalent to it, else None."""
+        from rdflib import BNode, URIRef
+
+        if node is None:
+            return None
+        if isinstance(node, URIRef):
+            if str(node) == OWL_THING:
+                return TOP
+            if str(node) == OWL_NOTHING:
+                return BOTTOM
+            return self._entity(node)
+        if not isinstance(node, BNode):
+            return None
+
+        members = self._value(node, OWL + 'intersectionOf')
+        if members is not None:
+            values = [self.cls(m) for m in _members(self.graph, members)]
+            if BOTTOM in values:
+                return BOTTOM
+            return TOP if values and all(v == TOP for v in values) else None
+        members = self._value(node, OWL + 'unionOf')
+        if members is not None:
+            values = [self.cls(m) for m in _members(self.graph, members)]
+            if TOP in values:
+                return TOP
+            return BOTTOM if all(v == BOTTOM for v in values) else None
+        complement = self._value(node, OWL + 'complementOf')
+        if complement is not None:
+            return {BOTTOM: TOP, TOP: BOTTOM}.get(self.cls(complement))
+
+        on_property = self._value(node, OWL + 'onProperty')
+        if on_property is None:
+            # owl:oneOf and data ranges
+            return None
+        p = self.prop(on_property)
+        some = self._value(node, OWL + 'someValuesFrom')
+        if some is not None:
+            f = self.cls(some)
+            if p == BOTTOM or f == BOTTOM:
+                return BOTTOM
+            return TOP if p == TOP and f == TOP else None
+        every = self._value(node, OWL + 'allValuesFrom')
+        if every is not None:
+            f = self.cls(every)
+            if p == BOTTOM or f == TOP:
+                return TOP
+            return BOTTOM if p == TOP and f == BOTTOM else None
+        if self._value(node, OWL + 'hasValue') is not None or self._value(node, OWL + 'hasSelf') is not None:
+            return p
+        filler = self._value(node, OWL + 'onClass') or self._value(node, OWL + 'onDataRange')
+        f = self.cls(filler) if filler is not None else TOP
+        for kind, predicates in CARDINALITIES.items():
+            count = next((c for c in (self._value(node, OWL + name) for name in predicates) if c is not None), None)
+            if count is None:
+                continue
+            try:
+                n = int(count)
+            except ValueError:
+                return None
+            empty = p == BOTTOM or f == BOTTOM
+            if kind == 'min':
+                if n == 0:
+                    return TOP
+                if empty:
+                    return BOTTOM
+                return TOP if n == 1 and p == TOP and f == TOP else None
+            if kind == 'max':
+                return TOP if empty else None
+            return (TOP if n == 0 else BOTTOM) if empty else None
+        return None
+
+    def is_local(self, axiom: Axiom) -> bool:
+        kind, args = axiom.kind, axiom.args
+        cls, prop = self.cls, self.prop
+        if kind == 'subclass':
+            return cls(args[0]) == BOTTOM or cls(args[1]) == TOP
+        if kind == 'equivalent':
+            values = {cls(a) for a in args}
+            return values in ({BOTTOM}, {TOP})
+        if kind == 'disjoint':
+            return sum(cls(a) != BOTTOM for a in args) <= 1
+        if kind == 'disjoint-union':
+            return all(cls(a) == BOTTOM for a in args)
+        if kind == 'subproperty':
+            return prop(args[0]) == BOTTOM or prop(args[1]) == TOP
+        if kind == 'chain':
+            return prop(args[0]) == TOP or any(prop(a) == BOTTOM for a in args[1:])
+        if kind == 'equivalent-property':
+            values = {prop(a) for a in args}
+            return values in ({BOTTOM}, {TOP})
+        if kind == 'disjoint-property':
+            return sum(prop(a) != BOTTOM for a in args) <= 1
+        if kind == 'domain':
+            # Range axioms of object properties follow the same rule
+            return prop(args[0]) == BOTTOM or cls(args[1]) == TOP
+        if kind == 'characteristic':
+            return prop(args[0]) in CHARACTERISTICS[args[1]]
+        if kind == 'key':
+            return cls(args[0]) == BOTTOM
+        if kind == 'class-assertion':
+            return cls(args[0]) == TOP
+        if kind == 'property-assertion':
+            return prop(args[0]) == TOP
+        if kind == 'negative-assertion':
+            return prop(args[0]) == BOTTOM
+        return False
+
+
+def extract(graph: 'Graph', logical: Sequence[Axiom], signature: Set['Node'], mode: str) -> Set[int]:
+    """Indices of the axioms in the ⊥- or ⊤-module for a signature.
+
+    Axioms are only re-checked when an entity they mention joins the
+    signature, as that is the only way a local axiom can become non-local.
+    """
+    signature = set(signature)
+    locality = Locality(graph, mode, signature)
+    by_entity: Dict['Node', List[int]] = {}
+    for i, axiom in enumerate(logical):
+        for entity in axiom.signature:
+            by_entity.setdefault(entity, []).append(i)
+
+    module: Set[int] = set()
+    pending = list(range(len(logical)))
+    while pending:
+        i = pending.pop()
+        if i in module or locality.is_local(logical[i]):
+            continue
+        module.add(i)
+        for entity in logical[i].signature - signature:
+            signature.add(entity)
+            pending.extend(j for j in by_entity.get(entity, ()) if j not in module)
+    return module
+
+
+def module_axioms(graph: 'Graph', all_axioms: Sequence[Axiom], signature: Set['Node'],
+                  module_type: str = 'bottom') -> List[Axiom]:
+    """The axioms of the module of the given type, with their annotations and declarations."""
+    logical = [a for a in all_axioms if a.kind not in ('declaration', 'annotation')]
+    modes = {'bottom': [BOTTOM], 'top': [TOP], 'star': [BOTTOM, TOP]}[module_type]
+    selected = logical
+    while True:
+        before = len(selected)
+        for mode in modes:
+            module = extract(graph, selected, signature, mode)
+            selected = [a for i, a in enumerate(selected) if i in module]
+        if module_type != 'star' or len(selected) == before:
+            break
+
+    entities = set(signature).union(*(a.signature for a in selected))
+    extras = [a for a in all_axioms if a.kind in ('declaration', 'annotation') and a.subject in entities]
+    # and the declarations of the annotation properties those use
+    used = {p for a in extras for _, p, _ in a.triples} - entities
+    extras.extend(a for a in all_axioms if a.kind == 'declaration' and a.subject in used)
+    return selected + extras
+
+
+def local_sources(root: Path) -> List[Path]:
+    """RDF files of the domain ontology and data."""
+    sources = []
+    for directory in LOCAL_SOURCES:
+        if (root / directory).is_dir():
+            sources.extend(sorted(p for p in (root / directory).rglob('*') if p.suffix.lower() in RDF_FORMATS))
+    return sources
+
+
+def _load(path: Path) -> Tuple['Graph', float]:
+    from rdflib import Dataset, Graph
+
+    start = time.perf_counter()
+    graph = Dataset(default_union=True) if rdf_format(path) in ('trig', 'nquads') else Graph()
+    try:
+        graph.parse(path, format=rdf_format(path))
+    except Exception as e:
+        raise click.ClickException(f"Failed to parse {path}: {e}")
+    return graph, time.perf_counter() - start
+
+
+def imported_sources(root: Path, graphs: Dict[Path, 'Graph'], load_times: Dict[Path, float]) -> Dict[Path, str]:
+    """Files in the imports closure of the loaded graphs, with their ontology IRI.
+
+    The imported files are parsed into `graphs`, timing each in `load_times`.
+    IES core counts as imported when it is provisioned, as the other tools
+    load it alongside the domain ontology.
+    """
+    from rdflib import URIRef
+
+    catalog = project_catalog(root)
+    by_path: Dict[Path, str] = {}
+    for iri, path in catalog.items():
+        by_path.setdefault(path.resolve(), iri)
+    local = set(graphs)
+    imported: Dict[Path, str] = {}
+    queue = list(graphs.values())
+    if (root / CORE_ONTOLOGY).exists():
+        core = (root / CORE_ONTOLOGY).resolve()
+        imported[core] = by_path.get(core, core.as_uri())
+        graphs[core], load_times[core] = _load(core)
+        queue.append(graphs[core])
+    while queue:
+        graph = queue.pop(0)
+        for iri in sorted(str(o) for o in graph.objects(None, URIRef(OWL_IMPORTS))):
+            path = catalog.get(iri) or catalog.get(iri.rstrip('#/'))
+            if path is None or not path.exists():
+                logger.warning(f"Import not found in the catalogs: {iri}")
+                continue
+            path = path.resolve()
+            if path in local or path in imported:
+                continue
+            imported[path] = iri
+            graphs[path], load_times[path] = _load(path)
+            queue.append(graphs[path])
+    return imported
+
+
+def _module_name(path: Path, root: Path, taken: Set[str]) -> str:
+    try:
+        parts = path.relative_to(root).parts
+    except ValueError:
+        parts = path.parts
+    # core/src/ontology/ontology.ttl is better known as core
+    stem = path.stem if len(parts) <= 2 else parts[0]
+    name, n = stem, 1
+    while name in taken:
+        n += 1
+        name = f"{stem}-{n}"
+    taken.add(name)
+    return f"{name}.ttl"
+
+
+def write_module(path: Path, iri: str, source: 'Graph', selected: Sequence[Axiom]) -> int:
+    """Serialise a module as Turtle under the imported ontology's IRI."""
+    from rdflib import Graph, Literal, URIRef
+
+    module = Graph()
+    for prefix, namespace in source.namespaces():
+        module.bind(prefix, namespace, override=False)
+    header = URIRef(iri)
+    module.add((header, URIRef(RDF_TYPE), URIRef(OWL_ONTOLOGY)))
+    module.add((header, URIRef(RDFS + 'comment'), Literal(
+        f"Locality-based module of {iri} for the signature of the project's ontology and data, "
+        f"written by ies-build extract-module.")))
+    for ontology in source.subjects(URIRef(RDF_TYPE), URIRef(OWL_ONTOLOGY)):
+        for imported in source.objects(ontology, URIRef(OWL_IMPORTS)):
+            module.add((header, URIRef(OWL_IMPORTS), imported))
+    for axiom in selected:
+        for triple in axiom.triples:
+            module.add(triple)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    module.serialize(destination=path, format='turtle')
+    return len(module)
+
+
+def write_catalog(path: Path, root: Path, modules: Dict[str, Path]) -> None:
+    """An OASIS XML catalog mapping ontology IRIs to module files."""
+    ET.register_namespace('', CATALOG_NAMESPACE)
+    catalog = ET.Element(f'{{{CATALOG_NAMESPACE}}}catalog')
+    for iri, module in sorted(modules.items()):
+        ET.SubElement(catalog, f'{{{CATALOG_NAMESPACE}}}uri', name=iri,
+                      uri=f"file:/{module.relative_to(root).as_posix()}")
+    ET.indent(catalog)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(catalog).write(path, encoding='UTF-8', xml_declaration=True)
+
+
+def _union(graphs: Iterable['Graph']) -> 'Graph':
+    from rdflib import Graph
+
+    union = Graph()
+    for graph in graphs:
+        for triple in graph:
+            union.add(triple)
+    return union
+
+
+def extract_modules(root: Path = Path('.'), module_type: str = 'bottom',
+                    output_dir: Optional[Path] = None) -> List[ModuleReport]:
+    """Extract and write a module of every imported file for the project's signature."""
+    root = Path(root).resolve()
+    output_dir = root / (output_dir or MODULE_DIR)
+    sources = local_sources(root)
+    if not sources:
+        raise click.ClickException(f"No ontology or data files under {', '.join(map(str, LOCAL_SOURCES))}")
+
+    graphs = {path.resolve(): _load(path)[0] for path in sources}
+    seed = set().union(*(_signature(graph) for graph in graphs.values()))
+    logger.info(f"Seed signature of {len(seed)} terms from {len(sources)} file(s)")
+    load_times: Dict[Path, float] = {}
+    imported = imported_sources(root, graphs, load_times)
+    if not imported:
+        raise click.ClickException("The ontology imports nothing that resolves to a local file")
+
+    # Axioms are grouped per file but extracted together, as one import's
+    # axioms can pull terms of another into the signature
+    per_file = {path: axioms(graphs[path]) for path in imported}
+    union = _union(graphs[p] for p in imported)
+    everything = [a for path in imported for a in per_file[path]]
+    selected = {id(a) for a in module_axioms(union, everything, seed, module_type)}
+
+    reports, modules, taken = [], {}, set()
+    for path, iri in imported.items():
+        module_path = output_dir / _module_name(path, root, taken)
+        write_module(module_path, iri, graphs[path], [a for a in per_file[path] if id(a) in selected])
+        module_graph, module_load = _load(module_path)
+        modules[iri] = module_path
+        source = path.relative_to(root) if path.is_relative_to(root) else path
+        reports.append(ModuleReport(iri, str(source), str(module_path.relative_to(root)), len(graphs[path]),
+                                    len(module_graph), load_times[path], module_load))
+    write_catalog(output_dir / MODULE_CATALOG.name, root, modules)
+    return reports
+
+
+@click.command('extract-module')
+@click.option('--type', 'module_type', type=click.Choice(MODULE_TYPES), default='bottom', show_default=True,
+              help="Locality notion: bottom modules keep the imported superclass chains, star modules "
+                   "are smaller but drop them")
+@click.option('--json', 'as_json', is_flag=True, help="Print the report as JSON")
+def extract_module(module_type: str, as_json: bool):
+    """Extract modules of the imports for the terms the ontology and data use."""
+    try:
+        start = time.perf_counter()
+        reports = extract_modules(Path('.'), module_type)
+        if as_json:
+            click.echo(json.dumps([dict(asdict(r), reduction=r.reduction) for r in reports], indent=2))
+            return
+
+        click.echo(f"📦 {module_type.capitalize()} modules of {len(reports)} import(s) "
+                   f"({time.perf_counter() - start:.1f}s)")
+        for r in reports:
+            click.echo(f"  {r.module}: {r.source_triples} → {r.module_triples} triples "
+                       f"({r.reduction:.0%} smaller), load {r.source_load_s * 1000:.0f}ms → "
+                       f"{r.module_load_s * 1000:.0f}ms")
+        full = sum(r.source_triples for r in reports)
+        kept = sum(r.module_triples for r in reports)
+        full_load = sum(r.source_load_s for r in reports)
+        module_load = sum(r.module_load_s for r in reports)
+        click.echo(f"✨ Imports closure {full} → {kept} triples ({1 - kept / max(full, 1):.0%} smaller), "
+                   f"load {full_load * 1000:.0f}ms → {module_load * 1000:.0f}ms")
+        click.echo(f"✅ Modules and catalog written to {MODULE_DIR}; use them with --modules")
+
+    except click.ClickException as e:
+        click.echo(f"❌ Error: {str(e)}", err=True)
+        raise click.Abort()
@@ -0,0 +1,142 @@
+"""Loading and fingerprinting of the ontology and data sources.
+
+rdflib is imported inside the functions that need it, so build commands that
+never touch RDF do not pay for the import.
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence
+
+import click
+
+if TYPE_CHECKING:
+    from rdflib import Graph
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ONTOLOGY = Path('src') / 'ontology' / 'ontology.ttl'
+DEFAULT_DATA = Path('src') / 'data' / 'data.ttl'
+# IES core, provisioned as the `core` submodule (see catalog.xml)
+CORE_ONTOLOGY = Path('core') / 'src' / 'ontology' / 'ontology.ttl'
+
+RDF = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#'
+RDFS = 'http://www.w3.org/2000/01/rdf-schema#'
+OWL = 'http://www.w3.org/2002/07/owl#'
+SKOS = 'http://www.w3.org/2004/02/skos/core#'
+XSD = 'http://www.w3.org/2001/XMLSchema#'
+
+RDF_TYPE = RDF + 'type'
+RDFS_LABEL = RDFS + 'label'
+RDFS_COMMENT = RDFS + 'comment'
+RDFS_SUBCLASSOF = RDFS + 'subClassOf'
+RDFS_SUBPROPERTYOF = RDFS + 'subPropertyOf'
+RDFS_DOMAIN = RDFS + 'domain'
+RDFS_RANGE = RDFS + 'range'
+SKOS_PREFLABEL = SKOS + 'prefLabel'
+SKOS_ALTLABEL = SKOS + 'altLabel'
+SKOS_DEFINITION = SKOS + 'definition'
+
+CLASS_TYPES = {OWL + 'Class', RDFS + 'Class'}
+OBJECT_PROPERTY = OWL + 'ObjectProperty'
+DATATYPE_PROPERTY = OWL + 'DatatypeProperty'
+ANNOTATION_PROPERTY = OWL + 'AnnotationProperty'
+PROPERTY_TYPES = {OBJECT_PROPERTY, DATATYPE_PROPERTY, ANNOTATION_PROPERTY, RDF + 'Property'}
+
+# Namespaces whose terms are vocabulary plumbing rather than modelled concepts
+BUILTIN_NAMESPACES = (RDF, RDFS, OWL, XSD)
+
+RDF_FORMATS = {
+    '.ttl': 'turtle',
+    '.trig': 'trig',
+    '.nt': 'nt',
+    '.nq': 'nquads',
+    '.rdf': 'xml',
+    '.owl': 'xml',
+    '.jsonld': 'json-ld',
+}
+
+
+def files_hash(paths: Iterable[Path], salt: str = '') -> str:
+    """SHA-256 over the contents of the given files, in order.
+
+    The optional salt lets callers fold generator settings into the hash so
+    that changing an option also invalidates previous output.
+    """
+    digest = hashlib.sha256(salt.encode())
+    for path in paths:
+        path = Path(path)
+        digest.update(str(path.name).encode())
+        digest.update(b'\0')
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def default_sources(include_data: bool = True, root: Path = Path('.')) -> List[Path]:
+    """IES core (when provisioned), the domain ontology and optionally the data."""
+    candidates = [CORE_ONTOLOGY, DEFAULT_ONTOLOGY] + ([DEFAULT_DATA] if include_data else [])
+    return [Path(root) / path for path in candidates if (Path(root) / path).exists()]
+
+
+def rdf_format(path: Path) -> str:
+    """rdflib parser name for a file, based on its extension."""
+    try:
+        return RDF_FORMATS[Path(path).suffix.lower()]
+    except KeyError:
+        raise click.ClickException(f"Unsupported RDF file type: {path}")
+
+
+def load_graph(paths: Sequence[Path]) -> 'Graph':
+    """Parse the given RDF files into a single rdflib graph."""
+    from rdflib import Graph
+
+    graph = Graph()
+    for path in paths:
+        path = Path(path)
+        if not path.exists():
+            raise click.ClickException(f"RDF file not found: {path}")
+        try:
+            graph.parse(path, format=rdf_format(path))
+        except Exception as e:
+            raise click.ClickException(f"Failed to parse {path}: {e}")
+        logger.info(f"Loaded {path} ({len(graph)} triples so far)")
+    return graph
+
+
+def split_iri(iri: str) -> List[str]:
+    """Split an IRI into namespace and local name at the last '#' or '/'."""
+    for sep in ('#', '/', ':'):
+        index = iri.rfind(sep)
+        if index != -1 and index < len(iri) - 1:
+            return [iri[:index + 1], iri[index + 1:]]
+    return [iri, '']
+
+
+def namespace_of(iri: str) -> str:
+    return split_iri(iri)[0]
+
+
+def local_name(iri: str) -> str:
+    return split_iri(iri)[1] or iri
+
+
+def is_builtin(iri: str) -> bool:
+    """True for RDF, RDFS, OWL and XSD vocabulary terms."""
+    return iri.startswith(BUILTIN_NAMESPACES)
+
+
+def prefix_map(graph: 'Graph') -> Dict[str, str]:
+    """Namespace IRI to prefix, for the prefixes declared in the graph."""
+    prefixes: Dict[str, str] = {}
+    for prefix, namespace in graph.namespaces():
+        if prefix:
+            prefixes.setdefault(str(namespace), prefix)
+    return prefixes
+
+
+def curie(iri: str, prefixes: Dict[str, str]) -> str:
+    """Compact `prefix:local` form of an IRI, or the IRI itself if no prefix is known."""
+    namespace, name = split_iri(iri)
+    prefix = prefixes.get(namespace)
+    return f"{prefix}:{name}" if prefix is not None and name else iri
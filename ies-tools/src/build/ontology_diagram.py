@@ -0,0 +1,461 @@
+"""Generate the ontology overview diagram from the ontology itself.
+
+Classes and object/datatype properties are grouped into one cluster per
+namespace, with subclass, subproperty, domain and range edges. The output is
+only rewritten when the ontology (or a generator setting) changes: the hash
+is stored in the first line of the generated DOT file.
+
+Layout cost grows quickly with node count, so large ontologies switch from
+`dot` to the force-directed `sfdp` engine, and very large ones are split into
+an overview of namespaces plus one view per namespace. A namespace that is
+itself above the split threshold is divided further into views of whole
+top-level subtrees of its class and property hierarchy.
+"""
+
+import logging
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Tuple
+
+import click
+
+from .ontology import (
+    CLASS_TYPES,
+    DATATYPE_PROPERTY,
+    OBJECT_PROPERTY,
+    RDF_TYPE,
+    RDFS_DOMAIN,
+    RDFS_LABEL,
+    RDFS_RANGE,
+    RDFS_SUBCLASSOF,
+    RDFS_SUBPROPERTYOF,
+    files_hash,
+    is_builtin,
+    load_graph,
+    default_sources,
+    local_name,
+    namespace_of,
+    prefix_map,
+)
+
+if TYPE_CHECKING:
+    from rdflib import Graph
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT = Path('docs') / 'diagrams' / 'ontology-overview.dot'
+HASH_MARKER = '// ontology-hash:'
+
+# Above this many nodes `dot` is replaced by `sfdp`
+DEFAULT_SFDP_THRESHOLD = 300
+# Above this many nodes the diagram is split into per-namespace views
+DEFAULT_SPLIT_THRESHOLD = 2000
+
+CLASS_COLOURS = ['lightblue', 'lightgreen', 'lightsalmon', 'khaki', 'plum', 'lightcyan']
+EDGE_LABELS = {
+    RDFS_SUBCLASSOF: 'rdfs:subClassOf',
+    RDFS_SUBPROPERTYOF: 'rdfs:subPropertyOf',
+    RDFS_DOMAIN: 'rdfs:domain',
+    RDFS_RANGE: 'rdfs:range',
+}
+HIERARCHY_LABELS = {EDGE_LABELS[RDFS_SUBCLASSOF], EDGE_LABELS[RDFS_SUBPROPERTYOF]}
+
+
+@dataclass
+class DiagramNode:
+    """A class or property shown in the diagram."""
+    iri: str
+    label: str
+    kind: str  # 'class', 'object', 'datatype'
+    namespace: str
+
+
+@dataclass
+class OntologyModel:
+    """The part of the ontology that is drawn."""
+    nodes: Dict[str, DiagramNode] = field(default_factory=dict)
+    edges: List[Tuple[str, str, str]] = field(default_factory=list)
+    prefixes: Dict[str, str] = field(default_factory=dict)
+
+    def prefix(self, namespace: str) -> str:
+        return self.prefixes[namespace]
+
+    def prefixes_used(self) -> Set[str]:
+        return {node.namespace for node in self.nodes.values()}
+
+    def node_id(self, iri: str) -> str:
+        node = self.nodes[iri]
+        return f"{self.prefix(node.namespace)}:{local_name(iri)}"
+
+
+def extract_model(graph: 'Graph') -> OntologyModel:
+    """Collect classes, properties and the edges between them."""
+    from rdflib import URIRef
+
+    model = OntologyModel(prefixes=prefix_map(graph))
+
+    def label_for(iri: str) -> str:
+        for label in graph.objects(URIRef(iri), URIRef(RDFS_LABEL)):
+            return str(label)
+        return local_name(iri)
+
+    def add_node(iri: str, kind: str) -> None:
+        if iri not in model.nodes:
+            model.nodes[iri] = DiagramNode(iri, label_for(iri), kind, namespace_of(iri))
+
+    for class_type in CLASS_TYPES:
+        for subject in graph.subjects(URIRef(RDF_TYPE), URIRef(class_type)):
+            if isinstance(subject, URIRef) and not is_builtin(str(subject)):
+                add_node(str(subject), 'class')
+    for prop_type, kind in [(OBJECT_PROPERTY, 'object'), (DATATYPE_PROPERTY, 'datatype')]:
+        for subject in graph.subjects(URIRef(RDF_TYPE), URIRef(prop_type)):
+            if isinstance(subject, URIRef) and not is_builtin(str(subject)):
+                add_node(str(subject), kind)
+
+    declared = set(model.nodes)
+    for predicate, label in EDGE_LABELS.items():
+        for subject, obj in graph.subject_objects(URIRef(predicate)):
+            if not (isinstance(subject, URIRef) and isinstance(obj, URIRef)):
+                continue
+            source, target = str(subject), str(obj)
+            if source not in declared or is_builtin(target):
+                continue
+            if target not in model.nodes:
+                # Terms from imported ontologies that the domain builds on
+                kind = model.nodes[source].kind if predicate == RDFS_SUBPROPERTYOF else 'class'
+                add_node(target, kind)
+            model.edges.append((source, target, label))
+    model.edges.sort()
+
+    # Namespaces without a declared prefix get a generated one
+    unnamed = sorted(ns for ns in model.prefixes_used() if ns not in model.prefixes)
+    for index, namespace in enumerate(unnamed):
+        model.prefixes[namespace] = f"ns{index}"
+    return model
+
+
+def _quote(text: str) -> str:
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _node_line(model: OntologyModel, node: DiagramNode, colours: Dict[str, str]) -> str:
+    if node.kind == 'class':
+        attrs = f"fillcolor={colours[node.namespace]}"
+    else:
+        fill = 'pink' if node.kind == 'object' else 'yellow'
+        attrs = f"shape=diamond, fillcolor={fill}"
+    return f"{_quote(model.node_id(node.iri))} [label={_quote(node.label)}, {attrs}];"
+
+
+def _header(name: str, ontology_hash: str, node_count: int, sfdp_threshold: int) -> List[str]:
+    lines = [
+        f"{HASH_MARKER} {ontology_hash}",
+        '// Generated by `ies-build diagram-from-ontology`. Do not edit by hand.',
+        f"digraph {_quote(name)} {{",
+    ]
+    if node_count > sfdp_threshold:
+        lines += [
+            '   layout=sfdp;',
+            '   overlap=prism;',
+            '   outputorder=edgesfirst;',
+            '   splines=false;',
+        ]
+    else:
+        lines.append('   rankdir=BT;')
+    lines.append('   node [shape=box, style=filled, fillcolor=lightgray];')
+    return lines
+
+
+def _namespace_colours(namespaces: Sequence[str]) -> Dict[str, str]:
+    return {ns: CLASS_COLOURS[i % len(CLASS_COLOURS)] for i, ns in enumerate(sorted(namespaces))}
+
+
+def partition_namespace(model: OntologyModel, namespace: str, limit: int) -> List[Set[str]]:
+    """Split the terms of a namespace into groups of at most `limit` terms.
+
+    Terms are grouped by top-level subtree of the subclass/subproperty
+    hierarchy within the namespace. Small subtrees are packed together; a
+    subtree larger than `limit` is split at its root into its child subtrees.
+    """
+    members = sorted(iri for iri, node in model.nodes.items() if node.namespace == namespace)
+    member_set = set(members)
+    below: Dict[str, List[str]] = defaultdict(list)
+    has_parent: Set[str] = set()
+    for source, target, label in model.edges:
+        if label in HIERARCHY_LABELS and source != target and {source, target} <= member_set:
+            below[target].append(source)
+            has_parent.add(source)
+
+    # Spanning forest: each term hangs under the first parent that reaches it
+    children: Dict[str, List[str]] = defaultdict(list)
+    roots: List[str] = []
+    order: List[str] = []
+    visited: Set[str] = set()
+    # Terms without a parent first; the rest only become roots when in a cycle
+    for start in [iri for iri in members if iri not in has_parent] + members:
+        if start in visited:
+            continue
+        roots.append(start)
+        visited.add(start)
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for child in sorted(below[node]):
+                if child not in visited:
+                    visited.add(child)
+                    children[node].append(child)
+                    stack.append(child)
+
+    size = {}
+    for node in reversed(order):
+        size[node] = 1 + sum(size[child] for child in children[node])
+
+    def subtree(root: str) -> Set[str]:
+        nodes, stack = set(), [root]
+        while stack:
+            node = stack.pop()
+            nodes.add(node)
+            stack.extend(children[node])
+        return nodes
+
+    units: List[Set[str]] = []
+    stack = list(reversed(roots))
+    while stack:
+        node = stack.pop()
+        if size[node] <= limit:
+            units.append(subtree(node))
+        else:
+            units.append({node})
+            stack.extend(reversed(children[node]))
+
+    groups: List[Set[str]] = []
+    for unit in units:
+        if groups and len(groups[-1]) + len(unit) <= limit:
+            groups[-1] |= unit
+        else:
+            groups.append(set(unit))
+    return groups
+
+
+def render_full(
+        model: OntologyModel,
+        ontology_hash: str,
+        sfdp_threshold: int,
+        terms: Optional[Set[str]] = None,
+        title: str = 'ontology',
+) -> str:
+    """DOT source for all nodes, or only the given terms plus their neighbours."""
+    included = set(model.nodes) if terms is None else terms
+    edges = [e for e in model.edges if e[0] in included or e[1] in included]
+    shown = included | {e[0] for e in edges} | {e[1] for e in edges}
+
+    by_namespace: Dict[str, List[DiagramNode]] = defaultdict(list)
+    for iri in sorted(shown):
+        by_namespace[model.nodes[iri].namespace].append(model.nodes[iri])
+    colours = _namespace_colours(list(model.prefixes_used()))
+
+    lines = _header(title, ontology_hash, len(shown), sfdp_threshold)
+    for index, (namespace, nodes) in enumerate(sorted(by_namespace.items())):
+        lines += [
+            '',
+            f"   subgraph cluster_{index} {{",
+            f"       label={_quote(f'{model.prefix(namespace)}: <{namespace}>')};",
+            '       style=dashed;',
+        ]
+        lines += [f"       {_node_line(model, node, colours)}" for node in nodes]
+        lines.append('   }')
+
+    lines.append('')
+    for source, target, label in edges:
+        lines.append(
+            f"   {_quote(model.node_id(source))} -> {_quote(model.node_id(target))} "
+            f"[label={_quote(label)}];"
+        )
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def render_overview(
+        model: OntologyModel,
+        ontology_hash: str,
+        module_files: Dict[str, List[str]],
+        split_threshold: int,
+) -> str:
+    """DOT source with one node per namespace and aggregated edges between them."""
+    counts = Counter(node.namespace for node in model.nodes.values())
+    links = Counter(
+        (model.nodes[s].namespace, model.nodes[t].namespace, label)
+        for s, t, label in model.edges
+        if model.nodes[s].namespace != model.nodes[t].namespace
+    )
+    lines = _header('ontology', ontology_hash, len(counts), split_threshold)
+    for namespace in sorted(counts):
+        prefix = model.prefix(namespace)
+        files = '\\n'.join(module_files.get(namespace, []))
+        label = f"{prefix}\\n{counts[namespace]} terms\\n{files}"
+        lines.append(f"   {_quote(prefix)} [label=\"{label}\", shape=folder];")
+    for (source, target, label), count in sorted(links.items()):
+        lines.append(
+            f"   {_quote(model.prefix(source))} -> {_quote(model.prefix(target))} "
+            f"[label={_quote(f'{label} ({count})')}];"
+        )
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def stored_hash(path: Path) -> Optional[str]:
+    """Ontology hash recorded in a previously generated DOT file."""
+    try:
+        with open(path) as f:
+            first = f.readline()
+    except OSError:
+        return None
+    if first.startswith(HASH_MARKER):
+        return first[len(HASH_MARKER):].strip()
+    return None
+
+
+class OntologyDiagramGenerator:
+    """Writes DOT sources for the ontology overview when the ontology changes."""
+
+    def __init__(
+            self,
+            sources: Sequence[Path],
+            output: Path = DEFAULT_OUTPUT,
+            sfdp_threshold: int = DEFAULT_SFDP_THRESHOLD,
+            split_threshold: int = DEFAULT_SPLIT_THRESHOLD,
+    ):
+        self.sources = [Path(s) for s in sources]
+        self.output = Path(output)
+        self.sfdp_threshold = sfdp_threshold
+        self.split_threshold = split_threshold
+
+    def ontology_hash(self) -> str:
+        return files_hash(self.sources, salt=f"{self.sfdp_threshold}:{self.split_threshold}")
+
+    def module_path(self, prefix: str) -> Path:
+        safe = re.sub(r'[^A-Za-z0-9_-]', '-', prefix)
+        return self.output.with_name(f"{self.output.stem}-{safe}.dot")
+
+    def _stale_modules(self) -> List[Path]:
+        """Previously generated per-namespace views next to the output."""
+        pattern = f"{self.output.stem}-*.dot"
+        return [p for p in self.output.parent.glob(pattern) if stored_hash(p) is not None]
+
+    def generate(self, force: bool = False) -> List[Path]:
+        """Write the diagram(s) and return their paths; nothing is written if up to date."""
+        ontology_hash = self.ontology_hash()
+        if not force and stored_hash(self.output) == ontology_hash:
+            logger.info(f"{self.output} is up to date with the ontology")
+            return []
+
+        if not force and self.output.exists() and stored_hash(self.output) is None:
+            raise click.ClickException(
+                f"{self.output} was not generated by this command; use --force to replace it, "
+                f"or --output to write elsewhere"
+            )
+
+        model = extract_model(load_graph(self.sources))
+        logger.info(f"Extracted {len(model.nodes)} nodes and {len(model.edges)} edges")
+        if not model.nodes:
+            sources = ', '.join(str(s) for s in self.sources)
+            raise click.ClickException(
+                f"No classes or properties found in {sources}; is the core submodule provisioned?"
+            )
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+
+        old_modules = set(self._stale_modules())
+        written = []
+        if len(model.nodes) > self.split_threshold:
+            module_files: Dict[str, List[str]] = defaultdict(list)
+            for namespace in sorted(model.prefixes_used()):
+                prefix = model.prefix(namespace)
+                groups = partition_namespace(model, namespace, self.split_threshold)
+                for index, terms in enumerate(groups, start=1):
+                    name = prefix if len(groups) == 1 else f"{prefix}-{index}"
+                    path = self.module_path(name)
+                    path.write_text(render_full(model, ontology_hash, self.sfdp_threshold, terms, name))
+                    module_files[namespace].append(path.name)
+                    written.append(path)
+            self.output.write_text(render_overview(model, ontology_hash, module_files, self.split_threshold))
+        else:
+            self.output.write_text(render_full(model, ontology_hash, self.sfdp_threshold))
+        written.insert(0, self.output)
+
+        for path in old_modules - set(written):
+            path.unlink()
+        return written
+
+
+@click.command()
+@click.option(
+    '--ontology',
+    'sources',
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Ontology file(s) to draw (repeatable; default: core and the domain ontology)"
+)
+@click.option(
+    '--output',
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_OUTPUT,
+    show_default=True,
+    help="DOT file to write"
+)
+@click.option(
+    '--sfdp-threshold',
+    default=DEFAULT_SFDP_THRESHOLD,
+    show_default=True,
+    help="Use the sfdp layout engine above this many nodes"
+)
+@click.option(
+    '--split-threshold',
+    default=DEFAULT_SPLIT_THRESHOLD,
+    show_default=True,
+    help="Above this many nodes, write views of at most this many nodes per namespace"
+)
+@click.option(
+    '--force',
+    is_flag=True,
+    help="Regenerate even if the ontology is unchanged, and replace an output that was not generated"
+)
+@click.option('--render', is_flag=True, help="Also render the generated diagrams to SVG and PNG")
+def diagram_from_ontology(
+        sources: Tuple[Path, ...],
+        output: Path,
+        sfdp_threshold: int,
+        split_threshold: int,
+        force: bool,
+        render: bool,
+):
+    """Generate the ontology overview diagram from the ontology."""
+    try:
+        sources = list(sources) or default_sources(include_data=False)
+        if not sources:
+            raise click.ClickException("No ontology sources found; pass --ontology")
+        generator = OntologyDiagramGenerator(sources, output, sfdp_threshold, split_threshold)
+        written = generator.generate(force=force)
+        if not written:
+            click.echo("✓ Ontology diagram is up to date")
+            return
+        for path in written:
+            click.echo(f"📝 Wrote {path}")
+
+        if render:
+            from .build import DiagramBuilder
+
+            builder = DiagramBuilder(Path('.'))
+            builder.setup_build_directory()
+            for path in written:
+                for output_ext in builder.OUTPUT_FORMATS:
+                    builder.generate_graphviz_diagram(
+                        path, builder.build_diagrams / f"{path.stem}{output_ext}"
+                    )
+        click.echo("✨ Ontology diagram generation completed")
+
+    except click.ClickException as e:
+        click.echo(f"❌ Error: {str(e)}", err=True)
+        raise click.Abort()
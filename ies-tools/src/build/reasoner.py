@@ -0,0 +1,347 @@
+"""Forward-chaining RDFS and OWL 2 RL materialisation.
+
+The Reasoner keeps explicit and inferred triples in one dictionary-encoded
+TripleStore and applies these rules (OWL 2 RL rule names):
+
+    rdfs2/rdfs3 (prp-dom, prp-rng)    domain and range typing
+    rdfs5/rdfs7 (scm-spo, prp-spo1)   sub-property transitivity and propagation
+    rdfs9/rdfs11 (cax-sco, scm-sco)   subclass typing and transitivity
+    scm-dom1/2, scm-rng1/2            domains and ranges through the hierarchies
+    scm-eqc1, scm-eqp1                equivalent classes and properties
+    prp-inv1/2, prp-symp, prp-trp     inverse, symmetric and transitive properties
+
+Evaluation is semi-naive: every new triple is joined once against the store
+as it stands when the triple is taken off the work list, so each combination
+of premises is considered when the later of them arrives.
+
+Removals use delete/rederive (DRed): everything derivable from the removed
+triples is over-deleted, then the over-deleted triples that still have a
+one-step derivation from what is left are put back and chained forward.
+Explicit triples are never over-deleted.
+"""
+
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Set, Tuple
+
+import click
+
+from .ontology import OWL, RDF_TYPE, RDFS_DOMAIN, RDFS_RANGE, RDFS_SUBCLASSOF, RDFS_SUBPROPERTYOF
+from .triples import TermDictionary, Triple, TripleStore
+
+if TYPE_CHECKING:
+    from rdflib.term import Node
+
+OWL_INVERSE_OF = OWL + 'inverseOf'
+OWL_EQUIVALENT_CLASS = OWL + 'equivalentClass'
+OWL_EQUIVALENT_PROPERTY = OWL + 'equivalentProperty'
+OWL_SYMMETRIC_PROPERTY = OWL + 'SymmetricProperty'
+OWL_TRANSITIVE_PROPERTY = OWL + 'TransitiveProperty'
+
+_EMPTY: Set[int] = frozenset()
+
+
+class Reasoner:
+    """Incrementally maintained materialisation of a set of explicit triples."""
+
+    def __init__(self):
+        from rdflib import URIRef
+
+        self.dictionary = TermDictionary()
+        self.store = TripleStore()
+        self.explicit: Set[Triple] = set()
+        encode = self.dictionary.encode
+        self.TYPE = encode(URIRef(RDF_TYPE))
+        self.SC = encode(URIRef(RDFS_SUBCLASSOF))
+        self.SPO = encode(URIRef(RDFS_SUBPROPERTYOF))
+        self.DOMAIN = encode(URIRef(RDFS_DOMAIN))
+        self.RANGE = encode(URIRef(RDFS_RANGE))
+        self.INV = encode(URIRef(OWL_INVERSE_OF))
+        self.EQC = encode(URIRef(OWL_EQUIVALENT_CLASS))
+        self.EQP = encode(URIRef(OWL_EQUIVALENT_PROPERTY))
+        self.SYMMETRIC = encode(URIRef(OWL_SYMMETRIC_PROPERTY))
+        self.TRANSITIVE = encode(URIRef(OWL_TRANSITIVE_PROPERTY))
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    @property
+    def inferred_count(self) -> int:
+        return len(self.store) - len(self.explicit)
+
+    # --- Rules --------------------------------------------------------------
+
+    def _consequences(self, s: int, p: int, o: int) -> List[Triple]:
+        """Triples derivable from (s, p, o) together with the current store."""
+        spo, pos = self.store.spo, self.store.pos
+        literals = self.dictionary.literals
+        TYPE, SC, SPO = self.TYPE, self.SC, self.SPO
+        out: List[Triple] = []
+        o_is_resource = o not in literals
+
+        # Rules in which (s, p, o) is an instance of an arbitrary property
+        for q in spo.get(SPO, {}).get(p, _EMPTY):
+            out.append((s, q, o))
+        for c in spo.get(self.DOMAIN, {}).get(p, _EMPTY):
+            out.append((s, TYPE, c))
+        if o_is_resource:
+            for c in spo.get(self.RANGE, {}).get(p, _EMPTY):
+                out.append((o, TYPE, c))
+            for q in spo.get(self.INV, {}).get(p, _EMPTY):
+                out.append((o, q, s))
+            for q in pos.get(self.INV, {}).get(p, _EMPTY):
+                out.append((o, q, s))
+            if p in pos.get(TYPE, {}).get(self.SYMMETRIC, _EMPTY):
+                out.append((o, p, s))
+        if p in pos.get(TYPE, {}).get(self.TRANSITIVE, _EMPTY):
+            for z in spo[p].get(o, _EMPTY):
+                out.append((s, p, z))
+            for w in pos[p].get(s, _EMPTY):
+                out.append((w, p, o))
+
+        # Rules in which (s, p, o) is a schema triple
+        if p == TYPE:
+            for d in spo.get(SC, {}).get(o, _EMPTY):
+                out.append((s, TYPE, d))
+            if o == self.SYMMETRIC:
+                for x, y in self.store.pairs(s):
+                    if y not in literals:
+                        out.append((y, s, x))
+            elif o == self.TRANSITIVE:
+                objects = spo.get(s, {})
+                for x, ys in list(objects.items()):
+                    for y in list(ys):
+                        for z in objects.get(y, _EMPTY):
+                            out.append((x, s, z))
+        elif p == SC:
+            for x in pos.get(TYPE, {}).get(s, _EMPTY):
+                out.append((x, TYPE, o))
+            for d in spo[SC].get(o, _EMPTY):
+                out.append((s, SC, d))
+            for a in pos[SC].get(s, _EMPTY):
+                out.append((a, SC, o))
+            for q in pos.get(self.DOMAIN, {}).get(s, _EMPTY):
+                out.append((q, self.DOMAIN, o))
+            for q in pos.get(self.RANGE, {}).get(s, _EMPTY):
+                out.append((q, self.RANGE, o))
+        elif p == SPO:
+            for x, y in self.store.pairs(s):
+                out.append((x, o, y))
+            for r in spo[SPO].get(o, _EMPTY):
+                out.append((s, SPO, r))
+            for a in pos[SPO].get(s, _EMPTY):
+                out.append((a, SPO, o))
+            for c in spo.get(self.DOMAIN, {}).get(o, _EMPTY):
+                out.append((s, self.DOMAIN, c))
+            for c in spo.get(self.RANGE, {}).get(o, _EMPTY):
+                out.append((s, self.RANGE, c))
+        elif p == self.DOMAIN:
+            for x in spo.get(s, {}):
+                out.append((x, TYPE, o))
+            for d in spo.get(SC, {}).get(o, _EMPTY):
+                out.append((s, self.DOMAIN, d))
+            for q in pos.get(SPO, {}).get(s, _EMPTY):
+                out.append((q, self.DOMAIN, o))
+        elif p == self.RANGE:
+            for y in pos.get(s, {}):
+                if y not in literals:
+                    out.append((y, TYPE, o))
+            for d in spo.get(SC, {}).get(o, _EMPTY):
+                out.append((s, self.RANGE, d))
+            for q in pos.get(SPO, {}).get(s, _EMPTY):
+                out.append((q, self.RANGE, o))
+        elif p == self.INV:
+            for x, y in self.store.pairs(s):
+                if y not in literals:
+                    out.append((y, o, x))
+            for x, y in self.store.pairs(o):
+                if y not in literals:
+                    out.append((y, s, x))
+        elif p == self.EQC:
+            out.append((s, SC, o))
+            if o_is_resource:
+                out.append((o, SC, s))
+        elif p == self.EQP:
+            out.append((s, SPO, o))
+            if o_is_resource:
+                out.append((o, SPO, s))
+        return out
+
+    def _derivable(self, s: int, p: int, o: int) -> bool:
+        """Whether some rule derives (s, p, o) in one step from the current store."""
+        store = self.store
+        spo, pos = store.spo, store.pos
+        TYPE, SC, SPO = self.TYPE, self.SC, self.SPO
+
+        if any(o in spo[q].get(s, _EMPTY) for q in pos.get(SPO, {}).get(p, _EMPTY) if q in spo):
+            return True
+        for q in spo.get(self.INV, {}).get(p, _EMPTY) | pos.get(self.INV, {}).get(p, _EMPTY):
+            if (o, q, s) in store:
+                return True
+        types = pos.get(TYPE, {})
+        if p in types.get(self.SYMMETRIC, _EMPTY) and (o, p, s) in store:
+            return True
+        if p in types.get(self.TRANSITIVE, _EMPTY):
+            objects = spo.get(p, {})
+            if any(o in objects.get(z, _EMPTY) for z in objects.get(s, _EMPTY)):
+                return True
+
+        if p == TYPE:
+            if any((s, TYPE, d) in store for d in pos.get(SC, {}).get(o, _EMPTY)):
+                return True
+            if any(s in spo.get(q, {}) for q in pos.get(self.DOMAIN, {}).get(o, _EMPTY)):
+                return True
+            if any(s in pos.get(q, {}) for q in pos.get(self.RANGE, {}).get(o, _EMPTY)):
+                return True
+        elif p == SC:
+            if any((m, SC, o) in store for m in spo[SC].get(s, _EMPTY)):
+                return True
+            if (s, self.EQC, o) in store or (o, self.EQC, s) in store:
+                return True
+        elif p == SPO:
+            if any((m, SPO, o) in store for m in spo[SPO].get(s, _EMPTY)):
+                return True
+            if (s, self.EQP, o) in store or (o, self.EQP, s) in store:
+                return True
+        elif p in (self.DOMAIN, self.RANGE):
+            if any((d, SC, o) in store for d in spo[p].get(s, _EMPTY)):
+                return True
+            if any((q, p, o) in store for q in spo.get(SPO, {}).get(s, _EMPTY)):
+                return True
+        return False
+
+    # --- Maintenance --------------------------------------------------------
+
+    def _forward(self, queue: Iterable[Triple], touched: Set[Triple]) -> None:
+        """Semi-naive closure of the store under the rules, starting from queue."""
+        pending = deque(queue)
+        store = self.store
+        consequences = self._consequences
+        while pending:
+            for triple in consequences(*pending.popleft()):
+                if store.add(triple):
+                    touched.add(triple)
+                    pending.append(triple)
+
+    def add(self, triples: Iterable[Tuple['Node', 'Node', 'Node']]) -> Set[Triple]:
+        """Add explicit triples and everything they entail.
+
+        Returns the encoded triples whose presence or explicitness changed.
+        """
+        encode = self.dictionary.encode_triple
+        touched: Set[Triple] = set()
+        queue = []
+        for triple in triples:
+            encoded = encode(triple)
+            if encoded in self.explicit:
+                continue
+            self.explicit.add(encoded)
+            touched.add(encoded)
+            if self.store.add(encoded):
+                queue.append(encoded)
+        self._forward(queue, touched)
+        return touched
+
+    def remove(self, triples: Iterable[Tuple['Node', 'Node', 'Node']]) -> Set[Triple]:
+        """Retract explicit triples and whatever is no longer entailed (DRed).
+
+        Returns the encoded triples whose presence or explicitness changed.
+        """
+        ids = self.dictionary.ids
+        removed: Set[Triple] = set()
+        for s, p, o in triples:
+            try:
+                encoded = (ids[s], ids[p], ids[o])
+            except KeyError:
+                continue
+            if encoded in self.explicit:
+                self.explicit.discard(encoded)
+                removed.add(encoded)
+        if not removed:
+            return set()
+
+        # Over-delete: everything with a derivation that uses a removed triple
+        store = self.store
+        overdeleted: Set[Triple] = set()
+        pending = deque()
+        for triple in removed:
+            overdeleted.add(triple)
+            pending.append(triple)
+        while pending:
+            for triple in self._consequences(*pending.popleft()):
+                if triple not in overdeleted and triple not in self.explicit and triple in store:
+                    overdeleted.add(triple)
+                    pending.append(triple)
+        for triple in overdeleted:
+            store.remove(triple)
+
+        # Rederive: put back what still follows from what is left, then chain forward
+        touched = set(overdeleted)
+        rederived = []
+        for triple in overdeleted:
+            if self._derivable(*triple):
+                store.add(triple)
+                rederived.append(triple)
+        self._forward(rederived, touched)
+        return touched
+
+    def replace(self, old: Iterable[Tuple['Node', 'Node', 'Node']],
+                new: Iterable[Tuple['Node', 'Node', 'Node']]) -> Set[Triple]:
+        """Swap one set of explicit triples for another, applying only the difference."""
+        old, new = set(old), set(new)
+        touched = self.remove(old - new)
+        touched |= self.add(new - old)
+        return touched
+
+    def is_inferred(self, triple: Triple) -> bool:
+        return triple in self.store and triple not in self.explicit
+
+    def inferred(self) -> Iterator[Tuple['Node', 'Node', 'Node']]:
+        """The inferred (not explicit) triples, decoded."""
+        decode = self.dictionary.decode_triple
+        for triple in self.store:
+            if triple not in self.explicit:
+                yield decode(triple)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'explicit': len(self.explicit),
+            'inferred': self.inferred_count,
+            'total': len(self.store),
+            'terms': len(self.dictionary),
+        }
+
+
+@click.command()
+@click.option(
+    '--output',
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=Path('build') / 'inferred.ttl',
+    show_default=True,
+    help="Where to write the inferred triples"
+)
+def reason(output: Path):
+    """Materialise the RDFS and OWL 2 RL inferences of the ontology and data."""
+    from rdflib import URIRef
+
+    from .workspace import INFERRED_GRAPH, Workspace
+
+    try:
+        start = time.perf_counter()
+        workspace = Workspace(Path('.'), reasoning=True)
+        workspace.refresh()
+        stats = workspace.reasoner.stats()
+        click.echo(f"🧠 {stats['explicit']} explicit triples entail {stats['inferred']} more "
+                   f"({time.perf_counter() - start:.1f}s)")
+
+        inferred = workspace.dataset.graph(URIRef(INFERRED_GRAPH))
+        for prefix, namespace in workspace.dataset.namespaces():
+            inferred.bind(prefix, namespace, override=False)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        inferred.serialize(destination=output, format='turtle')
+        click.echo(f"✨ Inferred triples written to {output}")
+
+    except click.ClickException as e:
+        click.echo(f"❌ Error: {str(e)}", err=True)
+        raise click.Abort()
@@ -0,0 +1,169 @@
+"""Benchmark for the incremental reasoner on synthetic graphs.
+
+Each graph has a class tree, properties with domains, ranges, sub-properties,
+inverses and a transitive part-of, typed instances and edges between them,
+all drawn from a seeded random generator so runs are comparable. For every
+size the benchmark times full materialisation, then adding and then removing
+a batch of explicit triples incrementally, and compares both with the cost
+of materialising from scratch.
+
+    python -m ies-tools.src.build.reasoner_benchmark --sizes 10000,100000,1000000
+    python -m ies-tools.src.build.reasoner_benchmark --verify --json-output reasoner.json
+"""
+
+import json
+import random
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import click
+
+from .ontology import OWL, RDF_TYPE, RDFS_DOMAIN, RDFS_RANGE, RDFS_SUBCLASSOF, RDFS_SUBPROPERTYOF
+from .reasoner import OWL_INVERSE_OF, OWL_TRANSITIVE_PROPERTY, Reasoner
+
+NAMESPACE = 'http://example.org/bench#'
+DEFAULT_SIZES = '10000,100000,1000000'
+
+
+@dataclass
+class ReasonerMeasurement:
+    """Reasoner timings for one synthetic graph."""
+    explicit: int
+    inferred: int
+    materialise_s: float
+    batch: int
+    add_s: float
+    remove_s: float
+    verified: Optional[bool] = None
+
+    @property
+    def add_speedup(self) -> float:
+        return self.materialise_s / max(self.add_s, 1e-9)
+
+    @property
+    def remove_speedup(self) -> float:
+        return self.materialise_s / max(self.remove_s, 1e-9)
+
+
+def synthetic_graph(size: int, seed: int = 0) -> List[Tuple[object, object, object]]:
+    """About `size` explicit triples of ontology and instance data."""
+    from rdflib import URIRef
+
+    rng = random.Random(seed)
+    ns = NAMESPACE
+    type_, sub_class, sub_property = URIRef(RDF_TYPE), URIRef(RDFS_SUBCLASSOF), URIRef(RDFS_SUBPROPERTYOF)
+    domain, range_, inverse = URIRef(RDFS_DOMAIN), URIRef(RDFS_RANGE), URIRef(OWL_INVERSE_OF)
+    triples: List[Tuple[object, object, object]] = []
+
+    classes = [URIRef(f'{ns}Class{i}') for i in range(max(10, size // 200))]
+    for i, cls in enumerate(classes[1:], start=1):
+        triples.append((cls, sub_class, classes[(i - 1) // 5]))
+
+    properties = [URIRef(f'{ns}property{i}') for i in range(max(6, size // 2000))]
+    for i, prop in enumerate(properties):
+        triples.append((prop, type_, URIRef(OWL + 'ObjectProperty')))
+        triples.append((prop, domain, rng.choice(classes)))
+        triples.append((prop, range_, rng.choice(classes)))
+        if i and i % 5 == 0:
+            triples.append((prop, sub_property, properties[rng.randrange(i)]))
+        if i % 7 == 1:
+            triples.append((prop, inverse, properties[i - 1]))
+    part_of = URIRef(f'{ns}partOf')
+    triples.append((part_of, type_, URIRef(OWL_TRANSITIVE_PROPERTY)))
+    triples.append((part_of, type_, URIRef(OWL + 'ObjectProperty')))
+
+    instances = [URIRef(f'{ns}thing{i}') for i in range(max(10, size // 5))]
+    leaves = classes[len(classes) // 5:] or classes
+    for instance in instances:
+        triples.append((instance, type_, rng.choice(leaves)))
+    # part-of forms a shallow forest so its transitive closure stays linear
+    for i in range(1, len(instances), 3):
+        triples.append((instances[i], part_of, instances[i // 8]))
+    while len(triples) < size:
+        triples.append((rng.choice(instances), rng.choice(properties), rng.choice(instances)))
+    return triples
+
+
+def _decoded(reasoner: Reasoner) -> set:
+    decode = reasoner.dictionary.decode_triple
+    return {decode(t) for t in reasoner.store}
+
+
+def measure(size: int, batch_fraction: float = 0.01, seed: int = 0, verify: bool = False) -> ReasonerMeasurement:
+    """Time full, incremental-add and incremental-remove materialisation.
+
+    With `verify` the incremental results are also compared with
+    materialisations from scratch.
+    """
+    triples = synthetic_graph(size, seed)
+    rng = random.Random(seed + 1)
+    batch = max(1, int(len(triples) * batch_fraction))
+    held = set(rng.sample(range(len(triples)), batch))
+    base = [t for i, t in enumerate(triples) if i not in held]
+    extra = [triples[i] for i in sorted(held)]
+
+    full = Reasoner()
+    start = time.perf_counter()
+    full.add(triples)
+    materialise_s = time.perf_counter() - start
+    inferred = full.inferred_count
+    expected = _decoded(full) if verify else None
+    del full
+
+    reasoner = Reasoner()
+    reasoner.add(base)
+    start = time.perf_counter()
+    reasoner.add(extra)
+    add_s = time.perf_counter() - start
+    verified = _decoded(reasoner) == expected if verify else None
+
+    start = time.perf_counter()
+    reasoner.remove(extra)
+    remove_s = time.perf_counter() - start
+    if verify:
+        fresh = Reasoner()
+        fresh.add(base)
+        verified = verified and _decoded(reasoner) == _decoded(fresh)
+
+    return ReasonerMeasurement(len(triples), inferred, materialise_s, batch, add_s, remove_s, verified)
+
+
+@click.command()
+@click.option('--sizes', default=DEFAULT_SIZES, show_default=True,
+              help="Comma-separated numbers of explicit triples")
+@click.option('--batch', 'batch_fraction', default=0.01, show_default=True,
+              help="Fraction of the triples added and removed incrementally")
+@click.option('--seed', default=0, show_default=True, help="Seed for the graph generator")
+@click.option('--verify', is_flag=True, help="Check incremental results against full recomputation")
+@click.option('--json-output', type=click.Path(dir_okay=False, path_type=Path),
+              help="Write the measurements as JSON to this file")
+def main(sizes: str, batch_fraction: float, seed: int, verify: bool, json_output: Optional[Path]):
+    """Benchmark full and incremental materialisation on synthetic graphs."""
+    try:
+        sizes_list = [int(size) for size in sizes.split(',') if size.strip()]
+    except ValueError:
+        raise click.BadParameter(f"not a list of integers: {sizes}", param_hint='--sizes')
+
+    click.echo(f"{'Explicit':>10}  {'Inferred':>10}  {'Full':>8}  {'Batch':>7}  "
+               f"{'Add':>8}  {'Remove':>8}  Speed-up (add/remove)")
+    measurements = []
+    for size in sizes_list:
+        m = measure(size, batch_fraction, seed, verify)
+        measurements.append(m)
+        check = '' if m.verified is None else ('  ✅' if m.verified else '  ❌ differs from recompute')
+        click.echo(f"{m.explicit:>10}  {m.inferred:>10}  {m.materialise_s:>7.2f}s  {m.batch:>7}  "
+                   f"{m.add_s:>7.2f}s  {m.remove_s:>7.2f}s  {m.add_speedup:.0f}x/{m.remove_speedup:.0f}x{check}")
+
+    if json_output:
+        json_output.write_text(json.dumps(
+            [dict(asdict(m), add_speedup=m.add_speedup, remove_speedup=m.remove_speedup) for m in measurements],
+            indent=2,
+        ))
+    if any(m.verified is False for m in measurements):
+        raise click.ClickException("Incremental results differ from full recomputation")
+
+
+if __name__ == '__main__':
+    main()
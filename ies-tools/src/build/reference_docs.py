@@ -0,0 +1,401 @@
+"""Incremental HTML term reference for the ontology.
+
+One page is written per class and property. Each page is rendered only from
+the term's neighbourhood (its labels, definitions, super/sub terms and
+domain/range), so the hash of that neighbourhood decides whether the page
+needs re-rendering. Hashes are kept in a manifest next to the pages; pages
+of terms that disappeared are removed. Changed pages are rendered across a
+process pool, and a static JSON search index is written alongside them.
+"""
+
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import click
+
+from .ontology import (
+    ANNOTATION_PROPERTY,
+    CLASS_TYPES,
+    DATATYPE_PROPERTY,
+    DEFAULT_ONTOLOGY,
+    OBJECT_PROPERTY,
+    RDF_TYPE,
+    RDFS_COMMENT,
+    RDFS_DOMAIN,
+    RDFS_LABEL,
+    RDFS_RANGE,
+    RDFS_SUBCLASSOF,
+    RDFS_SUBPROPERTYOF,
+    SKOS_DEFINITION,
+    SKOS_PREFLABEL,
+    curie,
+    is_builtin,
+    load_graph,
+    local_name,
+    prefix_map,
+)
+
+if TYPE_CHECKING:
+    from rdflib import Graph
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT = Path('build') / 'docs' / 'reference'
+MANIFEST_FILE = 'manifest.json'
+SEARCH_INDEX_FILE = 'search-index.json'
+
+# Bump when the page template changes so that every page is re-rendered
+TEMPLATE_VERSION = '1'
+
+# Below this many changed pages the process pool costs more than it saves
+PARALLEL_THRESHOLD = 64
+
+TERM_KINDS = {
+    OBJECT_PROPERTY: 'Object property',
+    DATATYPE_PROPERTY: 'Datatype property',
+    ANNOTATION_PROPERTY: 'Annotation property',
+}
+
+
+@dataclass
+class TermRef:
+    """A link from one term page to another term."""
+    iri: str
+    curie: str
+    label: str
+    page: Optional[str]
+
+
+@dataclass
+class TermPage:
+    """Everything a term page shows; its hash decides whether to re-render."""
+    iri: str
+    curie: str
+    label: str
+    kind: str
+    page: str
+    labels: List[str] = field(default_factory=list)
+    definitions: List[str] = field(default_factory=list)
+    comments: List[str] = field(default_factory=list)
+    relations: Dict[str, List[TermRef]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'iri': self.iri,
+            'curie': self.curie,
+            'label': self.label,
+            'kind': self.kind,
+            'page': self.page,
+            'labels': self.labels,
+            'definitions': self.definitions,
+            'comments': self.comments,
+            'relations': {
+                name: [ref.__dict__ for ref in refs]
+                for name, refs in self.relations.items()
+            },
+        }
+
+    def neighbourhood_hash(self) -> str:
+        payload = json.dumps([TEMPLATE_VERSION, self.to_dict()], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def page_name(term_curie: str) -> str:
+    """File name of a term's page."""
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', term_curie.replace(':', '_')) + '.html'
+
+
+def page_names(curies: Dict[str, str]) -> Dict[str, str]:
+    """Unique page file name for each term IRI, given its CURIE.
+
+    Sanitising can map different terms to one name (`ex:a_b` and `ex_a:b`),
+    as can case-insensitive file systems. All terms sharing a name get a
+    short hash of their IRI appended, so no page overwrites another and a
+    term's name does not depend on which other terms exist.
+    """
+    names = {iri: page_name(short) for iri, short in curies.items()}
+    counts = Counter(name.lower() for name in names.values())
+    for iri, name in names.items():
+        if counts[name.lower()] > 1:
+            digest = hashlib.sha256(iri.encode()).hexdigest()[:8]
+            names[iri] = f"{name[:-len('.html')]}-{digest}.html"
+    return names
+
+
+def collect_terms(graph: 'Graph') -> List[TermPage]:
+    """Build the page model for every class and property declared in the graph."""
+    from rdflib import URIRef
+
+    prefixes = prefix_map(graph)
+    kinds: Dict[str, str] = {}
+    for class_type in CLASS_TYPES:
+        for subject in graph.subjects(URIRef(RDF_TYPE), URIRef(class_type)):
+            if isinstance(subject, URIRef) and not is_builtin(str(subject)):
+                kinds[str(subject)] = 'Class'
+    for prop_type, kind in TERM_KINDS.items():
+        for subject in graph.subjects(URIRef(RDF_TYPE), URIRef(prop_type)):
+            if isinstance(subject, URIRef) and not is_builtin(str(subject)):
+                kinds.setdefault(str(subject), kind)
+
+    def literals(iri: str, predicate: str) -> List[str]:
+        return sorted(str(o) for o in graph.objects(URIRef(iri), URIRef(predicate)))
+
+    def label_of(iri: str) -> str:
+        for predicate in (SKOS_PREFLABEL, RDFS_LABEL):
+            values = literals(iri, predicate)
+            if values:
+                return values[0]
+        return local_name(iri)
+
+    pages = page_names({iri: curie(iri, prefixes) for iri in kinds})
+
+    def ref(iri: str) -> TermRef:
+        short = curie(iri, prefixes)
+        return TermRef(iri, short, label_of(iri), pages.get(iri))
+
+    def outgoing(iri: str, predicate: str) -> List[TermRef]:
+        return sorted(
+            (ref(str(o)) for o in graph.objects(URIRef(iri), URIRef(predicate)) if isinstance(o, URIRef)),
+            key=lambda r: r.curie,
+        )
+
+    def incoming(iri: str, predicate: str) -> List[TermRef]:
+        return sorted(
+            (ref(str(s)) for s in graph.subjects(URIRef(predicate), URIRef(iri)) if isinstance(s, URIRef)),
+            key=lambda r: r.curie,
+        )
+
+    terms = []
+    for iri, kind in sorted(kinds.items()):
+        short = curie(iri, prefixes)
+        term = TermPage(
+            iri=iri,
+            curie=short,
+            label=label_of(iri),
+            kind=kind,
+            page=pages[iri],
+            labels=literals(iri, RDFS_LABEL) + literals(iri, SKOS_PREFLABEL),
+            definitions=literals(iri, SKOS_DEFINITION),
+            comments=literals(iri, RDFS_COMMENT),
+        )
+        if kind == 'Class':
+            term.relations = {
+                'Superclasses': outgoing(iri, RDFS_SUBCLASSOF),
+                'Subclasses': incoming(iri, RDFS_SUBCLASSOF),
+                'Properties with this domain': incoming(iri, RDFS_DOMAIN),
+                'Properties with this range': incoming(iri, RDFS_RANGE),
+            }
+        else:
+            term.relations = {
+                'Super-properties': outgoing(iri, RDFS_SUBPROPERTYOF),
+                'Sub-properties': incoming(iri, RDFS_SUBPROPERTYOF),
+                'Domain': outgoing(iri, RDFS_DOMAIN),
+                'Range': outgoing(iri, RDFS_RANGE),
+            }
+        terms.append(term)
+    return terms
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<link rel="stylesheet" href="style.css">
+</head>
+<body>
+<nav><a href="index.html">Ontology reference</a></nav>
+<main>
+{body}
+</main>
+</body>
+</html>
+"""
+
+STYLE = """body { font-family: sans-serif; margin: 2em auto; max-width: 60em; line-height: 1.5; }
+code { background: #f4f4f4; padding: 0 .2em; }
+.kind { color: #666; font-size: .9em; text-transform: uppercase; }
+ul.terms { columns: 2; }
+#results li { margin-bottom: .3em; }
+"""
+
+SEARCH_SCRIPT = """<input id="search" type="search" placeholder="Search terms..." autofocus>
+<ul id="results"></ul>
+<script>
+fetch('search-index.json').then(r => r.json()).then(index => {
+  const box = document.getElementById('search');
+  const results = document.getElementById('results');
+  box.addEventListener('input', () => {
+    const q = box.value.trim().toLowerCase();
+    results.innerHTML = '';
+    if (!q) return;
+    index.filter(t => t.text.includes(q)).slice(0, 50).forEach(t => {
+      const li = document.createElement('li');
+      const a = document.createElement('a');
+      a.href = t.page;
+      a.textContent = t.label + ' (' + t.curie + ')';
+      li.appendChild(a);
+      results.appendChild(li);
+    });
+  });
+});
+</script>
+"""
+
+
+def _link(ref: Dict[str, object]) -> str:
+    text = f"{html.escape(str(ref['label']))} <code>{html.escape(str(ref['curie']))}</code>"
+    href = ref['page'] or ref['iri']
+    return f'<a href="{html.escape(str(href))}">{text}</a>'
+
+
+def render_term(term: Dict[str, object]) -> str:
+    """HTML for one term page, from TermPage.to_dict() output."""
+    parts = [
+        f"<p class=\"kind\">{html.escape(str(term['kind']))}</p>",
+        f"<h1>{html.escape(str(term['label']))}</h1>",
+        f"<p><code>{html.escape(str(term['curie']))}</code> &mdash; "
+        f"<a href=\"{html.escape(str(term['iri']))}\">{html.escape(str(term['iri']))}</a></p>",
+    ]
+    for heading, key in [('Definition', 'definitions'), ('Comment', 'comments'), ('Labels', 'labels')]:
+        values = term[key]
+        if values:
+            parts.append(f"<h2>{heading}</h2>")
+            parts += [f"<p>{html.escape(str(v))}</p>" for v in values]
+    for heading, refs in term['relations'].items():
+        if refs:
+            parts.append(f"<h2>{html.escape(heading)}</h2>")
+            parts.append('<ul>' + ''.join(f"<li>{_link(r)}</li>" for r in refs) + '</ul>')
+    return PAGE_TEMPLATE.format(title=html.escape(str(term['label'])), body='\n'.join(parts))
+
+
+def _render_batch(args: Tuple[str, List[Dict[str, object]]]) -> int:
+    """Process pool worker: render and write a batch of pages."""
+    output_dir, terms = args
+    for term in terms:
+        Path(output_dir, str(term['page'])).write_text(render_term(term), encoding='utf-8')
+    return len(terms)
+
+
+def render_index(terms: Sequence[TermPage]) -> str:
+    sections = []
+    for kind in sorted({t.kind for t in terms}):
+        items = ''.join(
+            f"<li><a href=\"{html.escape(t.page)}\">{html.escape(t.label)}</a> "
+            f"<code>{html.escape(t.curie)}</code></li>"
+            for t in terms if t.kind == kind
+        )
+        sections.append(f"<h2>{html.escape(kind)}</h2><ul class=\"terms\">{items}</ul>")
+    body = '<h1>Ontology reference</h1>\n' + SEARCH_SCRIPT + '\n'.join(sections)
+    return PAGE_TEMPLATE.format(title='Ontology reference', body=body)
+
+
+def search_index(terms: Sequence[TermPage]) -> List[Dict[str, str]]:
+    """Entries for client-side search; `text` is the lower-cased searchable text."""
+    entries = []
+    for t in terms:
+        text = ' '.join([t.label, t.curie, *t.labels, *t.definitions]).lower()
+        entries.append({
+            'iri': t.iri,
+            'curie': t.curie,
+            'label': t.label,
+            'kind': t.kind,
+            'page': t.page,
+            'definition': (t.definitions or t.comments or [''])[0][:200],
+            'text': text,
+        })
+    return entries
+
+
+class ReferenceBuilder:
+    """Renders the term reference, re-rendering only pages whose neighbourhood changed."""
+
+    def __init__(self, sources: Sequence[Path], output_dir: Path = DEFAULT_OUTPUT, jobs: Optional[int] = None):
+        self.sources = [Path(s) for s in sources]
+        self.output_dir = Path(output_dir)
+        self.jobs = jobs or os.cpu_count() or 1
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            return json.loads((self.output_dir / MANIFEST_FILE).read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _render(self, terms: List[Dict[str, object]]) -> None:
+        if len(terms) < PARALLEL_THRESHOLD or self.jobs == 1:
+            _render_batch((str(self.output_dir), terms))
+            return
+        batch_size = max(1, len(terms) // (self.jobs * 4))
+        batches = [
+            (str(self.output_dir), terms[i:i + batch_size])
+            for i in range(0, len(terms), batch_size)
+        ]
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            list(pool.map(_render_batch, batches))
+
+    def build(self, force: bool = False) -> Tuple[int, int, int]:
+        """Update the reference; returns (rendered, unchanged, removed) page counts."""
+        terms = collect_terms(load_graph(self.sources))
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Loaded even when forced, so pages of deleted terms are still removed
+        old = self._load_manifest()
+        new = {t.page: t.neighbourhood_hash() for t in terms}
+        changed = [
+            t.to_dict() for t in terms
+            if force or old.get(t.page) != new[t.page] or not (self.output_dir / t.page).exists()
+        ]
+        removed = [page for page in old if page not in new]
+
+        self._render(changed)
+        for page in removed:
+            (self.output_dir / page).unlink(missing_ok=True)
+
+        (self.output_dir / 'index.html').write_text(render_index(terms), encoding='utf-8')
+        (self.output_dir / 'style.css').write_text(STYLE)
+        (self.output_dir / SEARCH_INDEX_FILE).write_text(json.dumps(search_index(terms)))
+        (self.output_dir / MANIFEST_FILE).write_text(json.dumps(new, indent=1, sort_keys=True))
+
+        logger.info(f"Rendered {len(changed)} pages, {len(terms) - len(changed)} unchanged, {len(removed)} removed")
+        return len(changed), len(terms) - len(changed), len(removed)
+
+
+@click.command()
+@click.option(
+    '--ontology',
+    'sources',
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=[DEFAULT_ONTOLOGY],
+    show_default=True,
+    help="Ontology file(s) to document (repeatable)"
+)
+@click.option(
+    '--output-dir',
+    type=click.Path(file_okay=False, path_type=Path),
+    default=DEFAULT_OUTPUT,
+    show_default=True,
+    help="Directory for the generated reference pages"
+)
+@click.option('--jobs', '-j', type=int, help="Worker processes for rendering (default: CPU count)")
+@click.option('--force', is_flag=True, help="Re-render every page")
+def docs(sources: Tuple[Path, ...], output_dir: Path, jobs: Optional[int], force: bool):
+    """Generate the HTML term reference from the ontology."""
+    try:
+        click.echo("📚 Building term reference...")
+        rendered, unchanged, removed = ReferenceBuilder(sources, output_dir, jobs).build(force=force)
+        click.echo(f"✨ Reference built in {output_dir}: {rendered} rendered, "
+                   f"{unchanged} unchanged, {removed} removed")
+
+    except click.ClickException as e:
+        click.echo(f"❌ Error: {str(e)}", err=True)
+        raise click.Abort()
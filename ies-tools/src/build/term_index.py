@@ -0,0 +1,553 @@
+"""Persistent full-text index of ontology terms.
+
+Labels (`rdfs:label`, `skos:prefLabel`, `skos:altLabel`), local names and
+`skos:definition` text are tokenised into an inverted index stored in a
+single binary file. Lookups memory-map that file and binary-search the sorted
+token table, so `find-term` never parses RDF or loads the whole index.
+
+The index is kept up to date incrementally: the terms extracted from each
+source file are cached by the file's content hash, so a change re-parses
+only the files that changed before the index file is rewritten.
+
+File layout (little-endian, all offsets absolute):
+
+    header   magic, version, offsets of the three sections below
+    terms    JSON term records and the word count of each term's shortest
+             label, addressed by term id
+    tokens   sorted token table; postings are (term id << 2 | field)
+    grams    sorted trigram table; postings are token ids (fuzzy matching)
+
+A table is `count`, `count + 1` key offsets, `count + 1` postings offsets,
+then the key bytes and the uint32 postings.
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+import click
+
+from .ontology import (
+    CLASS_TYPES,
+    PROPERTY_TYPES,
+    RDF_TYPE,
+    RDFS_LABEL,
+    SKOS_ALTLABEL,
+    SKOS_DEFINITION,
+    SKOS_PREFLABEL,
+    curie,
+    default_sources,
+    load_graph,
+    local_name,
+    prefix_map,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = Path('build') / 'term-index'
+INDEX_FILE = 'terms.idx'
+MANIFEST_FILE = 'sources.json'
+RECORDS_DIR = 'records'
+
+MAGIC = b'IESTIDX1'
+VERSION = 1
+HEADER = struct.Struct('<8sIQQQ')
+
+# Field codes stored in the low two bits of a posting, and their weights
+FIELD_LABEL, FIELD_ALTLABEL, FIELD_NAME, FIELD_DEFINITION = range(4)
+FIELD_WEIGHTS = {FIELD_LABEL: 4.0, FIELD_ALTLABEL: 3.0, FIELD_NAME: 2.0, FIELD_DEFINITION: 1.0}
+
+# How much a token match counts, by how it matched
+EXACT, PREFIX, FUZZY = 1.0, 0.6, 0.4
+# Added when the query matches every word of one of the term's labels
+LABEL_COVERED = 10.0
+
+STOP_WORDS = {'a', 'an', 'and', 'any', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+              'it', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'which', 'with'}
+
+_WORD = re.compile(r'[A-Za-z0-9]+')
+_CAMEL = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens, with camelCase and snake_case split apart."""
+    tokens = []
+    for word in _WORD.findall(text):
+        for part in _CAMEL.findall(word):
+            part = part.lower()
+            if part not in STOP_WORDS:
+                tokens.append(part)
+    return tokens
+
+
+def trigrams(token: str) -> Set[str]:
+    padded = f'${token}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, giving up once it must exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def max_edits(token: str) -> int:
+    """Typos tolerated for a query token of this length."""
+    if len(token) < 4:
+        return 0
+    return 1 if len(token) < 8 else 2
+
+
+# --- Building ---------------------------------------------------------------
+
+def extract_terms(path: Path) -> List[Dict[str, object]]:
+    """Term records for every subject in one file with a label or definition."""
+    from rdflib import Literal, URIRef
+
+    graph = load_graph([path])
+    prefixes = prefix_map(graph)
+    predicates = [RDFS_LABEL, SKOS_PREFLABEL, SKOS_ALTLABEL, SKOS_DEFINITION]
+    values: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+    for predicate in predicates:
+        for subject, obj in graph.subject_objects(URIRef(predicate)):
+            if isinstance(subject, URIRef) and isinstance(obj, Literal):
+                values[str(subject)][predicate].append(str(obj))
+
+    records = []
+    for iri, fields in sorted(values.items()):
+        types = sorted(str(t) for t in graph.objects(URIRef(iri), URIRef(RDF_TYPE)))
+        records.append({
+            'iri': iri,
+            'curie': curie(iri, prefixes),
+            'kind': term_kind(types),
+            'labels': sorted(fields[RDFS_LABEL]) + sorted(fields[SKOS_PREFLABEL]),
+            'altLabels': sorted(fields[SKOS_ALTLABEL]),
+            'definitions': sorted(fields[SKOS_DEFINITION]),
+            'source': str(path),
+        })
+    return records
+
+
+def term_kind(types: Sequence[str]) -> str:
+    for type_iri in types:
+        if type_iri in CLASS_TYPES:
+            return 'class'
+    for type_iri in types:
+        if type_iri in PROPERTY_TYPES:
+            return 'property'
+    return local_name(types[0]) if types else ''
+
+
+def merge_records(records: Iterable[Dict[str, object]]) -> List[Dict[str, object]]:
+    """One record per IRI, combining what each source file says about it."""
+    merged: Dict[str, Dict[str, object]] = {}
+    for record in records:
+        existing = merged.get(record['iri'])
+        if existing is None:
+            merged[record['iri']] = dict(record)
+            continue
+        for key in ('labels', 'altLabels', 'definitions'):
+            existing[key] = sorted(set(existing[key]) | set(record[key]))
+        if not existing['kind'] or existing['kind'] not in ('class', 'property'):
+            existing['kind'] = record['kind'] or existing['kind']
+        if ':' not in existing['curie'] or existing['curie'] == existing['iri']:
+            existing['curie'] = record['curie']
+    return [merged[iri] for iri in sorted(merged)]
+
+
+def _pack_table(keys: Sequence[str], postings: Sequence[Sequence[int]]) -> bytes:
+    key_offsets, post_offsets = array('I', [0]), array('I', [0])
+    key_blob = bytearray()
+    post_blob = array('I')
+    for key, posting in zip(keys, postings):
+        key_blob += key.encode('utf-8')
+        key_offsets.append(len(key_blob))
+        post_blob.extend(posting)
+        post_offsets.append(len(post_blob))
+    parts = [struct.pack('<I', len(keys)), key_offsets, post_offsets, bytes(key_blob)]
+    # Align the uint32 postings
+    padding = -sum(len(bytes(p)) for p in parts) % 4
+    return b''.join(bytes(p) for p in parts) + b'\0' * padding + post_blob.tobytes()
+
+
+def write_index(records: Sequence[Dict[str, object]], path: Path) -> None:
+    """Write the binary index for the given (merged) term records."""
+    postings: Dict[str, Set[int]] = defaultdict(set)
+    for term_id, record in enumerate(records):
+        fields = [
+            (FIELD_LABEL, record['labels']),
+            (FIELD_ALTLABEL, record['altLabels']),
+            (FIELD_NAME, [local_name(record['iri'])]),
+            (FIELD_DEFINITION, record['definitions']),
+        ]
+        for field_code, texts in fields:
+            for text in texts:
+                for token in tokenize(text):
+                    postings[token].add(term_id << 2 | field_code)
+
+    tokens = sorted(postings)
+    grams: Dict[str, List[int]] = defaultdict(list)
+    for token_id, token in enumerate(tokens):
+        if len(token) >= 3:
+            for gram in trigrams(token):
+                grams[gram].append(token_id)
+    gram_keys = sorted(grams)
+
+    term_blobs = [json.dumps(r, separators=(',', ':')).encode('utf-8') for r in records]
+    term_offsets = array('I', [0])
+    for blob in term_blobs:
+        term_offsets.append(term_offsets[-1] + len(blob))
+    label_words = bytes(
+        min(255, min((len(tokenize(label)) for label in r['labels'] + r['altLabels']), default=0))
+        for r in records
+    )
+    terms_section = (struct.pack('<I', len(records)) + term_offsets.tobytes()
+                     + label_words + b''.join(term_blobs))
+    terms_section += b'\0' * (-len(terms_section) % 4)
+    tokens_section = _pack_table(tokens, [sorted(postings[t]) for t in tokens])
+    grams_section = _pack_table(gram_keys, [grams[g] for g in gram_keys])
+
+    terms_at = HEADER.size
+    tokens_at = terms_at + len(terms_section)
+    grams_at = tokens_at + len(tokens_section)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, terms_at, tokens_at, grams_at))
+        f.write(terms_section)
+        f.write(tokens_section)
+        f.write(grams_section)
+    os.replace(tmp, path)
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def update_index(
+        sources: Sequence[Path],
+        index_dir: Path = DEFAULT_INDEX_DIR,
+        force: bool = False,
+) -> Tuple[bool, List[Path]]:
+    """Bring the index up to date with the sources.
+
+    Returns whether the index file was rewritten and which sources had to be
+    re-parsed. Sources are first compared by size and mtime; only files that
+    differ are hashed, and only files with new content are parsed.
+    """
+    index_dir = Path(index_dir)
+    records_dir = index_dir / RECORDS_DIR
+    records_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        manifest = {} if force else json.loads((index_dir / MANIFEST_FILE).read_text())
+    except (OSError, json.JSONDecodeError):
+        manifest = {}
+
+    new_manifest = {}
+    parsed = []
+    for path in sources:
+        stat = Path(path).stat()
+        entry = manifest.get(str(path))
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+            new_manifest[str(path)] = entry
+            continue
+        digest = _file_hash(path)
+        records_file = records_dir / f'{digest}.json'
+        if force or not records_file.exists():
+            records_file.write_text(json.dumps(extract_terms(path)))
+            parsed.append(Path(path))
+        new_manifest[str(path)] = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'sha256': digest}
+
+    index_file = index_dir / INDEX_FILE
+    old_hashes = [e['sha256'] for e in manifest.values()]
+    new_hashes = [e['sha256'] for e in new_manifest.values()]
+    rebuild = force or old_hashes != new_hashes or not index_file.exists()
+    if rebuild:
+        records = []
+        for digest in new_hashes:
+            records += json.loads((records_dir / f'{digest}.json').read_text())
+        write_index(merge_records(records), index_file)
+        for stale in records_dir.glob('*.json'):
+            if stale.stem not in new_hashes:
+                stale.unlink()
+        logger.info(f"Indexed {len(sources)} source(s) into {index_file}")
+    (index_dir / MANIFEST_FILE).write_text(json.dumps(new_manifest, indent=1))
+    return rebuild, parsed
+
+
+def index_is_current(sources: Sequence[Path], index_dir: Path = DEFAULT_INDEX_DIR) -> bool:
+    """Cheap staleness check using file sizes and mtimes only."""
+    try:
+        manifest = json.loads((Path(index_dir) / MANIFEST_FILE).read_text())
+    except (OSError, json.JSONDecodeError):
+        return False
+    if sorted(manifest) != sorted(str(p) for p in sources):
+        return False
+    for path in sources:
+        stat = Path(path).stat()
+        entry = manifest[str(path)]
+        if entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime_ns:
+            return False
+    return (Path(index_dir) / INDEX_FILE).exists()
+
+
+# --- Querying ---------------------------------------------------------------
+
+class _Table:
+    """Read-only view of a sorted key -> uint32 postings table in the mapped file."""
+
+    def __init__(self, buf: mmap.mmap, offset: int):
+        self.buf = buf
+        self.view = memoryview(buf)
+        (self.count,) = struct.unpack_from('<I', buf, offset)
+        self.key_offsets = offset + 4
+        self.post_offsets = self.key_offsets + 4 * (self.count + 1)
+        self.keys_at = self.post_offsets + 4 * (self.count + 1)
+        (key_bytes,) = struct.unpack_from('<I', buf, self.key_offsets + 4 * self.count)
+        self.postings_at = self.keys_at + key_bytes + (-(self.keys_at + key_bytes - offset) % 4)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> str:
+        start, end = struct.unpack_from('<II', self.buf, self.key_offsets + 4 * i)
+        return self.buf[self.keys_at + start:self.keys_at + end].decode('utf-8')
+
+    def find(self, key: str) -> int:
+        """Index of key, or -1."""
+        i = bisect.bisect_left(self, key)
+        return i if i < self.count and self[i] == key else -1
+
+    def with_prefix(self, prefix: str) -> range:
+        start = bisect.bisect_left(self, prefix)
+        end = start
+        while end < self.count and self[end].startswith(prefix):
+            end += 1
+        return range(start, end)
+
+    def postings(self, i: int) -> Sequence[int]:
+        start, end = struct.unpack_from('<II', self.buf, self.post_offsets + 4 * i)
+        return self.view[self.postings_at + 4 * start:self.postings_at + 4 * end].cast('I')
+
+
+@dataclass
+class TermMatch:
+    """A search hit."""
+    score: float
+    matched: int
+    record: Dict[str, object]
+
+
+class TermIndex:
+    """Memory-mapped term index."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            with open(self.path, 'rb') as f:
+                self.buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise click.ClickException(f"Cannot open term index {self.path}: {e}")
+        magic, version, terms_at, tokens_at, grams_at = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise click.ClickException(f"{self.path} is not a term index of version {VERSION}; rebuild it")
+        (self.term_count,) = struct.unpack_from('<I', self.buf, terms_at)
+        self.term_offsets = terms_at + 4
+        self.label_words = self.term_offsets + 4 * (self.term_count + 1)
+        self.terms_blob = self.label_words + self.term_count
+        self.tokens = _Table(self.buf, tokens_at)
+        self.grams = _Table(self.buf, grams_at)
+
+    def close(self) -> None:
+        self.tokens.view.release()
+        self.grams.view.release()
+        self.buf.close()
+
+    def __enter__(self) -> 'TermIndex':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def term(self, term_id: int) -> Dict[str, object]:
+        start, end = struct.unpack_from('<II', self.buf, self.term_offsets + 4 * term_id)
+        return json.loads(self.buf[self.terms_blob + start:self.terms_blob + end])
+
+    def _fuzzy_tokens(self, token: str) -> List[Tuple[int, float]]:
+        limit = max_edits(token)
+        if not limit:
+            return []
+        grams = trigrams(token)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            i = self.grams.find(gram)
+            if i >= 0:
+                for token_id in self.grams.postings(i):
+                    shared[token_id] += 1
+        # Each edit destroys at most three trigrams
+        needed = max(1, len(grams) - 3 * limit)
+        matches = []
+        for token_id, count in shared.items():
+            if count >= needed:
+                distance = edit_distance(token, self.tokens[token_id], limit)
+                if 0 < distance <= limit:
+                    matches.append((token_id, FUZZY / distance))
+        return matches
+
+    def _token_matches(self, token: str, prefix: bool, fuzzy: bool) -> List[Tuple[int, float]]:
+        """Token ids matching one query token, with the match quality."""
+        matches: Dict[int, float] = {}
+        if prefix:
+            for token_id in self.tokens.with_prefix(token):
+                matches[token_id] = PREFIX
+        exact = self.tokens.find(token)
+        if exact >= 0:
+            matches[exact] = EXACT
+        if fuzzy and (exact < 0 or len(matches) < 3):
+            for token_id, quality in self._fuzzy_tokens(token):
+                matches.setdefault(token_id, quality)
+        return list(matches.items())
+
+    def search(self, query: str, limit: int = 10, prefix: bool = True, fuzzy: bool = True) -> List[TermMatch]:
+        """Terms ranked by how many query words they match, then by score.
+
+        Every query word may match exactly, as a prefix of an indexed word, or
+        within a small edit distance. Matches in labels weigh more than matches
+        in definitions.
+        """
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, int] = defaultdict(int)
+        label_hits: Dict[int, int] = defaultdict(int)
+        for position, token in enumerate(query_tokens):
+            # Only the word being typed is completed as a prefix
+            is_last = position == len(query_tokens) - 1
+            best: Dict[int, float] = {}
+            in_label: Set[int] = set()
+            for token_id, quality in self._token_matches(token, prefix and is_last, fuzzy):
+                for posting in self.tokens.postings(token_id):
+                    term_id, field_code = posting >> 2, posting & 3
+                    score = quality * FIELD_WEIGHTS[field_code]
+                    if score > best.get(term_id, 0.0):
+                        best[term_id] = score
+                    if field_code <= FIELD_ALTLABEL:
+                        in_label.add(term_id)
+            for term_id, score in best.items():
+                scores[term_id] += score
+                matched[term_id] += 1
+            for term_id in in_label:
+                label_hits[term_id] += 1
+
+        for term_id, hits in label_hits.items():
+            if hits >= self.buf[self.label_words + term_id] > 0:
+                scores[term_id] += LABEL_COVERED
+        ranked = sorted(scores, key=lambda t: (-matched[t], -scores[t], t))[:limit]
+        return [TermMatch(scores[t], matched[t], self.term(t)) for t in ranked]
+
+
+def format_match(match: TermMatch, width: int = 100) -> str:
+    record = match.record
+    label = (record['labels'] or record['altLabels'] or [local_name(record['iri'])])[0]
+    line = f"{record['curie']}  {label}"
+    if record['kind']:
+        line += f"  [{record['kind']}]"
+    definition = (record['definitions'] or [''])[0]
+    if definition:
+        definition = ' '.join(definition.split())
+        if len(definition) > width:
+            definition = definition[:width - 1] + '…'
+        line += f"\n    {definition}"
+    return line
+
+
+def _sources_option(sources: Tuple[Path, ...]) -> List[Path]:
+    sources = list(sources) or default_sources()
+    if not sources:
+        raise click.ClickException("No ontology sources found; pass --source")
+    return sources
+
+
+_source_option = click.option(
+    '--source',
+    'sources',
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="RDF file to index (repeatable; default: core, ontology and data)"
+)
+_index_dir_option = click.option(
+    '--index-dir',
+    type=click.Path(file_okay=False, path_type=Path),
+    default=DEFAULT_INDEX_DIR,
+    show_default=True,
+    help="Directory holding the term index"
+)
+
+
+@click.command()
+@_source_option
+@_index_dir_option
+@click.option('--force', is_flag=True, help="Re-parse every source and rewrite the index")
+def index_terms(sources: Tuple[Path, ...], index_dir: Path, force: bool):
+    """Build or update the full-text term index."""
+    try:
+        rebuilt, parsed = update_index(_sources_option(sources), index_dir, force=force)
+        if rebuilt:
+            click.echo(f"✨ Term index updated ({len(parsed)} source(s) re-parsed)")
+        else:
+            click.echo("✅ Term index is up to date")
+
+    except click.ClickException as e:
+        click.echo(f"❌ Error: {str(e)}", err=True)
+        raise click.Abort()
+
+
+@click.command()
+@click.argument('query')
+@_source_option
+@_index_dir_option
+@click.option('--limit', '-n', default=10, show_default=True, help="Maximum number of results")
+@click.option('--exact', is_flag=True, help="Disable prefix and fuzzy matching")
+@click.option('--no-update', is_flag=True, help="Query the index as it is, even if sources changed")
+@click.option('--json', 'as_json', is_flag=True, help="Print results as JSON")
+def find_term(query: str, sources: Tuple[Path, ...], index_dir: Path, limit: int,
+              exact: bool, no_update: bool, as_json: bool):
+    """Search term labels and definitions for QUERY."""
+    try:
+        if not no_update:
+            sources = _sources_option(sources)
+            if not index_is_current(sources, index_dir):
+                click.echo("🔄 Updating term index...", err=True)
+                update_index(sources, index_dir)
+
+        with TermIndex(Path(index_dir) / INDEX_FILE) as index:
+            matches = index.search(query, limit=limit, prefix=not exact, fuzzy=not exact)
+
+        if as_json:
+            click.echo(json.dumps([dict(m.record, score=round(m.score, 3)) for m in matches], indent=2))
+        elif not matches:
+            click.echo(f"No terms match '{query}'")
+        else:
+            for match in matches:
+                click.echo(format_match(match))
+
+    except click.ClickException as e:
+        click.echo(f"❌ Error: {str(e)}", err=True)
+        raise click.Abort()
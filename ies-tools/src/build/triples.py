@@ -0,0 +1,154 @@
+"""Dictionary-encoded, indexed triple storage.
+
+RDF terms are mapped to small integers by a TermDictionary, and triples of
+those integers are kept in a TripleStore with predicate-first indexes in
+both directions. This is far more compact than an rdflib graph and makes
+the joins that rule engines and bulk loaders need plain dictionary lookups.
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Set, Tuple
+
+if TYPE_CHECKING:
+    from rdflib.term import Node
+
+Triple = Tuple[int, int, int]
+
+_EMPTY: Set[int] = frozenset()
+
+
+class TermDictionary:
+    """Bidirectional mapping between RDF terms and integer ids."""
+
+    def __init__(self):
+        from rdflib import Literal
+
+        self.ids: Dict['Node', int] = {}
+        self.terms: List['Node'] = []
+        self.literals: Set[int] = set()
+        self._literal_type = Literal
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def encode(self, term: 'Node') -> int:
+        term_id = self.ids.get(term)
+        if term_id is None:
+            term_id = self.ids[term] = len(self.terms)
+            self.terms.append(term)
+            if isinstance(term, self._literal_type):
+                self.literals.add(term_id)
+        return term_id
+
+    def encode_triple(self, triple: Tuple['Node', 'Node', 'Node']) -> Triple:
+        encode = self.encode
+        return encode(triple[0]), encode(triple[1]), encode(triple[2])
+
+    def decode(self, term_id: int) -> 'Node':
+        return self.terms[term_id]
+
+    def decode_triple(self, triple: Triple) -> Tuple['Node', 'Node', 'Node']:
+        terms = self.terms
+        return terms[triple[0]], terms[triple[1]], terms[triple[2]]
+
+
+class TripleStore:
+    """A set of integer triples indexed by predicate, subject and object.
+
+    `spo[p][s]` is the set of objects and `pos[p][o]` the set of subjects of
+    predicate p.
+    """
+
+    def __init__(self):
+        self.spo: Dict[int, Dict[int, Set[int]]] = {}
+        self.pos: Dict[int, Dict[int, Set[int]]] = {}
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, triple: Triple) -> bool:
+        s, p, o = triple
+        return o in self.spo.get(p, {}).get(s, _EMPTY)
+
+    def __iter__(self) -> Iterator[Triple]:
+        for p, subjects in self.spo.items():
+            for s, objects in subjects.items():
+                for o in objects:
+                    yield s, p, o
+
+    def add(self, triple: Triple) -> bool:
+        """Add a triple; returns False if it was already present."""
+        s, p, o = triple
+        subjects = self.spo.get(p)
+        if subjects is None:
+            subjects = self.spo[p] = {}
+            self.pos[p] = {}
+        objects = subjects.get(s)
+        if objects is None:
+            objects = subjects[s] = set()
+        elif o in objects:
+            return False
+        objects.add(o)
+        by_object = self.pos[p]
+        if o in by_object:
+            by_object[o].add(s)
+        else:
+            by_object[o] = {s}
+        self.size += 1
+        return True
+
+    def update(self, triples: Iterable[Triple]) -> int:
+        """Add triples; returns how many were new.
+
+        The same as calling add() for each triple, inlined for bulk loads.
+        """
+        spo, pos = self.spo, self.pos
+        added = 0
+        for s, p, o in triples:
+            subjects = spo.get(p)
+            if subjects is None:
+                subjects = spo[p] = {}
+                pos[p] = {}
+            objects = subjects.get(s)
+            if objects is None:
+                subjects[s] = {o}
+            elif o in objects:
+                continue
+            else:
+                objects.add(o)
+            by_object = pos[p]
+            if o in by_object:
+                by_object[o].add(s)
+            else:
+                by_object[o] = {s}
+            added += 1
+        self.size += added
+        return added
+
+    def remove(self, triple: Triple) -> bool:
+        """Remove a triple; returns False if it was not present."""
+        s, p, o = triple
+        objects = self.spo.get(p, {}).get(s)
+        if not objects or o not in objects:
+            return False
+        objects.discard(o)
+        if not objects:
+            del self.spo[p][s]
+        subjects = self.pos[p][o]
+        subjects.discard(s)
+        if not subjects:
+            del self.pos[p][o]
+        self.size -= 1
+        return True
+
+    def objects(self, s: int, p: int) -> Set[int]:
+        return self.spo.get(p, {}).get(s, _EMPTY)
+
+    def subjects(self, p: int, o: int) -> Set[int]:
+        return self.pos.get(p, {}).get(o, _EMPTY)
+
+    def pairs(self, p: int) -> Iterator[Tuple[int, int]]:
+        """(subject, object) pairs of one predicate."""
+        for s, objects in self.spo.get(p, {}).items():
+            for o in objects:
+                yield s, o
@@ -0,0 +1,405 @@
+"""Parallel loading of large Turtle files into the dictionary-encoded store.
+
+A pre-scan walks the file once, skipping over IRIs, string literals and
+comments, to find statement boundaries: a `.` followed by whitespace outside
+all of them. The file is cut at those boundaries into chunks, and every
+chunk is parsed in a worker process with the `@prefix`/`@base` (and SPARQL
+`PREFIX`/`BASE`) directives that precede it prepended, so prefixed names and
+relative IRIs resolve exactly as in a single pass.
+
+Workers return their terms and integer triples rather than rdflib graphs,
+which keeps the data sent between processes small. The main process merges
+the chunks in file order into one TermDictionary and TripleStore. Labelled
+blank nodes (`_:b1`) are scoped to the document, so a label shared by two
+chunks becomes one node. Anonymous blank nodes (`[]` and collections) are
+unique to their chunk anyway.
+"""
+
+import functools
+import logging
+import mmap
+import os
+import re
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import click
+
+from .ontology import rdf_format
+from .triples import TermDictionary, TripleStore
+
+if TYPE_CHECKING:
+    from rdflib.term import Node
+
+logger = logging.getLogger(__name__)
+
+# Files smaller than this (in bytes) are parsed in-process
+PARALLEL_THRESHOLD = 8 * 1024 * 1024
+MIN_CHUNK_SIZE = 1024 * 1024
+LOADER_FORMATS = {'turtle', 'nt'}
+
+# One statement, up to its terminating '.'. Everything that may contain a
+# '.' or '#' without ending the statement or starting a comment (IRIs,
+# strings, escapes, decimals, local names) is consumed whole. The pattern is
+# an unrolled loop: plain text, then any number of (special token, plain
+# text), where each special token starts with a character plain text cannot
+# contain and can only match one way. A statement with no terminator
+# therefore fails in linear time, without possessive quantifiers or atomic
+# groups (Python 3.11+).
+_PLAIN = rb'''[^"'<\#.\\]*'''
+_BODY = _PLAIN + rb'''
+    (?: (?: \\.
+          | """[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*"""
+          | \'\'\'[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*\'\'\'
+          | "(?!"")[^"\\\n]*(?:\\.[^"\\\n]*)*"
+          | '(?!'')[^'\\\n]*(?:\\.[^'\\\n]*)*'
+          | <[^>]*>
+          | \#[^\n]*(?![^\n])
+          | \.(?![\s\#])
+        ) ''' + _PLAIN + rb'''
+    )*
+'''
+# Whitespace and comments before a statement; plain text covers them in _BODY
+_LEADING = rb'''\s*(?:\#[^\n]*(?![^\n])\s*)*'''
+_STATEMENT = re.compile(
+    _LEADING + rb'''
+    (?: (?P<sparql>(?i:prefix|base)\s[^<]*<[^>]*>)
+      | (?P<directive>@(?:prefix|base)\b)?''' + _BODY + rb'''\.(?=[\s\#])
+    )''',
+    re.VERBOSE | re.DOTALL,
+)
+_STATEMENTS = re.compile(rb'(?:' + _BODY + rb'\.(?=[\s\#]))+', re.VERBOSE | re.DOTALL)
+_PREFIX_NAME = re.compile(rb'(?:@prefix|(?i:prefix))\s+([^:\s]*):')
+
+
+@dataclass
+class Chunk:
+    """A byte range of a Turtle file, with the directives in effect at its start."""
+    start: int
+    end: int
+    header: bytes = b''
+
+
+class _DirectiveHints:
+    """Finds the next place a directive might start, case-insensitively.
+
+    Lower-casing a window and using bytes.find is many times faster than a
+    case-insensitive regex search. Hits inside literals or IRIs (`database`)
+    are harmless: the scanner just steps over that statement on its own.
+    """
+
+    WINDOW = 4 * 1024 * 1024
+    KEYWORDS = (b'prefix', b'base')
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.start = -self.WINDOW
+        self.window = b''
+
+    def next(self, pos: int) -> Optional[int]:
+        size = len(self.buf)
+        while pos < size:
+            if not self.start <= pos < self.start + self.WINDOW:
+                # Overlap by a keyword's length so none is split between windows
+                self.start = pos
+                self.window = self.buf[pos:pos + self.WINDOW + 6].lower()
+            offset = pos - self.start
+            found = [i for i in (self.window.find(k, offset) for k in self.KEYWORDS) if i >= 0]
+            if found:
+                return self.start + min(found)
+            pos = self.start + self.WINDOW
+        return None
+
+
+@dataclass
+class TurtleLoad:
+    """The triples of one or more files, dictionary-encoded."""
+    dictionary: TermDictionary = field(default_factory=TermDictionary)
+    store: TripleStore = field(default_factory=TripleStore)
+    namespaces: Dict[str, str] = field(default_factory=dict)
+    chunks: int = 0
+
+    def triples(self) -> Iterator[Tuple['Node', 'Node', 'Node']]:
+        decode = self.dictionary.decode_triple
+        for triple in self.store:
+            yield decode(triple)
+
+
+def split_statements(buf, chunk_size: int) -> List[Chunk]:
+    """Cut a Turtle document into chunks of about chunk_size bytes at statement boundaries."""
+    chunks: List[Chunk] = []
+    # (prefix name or None for a base, directive text) in document order
+    directives: List[Tuple[Optional[bytes], bytes]] = []
+    header = b''
+    size = len(buf)
+    pos = start = 0
+    hints = _DirectiveHints(buf)
+    hint = hints.next(pos)
+    while pos < size:
+        # Take whole statements in bulk up to the window end or a possible
+        # directive, whichever is first
+        end = min(size, start + chunk_size)
+        if hint is not None and hint < end:
+            end = hint
+        match = _STATEMENTS.match(buf, pos, end)
+        if match is None or match.end() == pos:
+            # Step over one statement: one that does not fit in the window,
+            # or one that may be a directive
+            match = _STATEMENT.match(buf, pos)
+            if match is None or match.end() == pos:
+                break
+            directive = match.group('sparql') or (
+                buf[match.start('directive'):match.end()] if match.group('directive') else None)
+            if directive:
+                prefix = _PREFIX_NAME.match(directive)
+                directives.append((prefix.group(1) if prefix else None, directive))
+        pos = match.end()
+        if hint is not None and hint < pos:
+            hint = hints.next(pos)
+        if pos - start >= chunk_size:
+            chunks.append(Chunk(start, pos, header))
+            start = pos
+            header = _header(directives)
+    # Trailing whitespace, comments or an unterminated statement go with the last chunk
+    if start < size or not chunks:
+        chunks.append(Chunk(start, size, header))
+    else:
+        chunks[-1].end = size
+    return chunks
+
+
+def _header(directives: List[Tuple[Optional[bytes], bytes]]) -> bytes:
+    """Directives that reproduce the prefixes and base in effect after these.
+
+    Only the last binding of each prefix is kept. Bases are all kept, in
+    order, since a relative base resolves against the one before it and
+    prefix IRIs against the base in effect where they are declared.
+    """
+    last = {prefix: i for i, (prefix, _) in enumerate(directives) if prefix is not None}
+    kept = [text for i, (prefix, text) in enumerate(directives) if prefix is None or last[prefix] == i]
+    return b'\n'.join(kept) + b'\n' if kept else b''
+
+
+class _Collector:
+    """Stands in for the rdflib graph a parser writes to, encoding as it goes."""
+
+    def __init__(self):
+        self.dictionary = TermDictionary()
+        self.triples = array('q')
+
+    def add(self, triple) -> None:
+        self.triples.extend(self.dictionary.encode_triple(triple))
+
+
+@functools.lru_cache(maxsize=None)
+def _chunking_supported() -> bool:
+    """Whether rdflib's Turtle parser keeps the state _parse_text reads after a parse.
+
+    Blank node labels and prefix bindings are private to the parser. Without
+    the labels, a label shared by two chunks would become two nodes, so files
+    are then parsed whole instead.
+    """
+    from rdflib.plugins.parsers.notation3 import RDFSink, SinkParser
+
+    parser = SinkParser(RDFSink(_Collector()), turtle=True)
+    supported = hasattr(parser, '_anonymousNodes') and hasattr(parser, '_bindings')
+    if not supported:
+        logger.warning("This rdflib version hides the Turtle parser's blank node labels and prefixes; "
+                       "parsing files in one process, without their prefixes")
+    return supported
+
+
+def _parse_text(text: bytes, base: str) -> Tuple[List['Node'], array, Dict[int, str], Dict[str, str]]:
+    """Parse Turtle into (terms, flat triple ids, blank node labels by id, prefixes)."""
+    from rdflib.plugins.parsers.notation3 import RDFSink, SinkParser
+
+    collector = _Collector()
+    parser = SinkParser(RDFSink(collector), baseURI=base, turtle=True)
+    parser.loadBuf(text)
+    ids = collector.dictionary.ids
+    # Private parser state, missing if rdflib changes it (see _chunking_supported)
+    labels = {ids[node]: label for label, node in getattr(parser, '_anonymousNodes', {}).items() if node in ids}
+    namespaces = {prefix: str(namespace) for prefix, namespace in getattr(parser, '_bindings', {}).items()}
+    return collector.dictionary.terms, collector.triples, labels, namespaces
+
+
+def _syntax_error(path: str, start: int, header: bytes, error: Exception) -> str:
+    """A short message for a parse error, with the line number in the whole file."""
+    why = getattr(error, '_why', None)
+    if why is None:
+        return f"{path}, bytes {start}-: {error}"
+    with open(path, 'rb') as f:
+        line = f.read(start).count(b'\n') + error.lines - header.count(b'\n') + 1
+    return f"{path}, line {line}: {why}"
+
+
+def _parse_chunk(args: Tuple[str, int, int, bytes, str]):
+    """Process pool worker: parse one chunk of a file."""
+    path, start, end, header, base = args
+    with open(path, 'rb') as f:
+        f.seek(start)
+        text = header + f.read(end - start)
+    try:
+        return _parse_text(text, base)
+    except Exception as e:
+        raise ValueError(_syntax_error(path, start, header, e)) from None
+
+
+def _merge(load: TurtleLoad, result, bnodes: Dict[str, 'Node']) -> None:
+    from rdflib import BNode
+
+    terms, triples, labels, namespaces = result
+    encode = load.dictionary.encode
+    remap = []
+    for local_id, term in enumerate(terms):
+        label = labels.get(local_id)
+        if label is not None:
+            term = bnodes.get(label)
+            if term is None:
+                term = bnodes[label] = BNode()
+        remap.append(encode(term))
+    ids = [remap[i] for i in triples]
+    load.store.update(zip(ids[0::3], ids[1::3], ids[2::3]))
+    load.namespaces.update(namespaces)
+    load.chunks += 1
+
+
+def load_turtle(
+        paths: Sequence[Path],
+        jobs: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        load: Optional[TurtleLoad] = None,
+) -> TurtleLoad:
+    """Parse Turtle or N-Triples files into one dictionary-encoded store.
+
+    Files of PARALLEL_THRESHOLD bytes or more are split and parsed across
+    `jobs` processes (default: CPU count); jobs=1 parses everything in this
+    process. Blank node labels are scoped to their file.
+    """
+    load = load or TurtleLoad()
+    jobs = jobs or os.cpu_count() or 1
+    pool: Optional[ProcessPoolExecutor] = None
+    try:
+        for path in paths:
+            path = Path(path).absolute()
+            if rdf_format(path) not in LOADER_FORMATS:
+                raise click.ClickException(f"Not a Turtle or N-Triples file: {path}")
+            base = path.as_uri()
+            bnodes: Dict[str, 'Node'] = {}
+            size = path.stat().st_size
+            if jobs == 1 or size < PARALLEL_THRESHOLD or not _chunking_supported():
+                try:
+                    result = _parse_text(path.read_bytes(), base)
+                except Exception as e:
+                    raise click.ClickException(f"Failed to parse {_syntax_error(str(path), 0, b'', e)}")
+                _merge(load, result, bnodes)
+                continue
+
+            start = time.perf_counter()
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                chunks = split_statements(buf, chunk_size or max(MIN_CHUNK_SIZE, size // (jobs * 4)))
+            logger.debug(f"Split {path} into {len(chunks)} chunks in {time.perf_counter() - start:.2f}s")
+            pool = pool or ProcessPoolExecutor(max_workers=jobs)
+            work = [(str(path), c.start, c.end, c.header, base) for c in chunks]
+            try:
+                for result in pool.map(_parse_chunk, work):
+                    _merge(load, result, bnodes)
+            except ValueError as e:
+                raise click.ClickException(f"Failed to parse {e}")
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+    return load
+
+
+def _blank_colours(triples: List[Tuple['Node', 'Node', 'Node']], rounds: int = 16) -> Counter:
+    """Triples with blank nodes replaced by colours from colour refinement.
+
+    Each blank node starts with the same colour and is repeatedly recoloured
+    by the sorted colours of its edges, until the partition stops changing.
+    """
+    from rdflib import BNode
+
+    edges: Dict['Node', List[Tuple[str, 'Node', 'Node']]] = {}
+    for s, p, o in triples:
+        if isinstance(s, BNode):
+            edges.setdefault(s, []).append(('out', p, o))
+        if isinstance(o, BNode):
+            edges.setdefault(o, []).append(('in', p, s))
+    colour = {node: 0 for node in edges}
+
+    def term(node: 'Node') -> object:
+        return ('_', colour[node]) if node in colour else node
+
+    classes = 1
+    for _ in range(rounds):
+        colour = {
+            node: hash(tuple(sorted((d, p, term(other)) for d, p, other in node_edges)))
+            for node, node_edges in edges.items()
+        }
+        refined = len(set(colour.values()))
+        if refined == classes:
+            break
+        classes = refined
+    return Counter((term(s), p, term(o)) for s, p, o in triples)
+
+
+def same_triples(a: TurtleLoad, b: TurtleLoad) -> bool:
+    """Whether two loads hold the same triples, up to blank node identity.
+
+    Triples without blank nodes must match exactly. The rest are compared by
+    colour refinement, which separates the blank node structures found in
+    real data without the cost of a full isomorphism search.
+    """
+    from rdflib import BNode
+
+    if len(a.store) != len(b.store):
+        return False
+
+    def split(load: TurtleLoad) -> Tuple[set, list]:
+        ground, blank = set(), []
+        for triple in load.triples():
+            if isinstance(triple[0], BNode) or isinstance(triple[2], BNode):
+                blank.append(triple)
+            else:
+                ground.add(triple)
+        return ground, blank
+
+    ground_a, blank_a = split(a)
+    ground_b, blank_b = split(b)
+    return ground_a == ground_b and _blank_colours(blank_a) == _blank_colours(blank_b)
+
+
+@click.command('load-turtle')
+@click.argument('paths', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option('--jobs', '-j', type=int, help="Worker processes (default: CPU count)")
+@click.option('--chunk-size', type=int, help="Target chunk size in bytes (default: size / (4 x jobs))")
+@click.option('--check', is_flag=True, help="Compare with a single-process parse")
+def load_turtle_command(paths: Tuple[Path, ...], jobs: Optional[int], chunk_size: Optional[int], check: bool):
+    """Parse large Turtle files in parallel and report throughput."""
+    try:
+        size = sum(p.stat().st_size for p in paths)
+        start = time.perf_counter()
+        load = load_turtle(paths, jobs=jobs, chunk_size=chunk_size)
+        elapsed = time.perf_counter() - start
+        click.echo(f"📚 {len(load.store)} triples, {len(load.dictionary)} terms from {load.chunks} chunk(s) "
+                   f"in {elapsed:.2f}s ({size / elapsed / 1e6:.1f} MB/s)")
+
+        if check:
+            start = time.perf_counter()
+            serial = load_turtle(paths, jobs=1)
+            serial_elapsed = time.perf_counter() - start
+            click.echo(f"🔄 Single-process parse took {serial_elapsed:.2f}s "
+                       f"(speed-up {serial_elapsed / elapsed:.1f}x)")
+            if not same_triples(load, serial):
+                raise click.ClickException("Parallel and single-process parses differ")
+            click.echo("✅ Parallel parse matches the single-process parse")
+
+    except click.ClickException as e:
+        click.echo(f"❌ Error: {str(e)}", err=True)
+        raise click.Abort()
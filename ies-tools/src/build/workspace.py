@@ -0,0 +1,401 @@
+"""In-memory view of the ontology, its imports closure and the data.
+
+A Workspace keeps one named graph per source file in an rdflib Dataset whose
+default graph is the union of them all. `refresh()` compares file sizes and
+mtimes with what was loaded and re-parses only the files that changed,
+following `owl:imports` through the catalogs to local files. Every change
+bumps `version`, which keys the query cache, so cached results never outlive
+the graph they were computed from. Large Turtle and N-Triples files are
+parsed in parallel chunks by turtle_loader. With `modules=True` imports
+resolve to the compact modules written by `ies-build extract-module` instead
+of the full imported ontologies.
+
+Used in-process by the check commands and kept warm by `ies-build serve`.
+"""
+
+import logging
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Tuple
+
+import click
+
+from .ontology import OWL, default_sources, rdf_format
+
+if TYPE_CHECKING:
+    from rdflib import Dataset, Graph
+
+    from .reasoner import Reasoner
+    from .term_index import TermIndex
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILE = Path('catalog.xml')
+IMPORTS_CATALOG = Path('imports') / 'catalog-v001.xml'
+MODULE_CATALOG = Path('build') / 'imports' / 'catalog.xml'
+TEST_DATA = Path('tests') / 'test-data' / 'test-data.ttl'
+OWL_IMPORTS = OWL + 'imports'
+# Named graph holding the reasoner's inferences when reasoning is enabled
+INFERRED_GRAPH = 'urn:ies-build:inferred'
+
+DEFAULT_CACHE_SIZE = 256
+
+
+def read_catalog(root: Path, catalog: Path = CATALOG_FILE) -> Dict[str, Path]:
+    """Ontology IRI to local file, from an OASIS XML catalog.
+
+    `${PROJECT_ROOT}` and `file:` prefixes are resolved against root. Entries
+    are also keyed without a trailing '#' or '/' so that namespace IRIs match.
+    """
+    path = Path(root) / catalog
+    if not path.exists():
+        return {}
+    return parse_catalog(root, path.read_bytes(), path)
+
+
+def parse_catalog(root: Path, data: bytes, source: object = 'catalog') -> Dict[str, Path]:
+    """The mapping of read_catalog, from catalog contents (e.g. a git blob)."""
+    try:
+        tree = ET.ElementTree(ET.fromstring(data))
+    except ET.ParseError as e:
+        raise click.ClickException(f"Invalid catalog {source}: {e}")
+    mapping = {}
+    for element in tree.iter():
+        if element.tag.rsplit('}', 1)[-1] != 'uri':
+            continue
+        name, uri = element.get('name'), element.get('uri')
+        if not name or not uri:
+            continue
+        uri = uri.replace('${PROJECT_ROOT}', '')
+        uri = re.sub(r'^file:/*', '', uri)
+        local = Path(root) / uri
+        mapping[name] = local
+        mapping[name.rstrip('#/')] = local
+    return mapping
+
+
+def project_catalog(root: Path) -> Dict[str, Path]:
+    """The imports catalog overlaid with catalog.xml, which wins on conflicts."""
+    mapping = read_catalog(root, IMPORTS_CATALOG)
+    mapping.update(read_catalog(root, CATALOG_FILE))
+    return mapping
+
+
+# Strings and IRIs are matched whole, so '#' and whitespace inside them are kept
+QUERY_TOKEN = re.compile(
+    r'"""(?:[^"\\]|\\.|"(?!""))*"""'
+    r"|'''(?:[^'\\]|\\.|'(?!''))*'''"
+    r'|"(?:[^"\\\n]|\\.)*"'
+    r"|'(?:[^'\\\n]|\\.)*'"
+    r'|<[^<>"{}|^`\\\s]*>'
+    r'|(?P<comment>#[^\n]*)'
+    r'|(?P<space>\s+)'
+    r'|[^"\'<#\s]+|.',
+    re.DOTALL,
+)
+
+
+def normalise_query(query: str) -> str:
+    """Query text with comments and insignificant whitespace removed, for cache keys."""
+    parts = []
+    for match in QUERY_TOKEN.finditer(query):
+        if match.lastgroup:
+            if parts and parts[-1] != ' ':
+                parts.append(' ')
+        else:
+            parts.append(match.group())
+    return ''.join(parts).strip()
+
+
+class QueryCache:
+    """Thread-safe LRU cache of query results.
+
+    Entries are keyed by graph version, normalised query text and an optional
+    variant (such as the result format), so edits that only change comments
+    or whitespace still hit the cache.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries: 'OrderedDict[Tuple[int, str, str], object]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, version: int, query: str, variant: str = '') -> Optional[object]:
+        key = (version, variant, normalise_query(query))
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, version: int, query: str, value: object, variant: str = '') -> None:
+        key = (version, variant, normalise_query(query))
+        with self._lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.entries.clear()
+
+
+def result_to_json(result) -> Dict[str, object]:
+    """A JSON-friendly form of an rdflib query result."""
+    if result.type == 'ASK':
+        return {'type': 'ASK', 'boolean': bool(result.askAnswer)}
+    if result.type == 'SELECT':
+        variables = [str(v) for v in result.vars]
+        rows = [[None if value is None else str(value) for value in row] for row in result]
+        return {'type': 'SELECT', 'vars': variables, 'rows': rows}
+    return {'type': result.type, 'turtle': result.serialize(format='turtle').decode('utf-8')}
+
+
+@dataclass
+class SourceState:
+    """What was loaded from one file."""
+    path: Path
+    size: int
+    mtime: int
+    triples: int
+    imports: List[str]
+
+
+class Workspace:
+    """The ontology, its imports closure and the data, loaded once and kept current."""
+
+    def __init__(self, root: Path = Path('.'), sources: Optional[Sequence[Path]] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE, reasoning: bool = False, modules: bool = False):
+        self.root = Path(root).resolve()
+        self.reasoning = reasoning
+        self.modules = modules
+        self.roots = [Path(p) for p in sources] if sources else self._default_roots()
+        self.catalog = project_catalog(self.root)
+        if modules:
+            self._use_modules()
+        self.version = 0
+        self.loaded: Dict[Path, SourceState] = {}
+        self.unresolved_imports: Set[str] = set()
+        self.cache = QueryCache(cache_size)
+        self._dataset: Optional['Dataset'] = None
+        self._term_index: Optional[Tuple[int, 'TermIndex']] = None
+        self._reasoner: Optional['Reasoner'] = None
+        # Explicit triples per file, and how many files assert each triple
+        self._asserted: Dict[Path, Set[tuple]] = {}
+        self._assertions: Dict[tuple, int] = {}
+
+    def _default_roots(self) -> List[Path]:
+        roots = default_sources(root=self.root)
+        if (self.root / TEST_DATA).exists():
+            roots.append(self.root / TEST_DATA)
+        return roots
+
+    def _use_modules(self) -> None:
+        modules = read_catalog(self.root, MODULE_CATALOG)
+        if not modules:
+            raise click.ClickException(f"No import modules in {MODULE_CATALOG.parent}; "
+                                       f"run `ies-build extract-module` first")
+        # Imported ontologies that are also roots (IES core) load as their module too
+        replaced = {self.catalog[iri].resolve(): path for iri, path in modules.items() if iri in self.catalog}
+        self.catalog.update(modules)
+        self.roots = [replaced.get(self._resolve_path(p), p) for p in self.roots]
+
+    @property
+    def dataset(self) -> 'Dataset':
+        if self._dataset is None:
+            from rdflib import Dataset
+            self._dataset = Dataset(default_union=True)
+        return self._dataset
+
+    def graph(self, path: Optional[Path] = None) -> 'Graph':
+        """The named graph of one source file, or the union of all of them."""
+        if path is None:
+            return self.dataset
+        from rdflib import URIRef
+        return self.dataset.graph(URIRef(Path(path).resolve().as_uri()))
+
+    def _resolve_path(self, path: Path) -> Path:
+        path = Path(path)
+        return (path if path.is_absolute() else self.root / path).resolve()
+
+    def _parse(self, path: Path) -> SourceState:
+        from rdflib import URIRef
+
+        from .turtle_loader import LOADER_FORMATS, PARALLEL_THRESHOLD, load_turtle
+
+        stat = path.stat()
+        self.dataset.remove_graph(self.graph(path))
+        graph = self.graph(path)
+        try:
+            if rdf_format(path) in LOADER_FORMATS and stat.st_size >= PARALLEL_THRESHOLD:
+                # Large Turtle data exports parse much faster in chunks across processes
+                load = load_turtle([path])
+                graph.addN((s, p, o, graph) for s, p, o in load.triples())
+                for prefix, namespace in load.namespaces.items():
+                    graph.bind(prefix, namespace, override=False)
+            else:
+                graph.parse(path, format=rdf_format(path))
+        except click.ClickException:
+            raise
+        except Exception as e:
+            raise click.ClickException(f"Failed to parse {path}: {e}")
+        imports = sorted(str(o) for o in graph.objects(None, URIRef(OWL_IMPORTS)))
+        logger.info(f"Loaded {path} ({len(graph)} triples)")
+        return SourceState(path, stat.st_size, stat.st_mtime_ns, len(graph), imports)
+
+    def closure(self) -> List[Path]:
+        """Root sources plus everything reachable through owl:imports and the catalog."""
+        seen: List[Path] = []
+        queue = [self._resolve_path(p) for p in self.roots]
+        self.unresolved_imports = set()
+        while queue:
+            path = queue.pop(0)
+            if path in seen:
+                continue
+            seen.append(path)
+            state = self.loaded.get(path)
+            for iri in state.imports if state else []:
+                local = self.catalog.get(iri) or self.catalog.get(iri.rstrip('#/'))
+                if local is not None and local.exists():
+                    queue.append(local.resolve())
+                else:
+                    self.unresolved_imports.add(iri)
+        return seen
+
+    def refresh(self) -> List[Path]:
+        """Re-parse changed files, load new imports and drop files no longer in the closure.
+
+        Returns the files that were (re)loaded or dropped.
+        """
+        changed: List[Path] = []
+        pending = True
+        while pending:
+            pending = False
+            for path in self.closure():
+                state = self.loaded.get(path)
+                if not path.exists():
+                    raise click.ClickException(f"RDF file not found: {path}")
+                stat = path.stat()
+                if state and state.size == stat.st_size and state.mtime == stat.st_mtime_ns:
+                    continue
+                # Whatever happens next, the graph no longer matches the cache
+                self.version += 1
+                self.cache.clear()
+                try:
+                    new_state = self._parse(path)
+                except click.ClickException:
+                    # Retry on the next refresh, even if the file is not touched again
+                    self.loaded.pop(path, None)
+                    raise
+                self.loaded[path] = new_state
+                changed.append(path)
+                # New imports may extend the closure
+                if state is None or state.imports != new_state.imports:
+                    pending = True
+        closure = set(self.closure())
+        for path in [p for p in self.loaded if p not in closure]:
+            self.dataset.remove_graph(self.graph(path))
+            del self.loaded[path]
+            changed.append(path)
+            self.version += 1
+            self.cache.clear()
+        if self.reasoning and changed:
+            self._update_inferences(changed)
+        return changed
+
+    @property
+    def reasoner(self) -> 'Reasoner':
+        if self._reasoner is None:
+            from .reasoner import Reasoner
+            self._reasoner = Reasoner()
+        return self._reasoner
+
+    def _update_inferences(self, changed: Sequence[Path]) -> None:
+        """Feed the triples that changed in these files to the reasoner.
+
+        Only triples that no other file still asserts are retracted, and the
+        inferred named graph is updated for just the triples the reasoner
+        reports as changed.
+        """
+        from rdflib import URIRef
+
+        retracted, asserted = [], []
+        for path in changed:
+            old = self._asserted.pop(path, set())
+            new = set(self.graph(path)) if path in self.loaded else set()
+            if new:
+                self._asserted[path] = new
+            for triple in old - new:
+                self._assertions[triple] -= 1
+                if not self._assertions[triple]:
+                    del self._assertions[triple]
+                    retracted.append(triple)
+            for triple in new - old:
+                self._assertions[triple] = self._assertions.get(triple, 0) + 1
+                if self._assertions[triple] == 1:
+                    asserted.append(triple)
+
+        start = time.perf_counter()
+        reasoner = self.reasoner
+        touched = reasoner.remove(retracted)
+        touched |= reasoner.add(asserted)
+        inferred = self.dataset.graph(URIRef(INFERRED_GRAPH))
+        decode = reasoner.dictionary.decode_triple
+        for triple in touched:
+            if reasoner.is_inferred(triple):
+                inferred.add(decode(triple))
+            else:
+                inferred.remove(decode(triple))
+        logger.info(f"Reasoner applied {len(retracted)} retraction(s) and {len(asserted)} assertion(s) "
+                    f"in {time.perf_counter() - start:.2f}s; {reasoner.inferred_count} inferred triples")
+
+    def query(self, query: str) -> Dict[str, object]:
+        """Run a SPARQL query over the union graph, using the query cache."""
+        cached = self.cache.get(self.version, query)
+        if cached is not None:
+            return cached
+        start = time.perf_counter()
+        try:
+            result = result_to_json(self.dataset.query(query))
+        except Exception as e:
+            raise click.ClickException(f"Query failed: {e}")
+        result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        self.cache.put(self.version, query, result)
+        return result
+
+    def term_index(self) -> 'TermIndex':
+        """The persistent term index over the closure, updated after graph changes."""
+        from .term_index import DEFAULT_INDEX_DIR, INDEX_FILE, TermIndex, update_index
+
+        if self._term_index is None or self._term_index[0] != self.version:
+            if self._term_index is not None:
+                self._term_index[1].close()
+            index_dir = self.root / DEFAULT_INDEX_DIR
+            update_index(list(self.loaded), index_dir)
+            self._term_index = (self.version, TermIndex(index_dir / INDEX_FILE))
+        return self._term_index[1]
+
+    def status(self) -> Dict[str, object]:
+        return {
+            'root': str(self.root),
+            'version': self.version,
+            'sources': [
+                {'path': str(state.path), 'triples': state.triples}
+                for state in self.loaded.values()
+            ],
+            'unresolved_imports': sorted(self.unresolved_imports),
+            'reasoning': self._reasoner.stats() if self._reasoner else None,
+            'modules': self.modules,
+            'cache': {'entries': len(self.cache.entries), 'hits': self.cache.hits,
+                      'misses': self.cache.misses},
+        }
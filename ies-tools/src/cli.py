@@ -0,0 +1,62 @@
+"""Shared click helpers for the ies-tools command line interfaces."""
+
+import importlib
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+
+class LazyGroup(click.Group):
+    """A click group that imports subcommand modules only when they are invoked.
+
+    `lazy_subcommands` maps a command name to `(import_path, short_help)`,
+    where import_path is `module:attribute` relative to `package`. The short
+    help is kept here so that `--help` can list every command without
+    importing any of them.
+    """
+
+    def __init__(
+            self,
+            *args,
+            lazy_subcommands: Optional[Dict[str, Tuple[str, str]]] = None,
+            package: Optional[str] = None,
+            **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+        self.package = package
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            self.add_command(self._load(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load(self, cmd_name: str) -> click.Command:
+        import_path, _ = self.lazy_subcommands[cmd_name]
+        module_name, attr = import_path.split(":", 1)
+        if module_name.startswith(".") or self.package is None:
+            module = importlib.import_module(module_name, package=self.package)
+        else:
+            module = importlib.import_module(f".{module_name}", package=self.package)
+        command = getattr(module, attr)
+        if not isinstance(command, click.Command):
+            raise click.ClickException(f"{import_path} is not a click command")
+        return command
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        """List commands using the stored short help for ones not yet imported."""
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.commands:
+                command = self.commands[name]
+                if command.hidden:
+                    continue
+                rows.append((name, command.get_short_help_str(formatter.width)))
+            else:
+                rows.append((name, self.lazy_subcommands[name][1]))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
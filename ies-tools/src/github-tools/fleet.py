@@ -0,0 +1,369 @@
+"""Run gh-tools operations across many ontology repositories in parallel.
+
+Each repository gets its own working directory under the fleet workdir, so
+concurrent git operations never share an index or worktree. A bounded
+number of repositories is processed at once and the results are collected
+into a single report.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import click
+
+from .steps import run_process
+
+# Root of the checkout providing ies-tools, used to run gh-tools in each clone
+TOOLS_ROOT = Path(__file__).resolve().parents[3]
+GH_TOOLS_MODULE = f"{__package__}.github"
+
+DEFAULT_WORKDIR = Path(".fleet")
+FLEET_BRANCHES = ["main", "develop", "rc"]
+
+
+class FleetStatus(str, Enum):
+    OK = "ok"
+    FAILED = "failed"
+    TIMEOUT = "timeout"
+
+
+@dataclass
+class RepoTarget:
+    """A repository in the fleet, as listed in the repos file."""
+    spec: str
+
+    @property
+    def is_url(self) -> bool:
+        return "://" in self.spec or self.spec.startswith(("git@", "/", "."))
+
+    @property
+    def slug(self) -> str:
+        """Filesystem-safe name used for the working directory."""
+        name = self.spec.rstrip("/")
+        if name.endswith(".git"):
+            name = name[:-4]
+        parts = [p for p in name.replace(":", "/").split("/") if p]
+        return "__".join(parts[-2:])
+
+
+@dataclass
+class FleetResult:
+    """Outcome of one operation on one repository."""
+    repo: str
+    command: str
+    status: FleetStatus
+    duration: float
+    summary: str = ""
+    details: Dict[str, object] = field(default_factory=dict)
+
+
+def read_repos_file(path: Path) -> List[RepoTarget]:
+    """Read `owner/name` or clone URL entries, one per line, ignoring comments."""
+    targets = []
+    for line in Path(path).read_text().splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            targets.append(RepoTarget(line))
+    if not targets:
+        raise click.ClickException(f"No repositories listed in {path}")
+    return targets
+
+
+async def ensure_clone(target: RepoTarget, workdir: Path) -> Path:
+    """Clone the repository into its own directory, or fetch if already cloned.
+
+    The clone is made in a temporary directory that is renamed into place
+    once it is complete, so a failed or interrupted clone is never mistaken
+    for a finished one by the next run.
+    """
+    repo_dir = workdir / target.slug
+    if (repo_dir / ".git").exists():
+        await run_process(["git", "fetch", "--prune", "origin"], cwd=str(repo_dir))
+        return repo_dir
+
+    partial = Path(tempfile.mkdtemp(prefix=f".{target.slug}.", dir=workdir))
+    try:
+        if target.is_url:
+            await run_process(["git", "clone", "--quiet", target.spec, str(partial)])
+        else:
+            await run_process(["gh", "repo", "clone", target.spec, str(partial), "--", "--quiet"])
+        if repo_dir.exists():
+            # Left over from a clone made before clones were renamed into place
+            shutil.rmtree(repo_dir)
+        partial.rename(repo_dir)
+    finally:
+        shutil.rmtree(partial, ignore_errors=True)
+    return repo_dir
+
+
+async def run_gh_tools(repo_dir: Path, args: Sequence[str]):
+    """Run a gh-tools command inside a repository clone."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in [str(TOOLS_ROOT), env.get("PYTHONPATH", "")] if p
+    )
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", GH_TOOLS_MODULE, *args,
+        cwd=str(repo_dir),
+        env=env,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    try:
+        stdout, _ = await proc.communicate()
+    except asyncio.CancelledError:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    return proc.returncode, stdout.decode()
+
+
+def _last_line(output: str) -> str:
+    # Skips click's "Aborted!", which follows the actual error
+    lines = [line for line in output.splitlines() if line.strip() and line.strip() != "Aborted!"]
+    return lines[-1].strip() if lines else ""
+
+
+async def op_setup_repo(target: RepoTarget, repo_dir: Path, extra: Sequence[str]) -> FleetResult:
+    code, output = await run_gh_tools(repo_dir, ["setup-repo", *extra])
+    return FleetResult(
+        target.spec, "setup-repo",
+        FleetStatus.OK if code == 0 else FleetStatus.FAILED, 0.0, _last_line(output),
+    )
+
+
+async def op_labels(target: RepoTarget, repo_dir: Path, extra: Sequence[str]) -> FleetResult:
+    await run_process(["gh", "workflow", "run", "setup-labels.yml"], cwd=str(repo_dir))
+    return FleetResult(target.spec, "labels", FleetStatus.OK, 0.0, "labels workflow triggered")
+
+
+async def op_sync(target: RepoTarget, repo_dir: Path, extra: Sequence[str]) -> FleetResult:
+    code, output = await run_gh_tools(repo_dir, ["sync", *extra])
+    return FleetResult(
+        target.spec, "sync",
+        FleetStatus.OK if code == 0 else FleetStatus.FAILED, 0.0, _last_line(output),
+    )
+
+
+async def op_sync_tools(target: RepoTarget, repo_dir: Path, extra: Sequence[str]) -> FleetResult:
+    code, output = await run_gh_tools(repo_dir, ["sync-tools", *extra])
+    changed = [line for line in output.splitlines() if line.startswith("🔄")]
+    return FleetResult(
+        target.spec, "sync-tools",
+        FleetStatus.OK if code == 0 else FleetStatus.FAILED, 0.0,
+        _last_line(changed[0] if changed else output),
+    )
+
+
+async def op_branch_status(target: RepoTarget, repo_dir: Path, extra: Sequence[str]) -> FleetResult:
+    """Report which standard branches exist and how far develop and rc are ahead of main."""
+    result = await run_process(
+        ["git", "for-each-ref", "--format=%(refname:strip=3)", "refs/remotes/origin"],
+        cwd=str(repo_dir),
+    )
+    remote_branches = set(result.stdout.split())
+    details: Dict[str, object] = {
+        "branches": {b: b in remote_branches for b in FLEET_BRANCHES},
+    }
+    summary = []
+    missing = [b for b in FLEET_BRANCHES if b not in remote_branches]
+    if missing:
+        summary.append(f"missing {', '.join(missing)}")
+
+    if "main" in remote_branches:
+        for branch in ["develop", "rc"]:
+            if branch not in remote_branches:
+                continue
+            counts = await run_process(
+                ["git", "rev-list", "--left-right", "--count", f"origin/main...origin/{branch}"],
+                cwd=str(repo_dir),
+            )
+            behind, ahead = (int(n) for n in counts.stdout.split())
+            details[branch] = {"ahead": ahead, "behind": behind}
+            summary.append(f"{branch} +{ahead}/-{behind}")
+
+    return FleetResult(
+        target.spec, "branch-status",
+        FleetStatus.FAILED if missing else FleetStatus.OK, 0.0,
+        ", ".join(summary), details,
+    )
+
+
+FLEET_OPERATIONS: Dict[str, Callable[[RepoTarget, Path, Sequence[str]], Awaitable[FleetResult]]] = {
+    "setup-repo": op_setup_repo,
+    "labels": op_labels,
+    "branch-status": op_branch_status,
+    "sync": op_sync,
+    "sync-tools": op_sync_tools,
+}
+
+
+async def _run_one(
+        command: str,
+        target: RepoTarget,
+        workdir: Path,
+        extra: Sequence[str],
+        semaphore: asyncio.Semaphore,
+        timeout: Optional[float],
+) -> FleetResult:
+    async with semaphore:
+        click.echo(f"▶️  {target.spec}: {command}")
+        start = time.perf_counter()
+
+        async def work() -> FleetResult:
+            repo_dir = await ensure_clone(target, workdir)
+            return await FLEET_OPERATIONS[command](target, repo_dir, extra)
+
+        try:
+            result = await asyncio.wait_for(work(), timeout=timeout)
+        except asyncio.TimeoutError:
+            result = FleetResult(target.spec, command, FleetStatus.TIMEOUT, 0.0,
+                                 f"timed out after {timeout:.0f}s")
+        except Exception as e:
+            message = getattr(e, "stderr", None) or str(e)
+            result = FleetResult(target.spec, command, FleetStatus.FAILED, 0.0,
+                                 _last_line(str(message)))
+        result.duration = time.perf_counter() - start
+
+        icon = "✓" if result.status == FleetStatus.OK else "❌"
+        click.echo(f"{icon} {target.spec}: {result.status.value} in {result.duration:.2f}s")
+        return result
+
+
+async def run_fleet(
+        command: str,
+        targets: Sequence[RepoTarget],
+        workdir: Path = DEFAULT_WORKDIR,
+        jobs: int = 8,
+        timeout: Optional[float] = None,
+        extra: Sequence[str] = (),
+) -> List[FleetResult]:
+    """Run command against every target with at most jobs repositories in flight."""
+    if command not in FLEET_OPERATIONS:
+        raise click.ClickException(f"Unknown fleet command: {command}")
+    workdir = Path(workdir).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    semaphore = asyncio.Semaphore(max(1, jobs))
+    return list(await asyncio.gather(*[
+        _run_one(command, target, workdir, extra, semaphore, timeout)
+        for target in targets
+    ]))
+
+
+def format_fleet_table(results: Sequence[FleetResult]) -> List[str]:
+    """Render fleet results as an aligned text table."""
+    repo_width = max([len(r.repo) for r in results] + [len("Repository")])
+    lines = [
+        f"{'Repository':<{repo_width}}  {'Status':<8}  {'Time':>8}  Summary",
+        f"{'-' * repo_width}  {'-' * 8}  {'-' * 8}  {'-' * 7}",
+    ]
+    for r in results:
+        lines.append(
+            f"{r.repo:<{repo_width}}  {r.status.value:<8}  {r.duration:>7.2f}s  {r.summary}"
+        )
+    return lines
+
+
+def fleet_report_json(results: Sequence[FleetResult], wall_time: float) -> str:
+    """Serialise fleet results and timing as JSON."""
+    return json.dumps(
+        {
+            "wall_time": round(wall_time, 3),
+            "sum_of_durations": round(sum(r.duration for r in results), 3),
+            "results": [
+                {**asdict(r), "status": r.status.value, "duration": round(r.duration, 3)}
+                for r in results
+            ],
+        },
+        indent=2,
+    )
+
+
+@click.command(context_settings={"ignore_unknown_options": True})
+@click.argument("command", type=click.Choice(sorted(FLEET_OPERATIONS)))
+@click.argument("command_args", nargs=-1, type=click.UNPROCESSED)
+@click.option(
+    "--repos",
+    "-r",
+    "repos_file",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="File listing owner/name or clone URLs, one per line",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    default=8,
+    show_default=True,
+    help="Maximum number of repositories processed at once",
+)
+@click.option(
+    "--workdir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=DEFAULT_WORKDIR,
+    show_default=True,
+    help="Directory holding one isolated clone per repository",
+)
+@click.option(
+    "--timeout",
+    type=float,
+    default=900,
+    show_default=True,
+    help="Per-repository timeout in seconds",
+)
+@click.option(
+    "--json-output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Also write the aggregated report as JSON to this file",
+)
+def fleet(
+        command: str,
+        command_args: Tuple[str, ...],
+        repos_file: Path,
+        jobs: int,
+        workdir: Path,
+        timeout: float,
+        json_output: Optional[Path],
+):
+    """Run COMMAND across many repositories in parallel.
+
+    COMMAND is one of setup-repo, labels, branch-status or sync. Any further
+    arguments are passed on to the gh-tools command run in each repository,
+    e.g. `gh-tools fleet sync --repos repos.txt develop`.
+    """
+    targets = read_repos_file(repos_file)
+    click.echo(f"🚀 Running {command} on {len(targets)} repositories ({jobs} at a time)...")
+
+    start = time.perf_counter()
+    results = asyncio.run(
+        run_fleet(command, targets, workdir=workdir, jobs=jobs, timeout=timeout,
+                  extra=command_args)
+    )
+    wall_time = time.perf_counter() - start
+
+    click.echo("")
+    for line in format_fleet_table(results):
+        click.echo(line)
+    click.echo(
+        f"\n⏱️  Wall time {wall_time:.2f}s "
+        f"(sum of per-repo times {sum(r.duration for r in results):.2f}s)"
+    )
+
+    if json_output:
+        json_output.write_text(fleet_report_json(results, wall_time))
+        click.echo(f"📝 JSON report written to {json_output}")
+
+    failed = [r for r in results if r.status != FleetStatus.OK]
+    if failed:
+        raise click.ClickException(f"{len(failed)} of {len(results)} repositories failed")
+    click.echo("🎉 Fleet operation completed successfully!")
@@ -1,5 +1,3 @@
-import os
-import sys
 import json
 import re
 import subprocess
@@ -9,6 +7,8 @@ from typing import Optional, Tuple, List
 
 import click
 
+from ..cli import LazyGroup
+
 
 class PriorityLevel(str, Enum):
     LOW = "low"
@@ -152,43 +152,6 @@ def get_project_id() -> Optional[str]:
         return None
 
 
-def setup_submodules() -> bool:
-    """Initialize and update required git submodules"""
-    try:
-        # Skip if we are in the ies-core repository
-        if get_repo_name() == "ies-core":
-            click.echo("ℹ️  Skipping submodule setup in ies-core repository")
-            return True
-
-        core_repo = "https://github.com/Acme-Ontologies/ies-core.git"
-        submodule_path = "core"
-
-        click.echo("🔍 Checking submodules...")
-
-        # Check if submodule already exists
-        if not os.path.exists(os.path.join(submodule_path, ".git")):
-            click.echo("🔗 Adding core submodule...")
-            subprocess.run(
-                ["git", "submodule", "add", core_repo, submodule_path],
-                check=True,
-                capture_output=True,
-            )
-
-        # Update the submodule
-        subprocess.run(
-            ["git", "submodule", "update", "--init", "--recursive"],
-            check=True,
-            capture_output=True,
-        )
-
-        click.echo("✨ Submodules setup completed")
-        return True
-
-    except subprocess.CalledProcessError as e:
-        click.echo(f"❌ Failed to setup submodules: {e.stderr}", err=True)
-        return False
-
-
 def setup_develop_branch() -> bool:
     """Create and push develop branch if it doesn't exist"""
     try:
@@ -229,100 +192,6 @@ def setup_develop_branch() -> bool:
         return False
 
 
-def setup_labels() -> bool:
-    """Run the labels setup workflow"""
-    try:
-        workflow_path = ".github/workflows/setup-labels.yml"
-
-        # Check if workflow file exists
-        if not os.path.exists(workflow_path):
-            click.echo(f"❌ Workflow file not found: {workflow_path}", err=True)
-            return False
-
-        click.echo("🏷️  Running labels setup workflow...")
-        subprocess.run(
-            ["gh", "workflow", "run", "setup-labels.yml"],
-            check=True,
-            capture_output=True,
-        )
-        click.echo("✨ Labels setup workflow triggered successfully")
-        return True
-
-    except subprocess.CalledProcessError as e:
-        click.echo(f"❌ Failed to run labels workflow: {e.stderr}", err=True)
-        return False
-
-
-def get_platform_type() -> str:
-    """Determine the platform type more accurately"""
-    system = platform.system().lower()
-    if system == "darwin":
-        return "macos"
-    elif system == "linux":
-        return "linux"
-    elif system == "windows":
-        return "windows"
-    else:
-        return "unknown"
-
-
-def check_gh_cli() -> bool:
-    """Check if GitHub CLI is installed"""
-    try:
-        subprocess.run(["gh", "--version"], check=True, capture_output=True)
-        click.echo("✓ GitHub CLI is installed")
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        click.echo("❌ GitHub CLI (gh) is not installed", err=True)
-
-        # Provide installation instructions based on platform
-        platform_type = get_platform_type()
-        if platform_type == "macos":
-            click.echo("To install on macOS:")
-            click.echo("  brew install gh")
-        elif platform_type == "linux":
-            click.echo("To install on Linux:")
-            click.echo(
-                "  curl -fsSL https://cli.github.com/packages/githubcli-archive-keyring.gpg | sudo dd of=/usr/share/keyrings/githubcli-archive-keyring.gpg")
-            click.echo(
-                "  echo \"deb [signed-by=/usr/share/keyrings/githubcli-archive-keyring.gpg] https://cli.github.com/packages stable main\" | sudo tee /etc/apt/sources.list.d/github-cli.list")
-            click.echo("  sudo apt update")
-            click.echo("  sudo apt install gh")
-        elif platform_type == "windows":
-            click.echo("To install on Windows:")
-            click.echo("  winget install GitHub.cli")
-            click.echo("  # or")
-            click.echo("  choco install gh")
-        return False
-
-
-def check_just() -> bool:
-    """Check if just is installed"""
-    try:
-        subprocess.run(["just", "--version"], check=True, capture_output=True)
-        click.echo("✓ just is installed")
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        click.echo("❌ just is not installed", err=True)
-
-        # Provide installation instructions based on platform
-        platform_type = get_platform_type()
-        if platform_type == "macos":
-            click.echo("To install on macOS:")
-            click.echo("  brew install just")
-        elif platform_type == "linux":
-            click.echo("To install on Linux:")
-            click.echo("  curl --proto '=https' --tlsv1.2 -sSf https://just.systems/install.sh | bash -s")
-        elif platform_type == "windows":
-            click.echo("To install on Windows:")
-            click.echo("  winget install just")
-            click.echo("  # or")
-            click.echo("  choco install just")
-        else:
-            click.echo("Please visit https://just.systems/man/en/chapter_4.html for installation instructions")
-        return False
-
-
 def create_issue(
         title: str, body: str, labels: List[str], issue_type: IssueType
 ) -> IssueMetadata:
@@ -415,73 +284,6 @@ def create_issue(
         raise
 
 
-def setup_branches() -> bool:
-    """Create and push develop and rc branches if they don't exist"""
-    try:
-        # Get default branch (usually main)
-        default_branch = get_default_branch()
-
-        # Get list of existing branches
-        result = subprocess.run(
-            ["git", "branch", "--list"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        existing_branches = result.stdout.strip().split('\n')
-        existing_branches = [b.strip('* ') for b in existing_branches]
-
-        # Setup develop branch
-        if 'develop' not in existing_branches:
-            click.echo("🌱 Creating develop branch...")
-            subprocess.run(
-                ["git", "checkout", "-b", "develop", f"origin/{default_branch}"],
-                check=True,
-                capture_output=True,
-            )
-            click.echo("⬆️  Pushing develop branch to remote...")
-            subprocess.run(
-                ["git", "push", "-u", "origin", "develop"],
-                check=True,
-                capture_output=True,
-            )
-
-        # Setup rc branch
-        if 'rc' not in existing_branches:
-            click.echo("🌱 Creating rc branch...")
-            subprocess.run(
-                ["git", "checkout", f"origin/{default_branch}"],
-                check=True,
-                capture_output=True,
-            )
-            subprocess.run(
-                ["git", "checkout", "-b", "rc"],
-                check=True,
-                capture_output=True,
-            )
-            click.echo("⬆️  Pushing rc branch to remote...")
-            subprocess.run(
-                ["git", "push", "-u", "origin", "rc"],
-                check=True,
-                capture_output=True,
-            )
-
-        # Ensure we end up on develop branch
-        if not 'develop' in existing_branches:
-            subprocess.run(
-                ["git", "checkout", "develop"],
-                check=True,
-                capture_output=True,
-            )
-
-        click.echo("✨ Branches setup completed")
-        return True
-
-    except subprocess.CalledProcessError as e:
-        click.echo(f"❌ Failed to setup branches: {e.stderr}", err=True)
-        return False
-
-
 def check_branch_status() -> Tuple[bool, bool, bool]:
     """Check branch status returning (has_local_changes, has_unpushed, has_unmerged)"""
     # Check for local changes
@@ -585,53 +387,29 @@ def sync_remote_branch(branch_name: str, force: bool = False):
         raise click.ClickException(f"Failed to sync branch: {e}")
 
 
-@click.group()
+@click.group(
+    cls=LazyGroup,
+    package=__package__,
+    lazy_subcommands={
+        "setup-repo": (
+            "repo_setup:setup_repo",
+            "Set up repository with develop branch and required tools",
+        ),
+        "sync-tools": (
+            "toolsync:sync_tools",
+            "Sync the shared IES tools from the template into TARGETS.",
+        ),
+        "fleet": (
+            "fleet:fleet",
+            "Run COMMAND across many repositories in parallel.",
+        ),
+    },
+)
 def cli():
     """CLI for managing GitHub issues and workflows"""
     pass
 
 
-@cli.command()
-def setup_repo():
-    """Set up repository with develop branch and required tools"""
-    success_count = 0
-    total_steps = 3  # Minimum required steps
-
-    click.echo("🔧 Setting up repository...")
-
-    # Check for gh CLI installation
-    check_gh_cli()
-
-    # Check for just installation
-    check_just()
-
-    # Verify GitHub CLI authentication
-    try:
-        verify_gh_cli()
-        click.echo("✓ GitHub CLI authenticated")
-    except click.ClickException as e:
-        click.echo(f"❌ {str(e)}", err=True)
-        return
-
-    # Setup submodules
-    if setup_submodules():
-        success_count += 1
-
-    # Setup branches
-    if setup_branches():
-        success_count += 1
-
-    # Setup labels
-    if setup_labels():
-        success_count += 1
-
-    # Final status report
-    if success_count == total_steps:
-        click.echo("🎉 Repository setup completed successfully!")
-    else:
-        click.echo(f"⚠️  Repository setup completed with {total_steps - success_count} failures")
-        click.echo("Please check the logs above and fix any issues manually")
-
 @cli.command()
 @click.option(
     "--title", "-t", prompt="Feature title", help="Title of the feature request"
@@ -802,6 +580,7 @@ def sync(branch_name: Optional[str] = None, force: bool = False):
 
     except click.ClickException as e:
         click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
 
 
 if __name__ == "__main__":
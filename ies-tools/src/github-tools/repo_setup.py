@@ -0,0 +1,299 @@
+"""The setup-repo command: tool checks, submodules, branches and labels."""
+
+import asyncio
+import functools
+import os
+import platform
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+import click
+
+from .github import get_default_branch, get_repo_name
+from .steps import Step, StepExecutor, format_timing_report, run_process
+from .submodules import (
+    CORE_REPO_URL,
+    CORE_SPARSE_PATHS,
+    REFERENCE_CACHE_ENV,
+    SubmoduleOptions,
+    echo_provision_report,
+    provision_submodule,
+)
+
+
+async def setup_submodules(options: Optional[SubmoduleOptions] = None) -> bool:
+    """Initialize and update required git submodules"""
+    options = options or SubmoduleOptions()
+    try:
+        # Skip if we are in the ies-core repository
+        if await asyncio.to_thread(get_repo_name) == "ies-core":
+            click.echo("ℹ️  Skipping submodule setup in ies-core repository")
+            return True
+
+        click.echo("🔍 Checking submodules...")
+        report = await provision_submodule(options)
+        echo_provision_report(report)
+
+        click.echo("✨ Submodules setup completed")
+        return True
+
+    except subprocess.CalledProcessError as e:
+        click.echo(f"❌ Failed to setup submodules: {e.stderr}", err=True)
+        return False
+
+
+async def setup_labels() -> bool:
+    """Run the labels setup workflow"""
+    try:
+        workflow_path = ".github/workflows/setup-labels.yml"
+
+        # Check if workflow file exists
+        if not os.path.exists(workflow_path):
+            click.echo(f"❌ Workflow file not found: {workflow_path}", err=True)
+            return False
+
+        click.echo("🏷️  Running labels setup workflow...")
+        await run_process(["gh", "workflow", "run", "setup-labels.yml"])
+        click.echo("✨ Labels setup workflow triggered successfully")
+        return True
+
+    except subprocess.CalledProcessError as e:
+        click.echo(f"❌ Failed to run labels workflow: {e.stderr}", err=True)
+        return False
+
+
+def get_platform_type() -> str:
+    """Determine the platform type more accurately"""
+    system = platform.system().lower()
+    if system == "darwin":
+        return "macos"
+    elif system == "linux":
+        return "linux"
+    elif system == "windows":
+        return "windows"
+    else:
+        return "unknown"
+
+
+async def check_gh_cli() -> bool:
+    """Check if GitHub CLI is installed"""
+    try:
+        await run_process(["gh", "--version"])
+        click.echo("✓ GitHub CLI is installed")
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        click.echo("❌ GitHub CLI (gh) is not installed", err=True)
+
+        # Provide installation instructions based on platform
+        platform_type = get_platform_type()
+        if platform_type == "macos":
+            click.echo("To install on macOS:")
+            click.echo("  brew install gh")
+        elif platform_type == "linux":
+            click.echo("To install on Linux:")
+            click.echo(
+                "  curl -fsSL https://cli.github.com/packages/githubcli-archive-keyring.gpg | sudo dd of=/usr/share/keyrings/githubcli-archive-keyring.gpg")
+            click.echo(
+                "  echo \"deb [signed-by=/usr/share/keyrings/githubcli-archive-keyring.gpg] https://cli.github.com/packages stable main\" | sudo tee /etc/apt/sources.list.d/github-cli.list")
+            click.echo("  sudo apt update")
+            click.echo("  sudo apt install gh")
+        elif platform_type == "windows":
+            click.echo("To install on Windows:")
+            click.echo("  winget install GitHub.cli")
+            click.echo("  # or")
+            click.echo("  choco install gh")
+        return False
+
+
+async def check_just() -> bool:
+    """Check if just is installed"""
+    try:
+        await run_process(["just", "--version"])
+        click.echo("✓ just is installed")
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        click.echo("❌ just is not installed", err=True)
+
+        # Provide installation instructions based on platform
+        platform_type = get_platform_type()
+        if platform_type == "macos":
+            click.echo("To install on macOS:")
+            click.echo("  brew install just")
+        elif platform_type == "linux":
+            click.echo("To install on Linux:")
+            click.echo("  curl --proto '=https' --tlsv1.2 -sSf https://just.systems/install.sh | bash -s")
+        elif platform_type == "windows":
+            click.echo("To install on Windows:")
+            click.echo("  winget install just")
+            click.echo("  # or")
+            click.echo("  choco install just")
+        else:
+            click.echo("Please visit https://just.systems/man/en/chapter_4.html for installation instructions")
+        return False
+
+
+async def check_gh_auth() -> bool:
+    """Check that GitHub CLI is authenticated"""
+    try:
+        await run_process(["gh", "auth", "status"])
+        click.echo("✓ GitHub CLI authenticated")
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        click.echo(
+            "❌ Not authenticated with GitHub. Please run 'gh auth login' first.",
+            err=True,
+        )
+        return False
+
+
+async def setup_branches() -> bool:
+    """Create and push develop and rc branches if they don't exist"""
+    try:
+        # Get default branch (usually main)
+        default_branch = await asyncio.to_thread(get_default_branch)
+
+        # Get list of existing branches
+        result = await run_process(["git", "branch", "--list"])
+        existing_branches = result.stdout.strip().split('\n')
+        existing_branches = [b.strip('* ') for b in existing_branches]
+
+        # Setup develop branch
+        if 'develop' not in existing_branches:
+            click.echo("🌱 Creating develop branch...")
+            await run_process(["git", "checkout", "-b", "develop", f"origin/{default_branch}"])
+            click.echo("⬆️  Pushing develop branch to remote...")
+            await run_process(["git", "push", "-u", "origin", "develop"])
+
+        # Setup rc branch
+        if 'rc' not in existing_branches:
+            click.echo("🌱 Creating rc branch...")
+            await run_process(["git", "checkout", f"origin/{default_branch}"])
+            await run_process(["git", "checkout", "-b", "rc"])
+            click.echo("⬆️  Pushing rc branch to remote...")
+            await run_process(["git", "push", "-u", "origin", "rc"])
+
+        # Ensure we end up on develop branch
+        if not 'develop' in existing_branches:
+            await run_process(["git", "checkout", "develop"])
+
+        click.echo("✨ Branches setup completed")
+        return True
+
+    except subprocess.CalledProcessError as e:
+        click.echo(f"❌ Failed to setup branches: {e.stderr}", err=True)
+        return False
+
+
+# Timeouts (seconds) for each setup-repo step
+SETUP_STEP_TIMEOUTS = {
+    "check-gh": 30,
+    "check-just": 30,
+    "gh-auth": 30,
+    "submodules": 600,
+    "branches": 180,
+    "labels": 60,
+}
+
+
+def setup_repo_steps(submodule_options: Optional[SubmoduleOptions] = None) -> List[Step]:
+    """Build the setup-repo pipeline.
+
+    Tool checks, the submodule clone and the labels workflow dispatch are
+    independent. Branch setup waits for the submodule step because both
+    write to the git index, and it needs gh for the default branch lookup.
+    """
+    return [
+        Step("check-gh", check_gh_cli, timeout=SETUP_STEP_TIMEOUTS["check-gh"]),
+        Step("check-just", check_just, timeout=SETUP_STEP_TIMEOUTS["check-just"]),
+        Step(
+            "gh-auth",
+            check_gh_auth,
+            depends_on=["check-gh"],
+            timeout=SETUP_STEP_TIMEOUTS["gh-auth"],
+        ),
+        Step(
+            "submodules",
+            functools.partial(setup_submodules, submodule_options),
+            timeout=SETUP_STEP_TIMEOUTS["submodules"],
+        ),
+        Step(
+            "branches",
+            setup_branches,
+            depends_on=["gh-auth", "submodules"],
+            timeout=SETUP_STEP_TIMEOUTS["branches"],
+        ),
+        Step(
+            "labels",
+            setup_labels,
+            depends_on=["gh-auth"],
+            timeout=SETUP_STEP_TIMEOUTS["labels"],
+        ),
+    ]
+
+
+@click.command()
+@click.option(
+    "--fast",
+    is_flag=True,
+    help="Shorthand for --shallow --blobless --sparse",
+)
+@click.option(
+    "--shallow/--no-shallow",
+    default=False,
+    help="Clone ies-core with only the latest commit",
+)
+@click.option(
+    "--blobless/--no-blobless",
+    default=False,
+    help="Partial clone of ies-core, fetching file contents on demand",
+)
+@click.option(
+    "--sparse/--no-sparse",
+    default=False,
+    help=f"Only check out {', '.join(CORE_SPARSE_PATHS)} in ies-core",
+)
+@click.option(
+    "--reference-cache",
+    type=click.Path(file_okay=False, path_type=Path),
+    envvar=REFERENCE_CACHE_ENV,
+    help="Shared local cache of ies-core objects reused across repositories",
+)
+@click.option(
+    "--core-url",
+    default=CORE_REPO_URL,
+    show_default=True,
+    help="URL of the ies-core repository",
+)
+def setup_repo(
+        fast: bool,
+        shallow: bool,
+        blobless: bool,
+        sparse: bool,
+        reference_cache: Optional[Path],
+        core_url: str,
+):
+    """Set up repository with develop branch and required tools"""
+    click.echo("🔧 Setting up repository...")
+
+    submodule_options = SubmoduleOptions(
+        url=core_url,
+        shallow=shallow or fast,
+        blobless=blobless or fast,
+        sparse_paths=list(CORE_SPARSE_PATHS) if (sparse or fast) else [],
+        reference_cache=reference_cache,
+    )
+    report = StepExecutor(setup_repo_steps(submodule_options)).run()
+
+    click.echo("\n⏱️  Setup timing:")
+    for line in format_timing_report(report):
+        click.echo(f"  {line}")
+
+    # Final status report
+    if report.ok:
+        click.echo("🎉 Repository setup completed successfully!")
+    else:
+        failed = ", ".join(r.name for r in report.failures)
+        click.echo(f"⚠️  Repository setup did not complete: {failed}")
+        click.echo("Please check the logs above and fix any issues manually")
+        raise click.Abort()
@@ -0,0 +1,205 @@
+"""Asyncio step executor for running gh-tools pipelines concurrently."""
+
+import asyncio
+import subprocess
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+import click
+
+
+class StepStatus(str, Enum):
+    """Final state of a pipeline step."""
+    SUCCESS = "success"
+    FAILED = "failed"
+    TIMEOUT = "timeout"
+    SKIPPED = "skipped"
+
+
+@dataclass
+class Step:
+    """A named unit of work and the steps it has to wait for."""
+    name: str
+    action: Callable[[], Awaitable[bool]]
+    depends_on: Sequence[str] = ()
+    timeout: Optional[float] = None
+
+
+@dataclass
+class StepResult:
+    """Outcome and timing of a single step."""
+    name: str
+    status: StepStatus
+    duration: float = 0.0
+    message: str = ""
+
+
+@dataclass
+class PipelineReport:
+    """Results of a pipeline run, in completion order."""
+    results: List[StepResult] = field(default_factory=list)
+    wall_time: float = 0.0
+
+    @property
+    def failures(self) -> List[StepResult]:
+        return [r for r in self.results if r.status != StepStatus.SUCCESS]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+async def run_process(
+        args: Sequence[str],
+        check: bool = True,
+        cwd: Optional[str] = None,
+) -> subprocess.CompletedProcess:
+    """Run a command asynchronously, mirroring subprocess.run(capture_output=True, text=True).
+
+    The child process is killed if the calling task is cancelled, so a step
+    timeout never leaves stray gh/git processes behind.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+    )
+    try:
+        stdout, stderr = await proc.communicate()
+    except asyncio.CancelledError:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+
+    result = subprocess.CompletedProcess(
+        list(args), proc.returncode, stdout.decode(), stderr.decode()
+    )
+    if check and result.returncode != 0:
+        raise subprocess.CalledProcessError(
+            result.returncode, result.args, result.stdout, result.stderr
+        )
+    return result
+
+
+class StepExecutor:
+    """Runs steps as soon as their dependencies have succeeded.
+
+    Independent steps run concurrently. A step whose dependency did not
+    succeed is skipped rather than run.
+    """
+
+    def __init__(self, steps: Sequence[Step], echo: Callable[[str], None] = click.echo):
+        self.steps: Dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate step name: {step.name}")
+            self.steps[step.name] = step
+        self.echo = echo
+        self._validate()
+
+    def _validate(self) -> None:
+        """Reject unknown dependencies and dependency cycles."""
+        for step in self.steps.values():
+            for dep in step.depends_on:
+                if dep not in self.steps:
+                    raise ValueError(f"Step '{step.name}' depends on unknown step '{dep}'")
+
+        visiting, done = set(), set()
+
+        def visit(name: str) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at step '{name}'")
+            visiting.add(name)
+            for dep in self.steps[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.steps:
+            visit(name)
+
+    async def _run_step(self, step: Step) -> StepResult:
+        self.echo(f"▶️  {step.name} started")
+        start = time.perf_counter()
+        try:
+            ok = await asyncio.wait_for(step.action(), timeout=step.timeout)
+            status = StepStatus.SUCCESS if ok else StepStatus.FAILED
+            message = ""
+        except asyncio.TimeoutError:
+            status = StepStatus.TIMEOUT
+            message = f"timed out after {step.timeout:.0f}s"
+        except Exception as e:
+            status = StepStatus.FAILED
+            message = str(e)
+        duration = time.perf_counter() - start
+
+        icon = "✓" if status == StepStatus.SUCCESS else "❌"
+        suffix = f" ({message})" if message else ""
+        self.echo(f"{icon} {step.name} {status.value} in {duration:.2f}s{suffix}")
+        return StepResult(step.name, status, duration, message)
+
+    async def run_async(self) -> PipelineReport:
+        """Execute the pipeline and return its report."""
+        report = PipelineReport()
+        start = time.perf_counter()
+        statuses: Dict[str, StepStatus] = {}
+        pending = dict(self.steps)
+        running: Dict[asyncio.Task, str] = {}
+
+        while pending or running:
+            # Launch or skip everything whose dependencies are resolved
+            for name, step in list(pending.items()):
+                dep_states = [statuses.get(dep) for dep in step.depends_on]
+                if any(s is None for s in dep_states):
+                    continue
+                del pending[name]
+                if all(s == StepStatus.SUCCESS for s in dep_states):
+                    running[asyncio.ensure_future(self._run_step(step))] = name
+                else:
+                    blocked = [d for d in step.depends_on if statuses[d] != StepStatus.SUCCESS]
+                    self.echo(f"⏭️  {name} skipped (waiting on failed {', '.join(blocked)})")
+                    statuses[name] = StepStatus.SKIPPED
+                    report.results.append(
+                        StepResult(name, StepStatus.SKIPPED, message=f"dependency failed: {', '.join(blocked)}")
+                    )
+
+            if not running:
+                continue
+
+            finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                running.pop(task)
+                result = task.result()
+                statuses[result.name] = result.status
+                report.results.append(result)
+
+        report.wall_time = time.perf_counter() - start
+        return report
+
+    def run(self) -> PipelineReport:
+        """Execute the pipeline from synchronous code."""
+        return asyncio.run(self.run_async())
+
+
+def format_timing_report(report: PipelineReport) -> List[str]:
+    """Render a per-step timing breakdown as lines of text."""
+    width = max([len(r.name) for r in report.results] + [len("sum of steps")])
+    lines = [
+        f"{'Step':<{width}}  {'Status':<8}  {'Time':>7}",
+        f"{'-' * width}  {'-' * 8}  {'-' * 7}",
+    ]
+    for result in report.results:
+        lines.append(
+            f"{result.name:<{width}}  {result.status.value:<8}  {result.duration:>6.2f}s"
+        )
+    serial = sum(r.duration for r in report.results)
+    lines.append(f"{'-' * width}  {'-' * 8}  {'-' * 7}")
+    lines.append(f"{'wall time':<{width}}  {'':<8}  {report.wall_time:>6.2f}s")
+    lines.append(f"{'sum of steps':<{width}}  {'':<8}  {serial:>6.2f}s")
+    return lines
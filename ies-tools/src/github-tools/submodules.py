@@ -0,0 +1,245 @@
+"""Provisioning of the ies-core submodule.
+
+Besides the plain `git submodule add`, the core submodule can be cloned
+shallow, blobless (partial clone) and with a sparse checkout limited to the
+ontology sources. A shared reference cache lets many repositories on the same
+machine copy objects from a single local mirror instead of downloading them
+again. Clones are dissociated from the mirror, so pruning or deleting the
+cache never breaks a submodule.
+"""
+
+import asyncio
+import fcntl
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+import click
+
+from .steps import run_process
+
+CORE_REPO_URL = "https://github.com/Acme-Ontologies/ies-core.git"
+CORE_SUBMODULE_PATH = "core"
+CORE_SPARSE_PATHS = ["src/ontology"]
+
+# Environment variable naming a shared reference cache directory
+REFERENCE_CACHE_ENV = "IES_CORE_CACHE"
+
+
+@dataclass
+class SubmoduleOptions:
+    """How the core submodule should be cloned."""
+    url: str = CORE_REPO_URL
+    path: str = CORE_SUBMODULE_PATH
+    shallow: bool = False
+    blobless: bool = False
+    sparse_paths: List[str] = field(default_factory=list)
+    reference_cache: Optional[Path] = None
+
+    @property
+    def is_full(self) -> bool:
+        """True when no fast-provisioning option is enabled."""
+        return not (self.shallow or self.blobless or self.sparse_paths or self.reference_cache)
+
+
+@dataclass
+class ProvisionReport:
+    """Time taken and disk used by a submodule provisioning run."""
+    seconds: float
+    worktree_bytes: int
+    gitdir_bytes: int
+    cache_bytes: int = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self.worktree_bytes + self.gitdir_bytes
+
+
+def format_size(num_bytes: int) -> str:
+    """Format a byte count for humans."""
+    size = float(num_bytes)
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if size < 1024 or unit == "GiB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def directory_size(path: Path, exclude: Optional[str] = None) -> int:
+    """Total size in bytes of the files under path, not following symlinks."""
+    total = 0
+    if not path.exists():
+        return 0
+    for root, dirs, files in os.walk(path):
+        if exclude in dirs:
+            dirs.remove(exclude)
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def cache_repo_path(cache_dir: Path, url: str) -> Path:
+    """Location of the bare mirror for url inside the reference cache."""
+    name = url.rstrip("/").split("/")[-1]
+    if not name.endswith(".git"):
+        name += ".git"
+    return Path(cache_dir) / name
+
+
+async def _acquire_lock(lock_path: Path, timeout: float = 600) -> int:
+    """Take an exclusive lock on lock_path, waiting while another process holds it.
+
+    The lock is a `flock` on the file, which the kernel releases when its
+    holder exits, so a killed run never leaves a lock behind. Returns the
+    descriptor to pass to _release_lock.
+    """
+    deadline = time.monotonic() + timeout
+    fd = os.open(lock_path, os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() > deadline:
+                    raise click.ClickException(f"Timed out waiting for cache lock {lock_path}")
+                await asyncio.sleep(0.5)
+    except BaseException:
+        os.close(fd)
+        raise
+    # The holder's PID, for whoever inspects a lock that is taking long
+    os.ftruncate(fd, 0)
+    os.pwrite(fd, str(os.getpid()).encode(), 0)
+    return fd
+
+
+def _release_lock(fd: int) -> None:
+    # The file itself stays: removing it would let a waiter lock a file no longer at lock_path
+    fcntl.flock(fd, fcntl.LOCK_UN)
+    os.close(fd)
+
+
+async def update_reference_cache(cache_dir: Path, url: str) -> Path:
+    """Create or refresh the bare mirror of url in the shared cache.
+
+    The mirror is guarded by a lock file so that several repositories being
+    provisioned at once on the same machine do not fetch into it concurrently.
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    mirror = cache_repo_path(cache_dir, url)
+    lock_path = mirror.with_name(mirror.name + ".lock")
+
+    lock = await _acquire_lock(lock_path)
+    try:
+        if (mirror / "HEAD").exists():
+            click.echo(f"🔄 Refreshing reference cache {mirror}...")
+            await run_process(["git", "-C", str(mirror), "remote", "update", "--prune"])
+        else:
+            click.echo(f"📦 Creating reference cache {mirror}...")
+            await run_process(["git", "clone", "--mirror", "--quiet", url, str(mirror)])
+    finally:
+        _release_lock(lock)
+    return mirror
+
+
+async def _resolve_gitdir(path: str) -> Path:
+    result = await run_process(["git", "-C", path, "rev-parse", "--absolute-git-dir"])
+    return Path(result.stdout.strip())
+
+
+async def _is_registered(path: str) -> bool:
+    """Whether path is already listed as a submodule in .gitmodules."""
+    if not os.path.exists(".gitmodules"):
+        return False
+    result = await run_process(
+        ["git", "config", "-f", ".gitmodules", "--get-regexp", r"submodule\..*\.path"],
+        check=False,
+    )
+    return any(line.split()[-1] == path for line in result.stdout.splitlines() if line.strip())
+
+
+async def _clone_fast(options: SubmoduleOptions, mirror: Optional[Path]) -> None:
+    """Clone the submodule worktree with the requested fast options."""
+    clone = ["git", "clone", "--quiet", "--no-checkout"]
+    if options.shallow:
+        clone += ["--depth", "1"]
+    if options.blobless:
+        clone += ["--filter=blob:none"]
+    if mirror is not None:
+        clone += ["--reference", str(mirror), "--dissociate"]
+    await run_process(clone + [options.url, options.path])
+
+    if options.sparse_paths:
+        await run_process(["git", "-C", options.path, "sparse-checkout", "init", "--cone"])
+        await run_process(
+            ["git", "-C", options.path, "sparse-checkout", "set", *options.sparse_paths]
+        )
+    await run_process(["git", "-C", options.path, "checkout", "--quiet"])
+
+
+async def provision_submodule(options: SubmoduleOptions) -> ProvisionReport:
+    """Add (if needed) and update the core submodule, returning time and disk use."""
+    start = time.perf_counter()
+    mirror = None
+    if options.reference_cache is not None:
+        mirror = await update_reference_cache(options.reference_cache, options.url)
+
+    registered = await _is_registered(options.path)
+    cloned = os.path.exists(os.path.join(options.path, ".git"))
+
+    if options.is_full:
+        if not cloned:
+            click.echo("🔗 Adding core submodule...")
+            await run_process(["git", "submodule", "add", options.url, options.path])
+        await run_process(["git", "submodule", "update", "--init", "--recursive"])
+    else:
+        if not cloned:
+            click.echo("🔗 Cloning core submodule (fast mode)...")
+            await _clone_fast(options, mirror)
+            if registered:
+                await run_process(["git", "submodule", "init", "--", options.path])
+            else:
+                # Adopts the existing clone instead of cloning again
+                await run_process(["git", "submodule", "add", options.url, options.path])
+            await run_process(["git", "submodule", "absorbgitdirs", "--", options.path])
+            if options.shallow:
+                await run_process(
+                    ["git", "config", "-f", ".gitmodules",
+                     f"submodule.{options.path}.shallow", "true"]
+                )
+                await run_process(["git", "add", ".gitmodules"])
+
+        # Check out the commit recorded in the superproject, fetching only what is missing
+        update = ["git", "submodule", "update", "--init"]
+        if options.shallow:
+            update += ["--depth", "1"]
+        if mirror is not None:
+            update += ["--reference", str(mirror), "--dissociate"]
+        await run_process(update + ["--", options.path])
+
+    seconds = time.perf_counter() - start
+    gitdir = await _resolve_gitdir(options.path)
+    return ProvisionReport(
+        seconds=seconds,
+        worktree_bytes=directory_size(Path(options.path), exclude=".git"),
+        gitdir_bytes=directory_size(gitdir),
+        cache_bytes=directory_size(mirror) if mirror is not None else 0,
+    )
+
+
+def echo_provision_report(report: ProvisionReport) -> None:
+    """Print the time and disk use of a provisioning run."""
+    click.echo(f"⏱️  Submodule provisioned in {report.seconds:.2f}s")
+    click.echo(
+        f"💾 Disk use: {format_size(report.total_bytes)} "
+        f"(worktree {format_size(report.worktree_bytes)}, "
+        f"git objects {format_size(report.gitdir_bytes)})"
+    )
+    if report.cache_bytes:
+        click.echo(f"   Shared reference cache: {format_size(report.cache_bytes)}")
@@ -0,0 +1,310 @@
+"""Content-hash based sync of the shared tools from the template repository.
+
+A manifest maps every synced file (relative path) to the SHA-256 of its
+contents. Comparing the template manifest with a target manifest gives the
+minimal set of files to add, update or delete, so unchanged files are never
+rewritten and a target that is already in sync produces an empty plan.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import click
+
+TEMPLATE_REPO_URL = "https://github.com/Acme-Ontologies/ies-ontology-template.git"
+DEFAULT_TEMPLATE_REF = "main"
+DEFAULT_TEMPLATE_CACHE = Path.home() / ".cache" / "ies-tools" / "templates"
+
+# Synced by .github/workflows/sync-ies-tools.yml
+SYNC_DIRS = [".github", "ies-tools"]
+SYNC_FILES = ["justfile", "poetry.lock", "pyproject.toml"]
+
+IGNORED_DIRS = {"__pycache__", ".pytest_cache", ".mypy_cache"}
+IGNORED_SUFFIXES = {".pyc", ".pyo"}
+MANIFEST_CACHE_FILE = "ies-sync-manifest.json"
+
+Manifest = Dict[str, str]
+
+
+@dataclass
+class SyncPlan:
+    """Files that differ between the template and a target."""
+    target: Path
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.modified or self.deleted)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "target": str(self.target),
+            "has_changes": self.has_changes,
+            "added": self.added,
+            "modified": self.modified,
+            "deleted": self.deleted,
+        }
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def list_sync_files(
+        root: Path,
+        dirs: Sequence[str] = SYNC_DIRS,
+        files: Sequence[str] = SYNC_FILES,
+) -> List[str]:
+    """Relative POSIX paths of every file covered by the sync configuration."""
+    root = Path(root)
+    found = []
+    for directory in dirs:
+        base = root / directory
+        if not base.is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = sorted(d for d in dirnames if d not in IGNORED_DIRS)
+            for name in sorted(filenames):
+                if Path(name).suffix in IGNORED_SUFFIXES:
+                    continue
+                found.append(Path(dirpath, name).relative_to(root).as_posix())
+    for name in files:
+        if (root / name).is_file():
+            found.append(name)
+    return found
+
+
+def build_manifest(
+        root: Path,
+        dirs: Sequence[str] = SYNC_DIRS,
+        files: Sequence[str] = SYNC_FILES,
+        workers: int = 8,
+) -> Manifest:
+    """Hash every synced file under root, reading files concurrently."""
+    root = Path(root)
+    paths = list_sync_files(root, dirs, files)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = pool.map(lambda rel: hash_file(root / rel), paths)
+    return dict(zip(paths, digests))
+
+
+def diff_manifests(
+        template: Manifest,
+        target: Manifest,
+        target_root: Path,
+        dirs: Sequence[str] = SYNC_DIRS,
+) -> SyncPlan:
+    """Compute the minimal changes that make target match template.
+
+    Files inside the synced directories that the template no longer has are
+    deleted; individually synced files are never deleted, matching the
+    behaviour of the sync workflow.
+    """
+    plan = SyncPlan(target=Path(target_root))
+    for path, digest in sorted(template.items()):
+        if path not in target:
+            plan.added.append(path)
+        elif target[path] != digest:
+            plan.modified.append(path)
+    prefixes = tuple(d.rstrip("/") + "/" for d in dirs)
+    for path in sorted(target):
+        if path not in template and path.startswith(prefixes):
+            plan.deleted.append(path)
+    return plan
+
+
+def apply_plan(plan: SyncPlan, template_root: Path) -> None:
+    """Write only the added and modified files and remove deleted ones."""
+    template_root = Path(template_root)
+    for rel in plan.added + plan.modified:
+        destination = plan.target / rel
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(template_root / rel, destination)
+    for rel in plan.deleted:
+        (plan.target / rel).unlink()
+        # Prune directories left empty by the deletion
+        parent = (plan.target / rel).parent
+        while parent != plan.target and parent.is_dir() and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+
+
+def ensure_template_cache(
+        cache_dir: Path = DEFAULT_TEMPLATE_CACHE,
+        ref: str = DEFAULT_TEMPLATE_REF,
+        url: str = TEMPLATE_REPO_URL,
+) -> Path:
+    """Shallow-clone or refresh the template at ref into the local cache."""
+    tree = Path(cache_dir) / ref.replace("/", "__")
+    try:
+        if (tree / ".git").exists():
+            subprocess.run(
+                ["git", "-C", str(tree), "fetch", "--quiet", "--depth", "1", "origin", ref],
+                check=True,
+                capture_output=True,
+            )
+            subprocess.run(
+                ["git", "-C", str(tree), "checkout", "--quiet", "--force", "FETCH_HEAD"],
+                check=True,
+                capture_output=True,
+            )
+        else:
+            tree.parent.mkdir(parents=True, exist_ok=True)
+            subprocess.run(
+                ["git", "clone", "--quiet", "--depth", "1", "--branch", ref, url, str(tree)],
+                check=True,
+                capture_output=True,
+            )
+    except subprocess.CalledProcessError as e:
+        raise click.ClickException(f"Failed to update template cache: {e.stderr}")
+    return tree
+
+
+def _tree_revision(root: Path) -> Optional[str]:
+    """Commit checked out at root, if it is a clean git worktree."""
+    try:
+        status = subprocess.run(
+            ["git", "-C", str(root), "status", "--porcelain"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        if status.stdout.strip():
+            return None
+        head = subprocess.run(
+            ["git", "-C", str(root), "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return head.stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+
+def load_template_manifest(template_root: Path) -> Manifest:
+    """Template manifest, reused from the cache while the template commit is unchanged."""
+    template_root = Path(template_root)
+    revision = _tree_revision(template_root)
+    cache_file = template_root / ".git" / MANIFEST_CACHE_FILE
+    if revision and cache_file.is_file():
+        try:
+            cached = json.loads(cache_file.read_text())
+            if cached.get("revision") == revision:
+                return cached["manifest"]
+        except (json.JSONDecodeError, KeyError):
+            pass
+
+    manifest = build_manifest(template_root)
+    if revision and cache_file.parent.is_dir():
+        cache_file.write_text(json.dumps({"revision": revision, "manifest": manifest}))
+    return manifest
+
+
+def plan_sync(template_root: Path, targets: Sequence[Path], workers: int = 8) -> List[SyncPlan]:
+    """Compare one template tree against many targets at once."""
+    template = load_template_manifest(template_root)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        manifests = list(pool.map(build_manifest, targets))
+    return [
+        diff_manifests(template, manifest, Path(target))
+        for target, manifest in zip(targets, manifests)
+    ]
+
+
+@click.command()
+@click.argument(
+    "targets",
+    nargs=-1,
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+)
+@click.option(
+    "--template",
+    "template_dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Local template checkout to sync from (skips the template cache)",
+)
+@click.option(
+    "--template-ref",
+    default=DEFAULT_TEMPLATE_REF,
+    show_default=True,
+    help="Template branch or tag to fetch into the cache",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=DEFAULT_TEMPLATE_CACHE,
+    show_default=True,
+    help="Where fetched template trees are cached",
+)
+@click.option(
+    "--apply/--check",
+    default=False,
+    help="Write the changed files, or only report them (default)",
+)
+@click.option(
+    "--json-output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the sync plans as JSON to this file",
+)
+def sync_tools(
+        targets: Tuple[Path, ...],
+        template_dir: Optional[Path],
+        template_ref: str,
+        cache_dir: Path,
+        apply: bool,
+        json_output: Optional[Path],
+):
+    """Sync the shared IES tools from the template into TARGETS.
+
+    TARGETS defaults to the current directory. Files are compared by content
+    hash and only added, modified or deleted files are written. When run in
+    GitHub Actions, `has_changes` is exported to $GITHUB_ENV so that no pull
+    request is opened for a repository that is already in sync.
+    """
+    targets = targets or (Path("."),)
+    if template_dir is None:
+        click.echo(f"📦 Updating cached template tree ({template_ref})...")
+        template_dir = ensure_template_cache(cache_dir, template_ref)
+
+    plans = plan_sync(template_dir, [t.resolve() for t in targets])
+    for plan in plans:
+        if not plan.has_changes:
+            click.echo(f"✓ {plan.target}: in sync")
+            continue
+        click.echo(f"🔄 {plan.target}: {len(plan.added)} added, "
+                   f"{len(plan.modified)} modified, {len(plan.deleted)} deleted")
+        for path in plan.added:
+            click.echo(f"  ✨ Added: {path}")
+        for path in plan.modified:
+            click.echo(f"  📝 Modified: {path}")
+        for path in plan.deleted:
+            click.echo(f"  🗑️ Deleted: {path}")
+        if apply:
+            apply_plan(plan, template_dir)
+
+    if json_output:
+        json_output.write_text(json.dumps([p.to_dict() for p in plans], indent=2))
+
+    has_changes = any(p.has_changes for p in plans)
+    github_env = os.environ.get("GITHUB_ENV")
+    if github_env:
+        with open(github_env, "a") as f:
+            f.write(f"has_changes={'true' if has_changes else 'false'}\n")
+
+    if apply and has_changes:
+        click.echo("✨ Tools synced")
@@ -0,0 +1,182 @@
+"""Startup-time benchmark and budget check for the ies-tools CLIs.
+
+Each CLI and each of its subcommands is started with `--help` in a fresh
+interpreter under `python -X importtime`. The median wall time over several
+runs is compared with a budget, and the slowest imports are reported so a
+regression can be traced to the module that caused it.
+
+    python -m ies-tools.src.startup_budget            # report and enforce
+    python -m ies-tools.src.startup_budget --json-output startup.json
+"""
+
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import click
+
+# Root of the checkout, put on PYTHONPATH so the hyphenated packages import
+TOOLS_ROOT = Path(__file__).resolve().parents[2]
+
+# Console scripts from pyproject.toml and the modules providing them
+CLI_MODULES = {
+    "ies-build": "ies-tools.src.build.build",
+    "gh-tools": "ies-tools.src.github-tools.github",
+}
+
+# Wall-time budgets in milliseconds for `<cli> --help`
+GROUP_BUDGET_MS = 150.0
+# Budget for `<cli> <subcommand> --help`, which also imports the subcommand
+SUBCOMMAND_BUDGET_MS = 300.0
+
+
+@dataclass
+class StartupMeasurement:
+    """Startup cost of one command line."""
+    command: str
+    wall_ms: float
+    import_ms: float
+    budget_ms: float
+    slowest_imports: List[Tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def within_budget(self) -> bool:
+        return self.wall_ms <= self.budget_ms
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, float]]:
+    """Total import time and cumulative time per top-level import, in milliseconds.
+
+    Lines look like `import time: self [us] | cumulative | imported package`,
+    with nested imports indented under the module that triggered them.
+    """
+    top_level: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative_us = int(parts[1])
+        except ValueError:
+            continue
+        name = parts[2]
+        if name.startswith(" ") and not name.startswith("  "):
+            module = name.strip()
+            top_level[module] = top_level.get(module, 0.0) + cumulative_us / 1000
+    return sum(top_level.values()), top_level
+
+
+def measure(
+        module: str,
+        args: Sequence[str],
+        runs: int = 5,
+        top: int = 5,
+) -> Tuple[float, float, List[Tuple[str, float]]]:
+    """Median wall and import time for `python -m module args`."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in [str(TOOLS_ROOT), env.get("PYTHONPATH", "")] if p
+    )
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    walls, imports = [], []
+    top_level: Dict[str, float] = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", module, *args],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        walls.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            raise click.ClickException(
+                f"`{module} {' '.join(args)}` failed:\n{result.stdout}{result.stderr}"
+            )
+        total, top_level = parse_importtime(result.stderr)
+        imports.append(total)
+    ranked = sorted(top_level.items(), key=lambda item: item[1], reverse=True)
+    return statistics.median(walls), statistics.median(imports), ranked[:top]
+
+
+def list_subcommands(module: str) -> List[str]:
+    """Subcommand names of a CLI group, without importing lazy subcommands."""
+    sys.path.insert(0, str(TOOLS_ROOT))
+    try:
+        group = importlib.import_module(module).cli
+    finally:
+        sys.path.remove(str(TOOLS_ROOT))
+    return group.list_commands(click.Context(group))
+
+
+def run_benchmark(
+        clis: Optional[Sequence[str]] = None,
+        runs: int = 5,
+        group_budget_ms: float = GROUP_BUDGET_MS,
+        subcommand_budget_ms: float = SUBCOMMAND_BUDGET_MS,
+) -> List[StartupMeasurement]:
+    """Measure every CLI and subcommand listed in CLI_MODULES."""
+    measurements = []
+    for name in clis or CLI_MODULES:
+        module = CLI_MODULES[name]
+        commands = [((), group_budget_ms)] + [
+            ((sub,), subcommand_budget_ms) for sub in list_subcommands(module)
+        ]
+        for sub, budget in commands:
+            wall, imports, slowest = measure(module, [*sub, "--help"], runs=runs)
+            measurements.append(StartupMeasurement(
+                command=" ".join([name, *sub, "--help"]),
+                wall_ms=wall,
+                import_ms=imports,
+                budget_ms=budget,
+                slowest_imports=slowest,
+            ))
+    return measurements
+
+
+@click.command()
+@click.option("--cli", "clis", multiple=True, type=click.Choice(sorted(CLI_MODULES)),
+              help="Only measure this CLI (repeatable)")
+@click.option("--runs", default=5, show_default=True, help="Runs per command; the median is used")
+@click.option("--budget-ms", default=GROUP_BUDGET_MS, show_default=True,
+              help="Budget for `<cli> --help`")
+@click.option("--subcommand-budget-ms", default=SUBCOMMAND_BUDGET_MS, show_default=True,
+              help="Budget for `<cli> <subcommand> --help`")
+@click.option("--json-output", type=click.Path(dir_okay=False, path_type=Path),
+              help="Write the measurements as JSON to this file")
+@click.option("--no-enforce", is_flag=True, help="Report only; never fail on budget")
+def main(clis, runs, budget_ms, subcommand_budget_ms, json_output, no_enforce):
+    """Measure CLI startup time and enforce the startup budget."""
+    measurements = run_benchmark(clis, runs, budget_ms, subcommand_budget_ms)
+
+    width = max(len(m.command) for m in measurements)
+    click.echo(f"{'Command':<{width}}  {'Wall':>8}  {'Imports':>8}  {'Budget':>8}")
+    for m in measurements:
+        flag = "" if m.within_budget else "  ❌ over budget"
+        click.echo(
+            f"{m.command:<{width}}  {m.wall_ms:>6.1f}ms  {m.import_ms:>6.1f}ms  "
+            f"{m.budget_ms:>6.0f}ms{flag}"
+        )
+        if not m.within_budget:
+            for module, ms in m.slowest_imports:
+                click.echo(f"    {ms:>8.1f}ms  {module}")
+
+    if json_output:
+        json_output.write_text(json.dumps([asdict(m) for m in measurements], indent=2))
+
+    over = [m for m in measurements if not m.within_budget]
+    if over and not no_enforce:
+        raise click.ClickException(f"{len(over)} command(s) exceeded the startup budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""Benchmarks of the ies-tools commands on synthetic projects."""
+
+import importlib
+from pathlib import Path
+
+# Root of the checkout whose SPARQL tests and shared tools are benchmarked
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def tools_module(name: str):
+    """Import a module of the hyphenated ies-tools package, e.g. `build.checks`."""
+    return importlib.import_module(f"ies-tools.src.{name}")
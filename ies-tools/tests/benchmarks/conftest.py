@@ -0,0 +1,237 @@
+"""Fixtures for the ies-tools benchmark suite.
+
+Benchmarks run on seeded synthetic projects from `build/synthetic.py`, with
+the template's own SPARQL tests copied in. Sizes are set on the command
+line; comma-separated values run every benchmark at each size. They are
+marked `benchmark` and only run when selected with `-m benchmark`:
+
+    poetry run pytest ies-tools/tests/benchmarks -m benchmark --synthetic-triples 10000,1000000 --synthetic-diagrams 10,1000
+
+External tools are replaced by stub `gh`, `just`, `mmdc` and `dot` scripts,
+and remotes by local bare repositories, so the gh-tools and diagram
+benchmarks measure the tools' own orchestration without the network or the
+renderers.
+"""
+
+import itertools
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from . import REPO_ROOT, tools_module
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+TEST_SUITES = [Path("tests") / "unit", Path("tests") / "integration", Path("tests") / "validation"]
+
+GIT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "Benchmark",
+    "GIT_AUTHOR_EMAIL": "benchmark@example.org",
+    "GIT_COMMITTER_NAME": "Benchmark",
+    "GIT_COMMITTER_EMAIL": "benchmark@example.org",
+    # Submodules are added from local file:// remotes
+    "GIT_CONFIG_COUNT": "1",
+    "GIT_CONFIG_KEY_0": "protocol.file.allow",
+    "GIT_CONFIG_VALUE_0": "always",
+}
+
+STUBS = {
+    "gh": """#!/bin/sh
+# Stub GitHub CLI: answers the calls gh-tools makes, clones from local remotes
+case "$1 $2" in
+    "--version "*) echo "gh version 2.63.0 (stub)" ;;
+    "auth status") echo "Logged in to github.com as benchmark" ;;
+    "repo view") echo '{"defaultBranchRef": {"name": "main"}}' ;;
+    "repo clone") exec git clone --quiet "$GH_STUB_REMOTES/${3##*/}.git" "$4" ;;
+    "workflow run") echo "Created workflow_dispatch event for $3" ;;
+    "issue create") echo "https://github.com/benchmark/ontology/issues/1" ;;
+    "api "*) echo '{"node_id": "I_benchmark"}' ;;
+    *) echo "gh stub: unsupported command: $*" >&2; exit 1 ;;
+esac
+""",
+    "just": """#!/bin/sh
+echo "just 1.38.0 (stub)"
+""",
+    "mmdc": """#!/bin/sh
+# Stub Mermaid CLI: writes a placeholder for -o
+while [ $# -gt 0 ]; do
+    case "$1" in
+        --version) echo "11.4.0 (stub)"; exit 0 ;;
+        -o) printf '<svg xmlns="http://www.w3.org/2000/svg"/>' > "$2"; shift ;;
+    esac
+    shift
+done
+""",
+    "dot": """#!/bin/sh
+# Stub Graphviz: writes a placeholder for -o
+while [ $# -gt 0 ]; do
+    case "$1" in
+        -V) echo "dot - graphviz version 12.2.1 (stub)" >&2; exit 0 ;;
+        -o) printf '<svg xmlns="http://www.w3.org/2000/svg"/>' > "$2"; shift ;;
+    esac
+    shift
+done
+""",
+}
+
+
+def pytest_configure(config):
+    # Raised by rdflib on every quad lookup; recording millions of them skews the timings
+    config.addinivalue_line("filterwarnings", "ignore:Dataset.default_context is deprecated:DeprecationWarning")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("synthetic", "synthetic benchmark inputs")
+    group.addoption("--synthetic-triples", default="10000",
+                    help="Comma-separated triple counts of the synthetic ontology and data (default: 10000)")
+    group.addoption("--synthetic-diagrams", default="10",
+                    help="Comma-separated numbers of synthetic diagram sources (default: 10)")
+    group.addoption("--synthetic-seed", type=int, default=0, help="Seed for the synthetic generator (default: 0)")
+    group.addoption("--fleet-size", type=int, default=8,
+                    help="Number of repositories in the gh-tools fleet benchmarks (default: 8)")
+
+
+def _sizes(config, option: str) -> List[int]:
+    return [int(size) for size in config.getoption(option).split(",") if size.strip()]
+
+
+def pytest_generate_tests(metafunc):
+    # Session scope, so each size is generated once and shared by every benchmark
+    if "triples" in metafunc.fixturenames:
+        metafunc.parametrize("triples", _sizes(metafunc.config, "--synthetic-triples"), scope="session")
+    if "diagrams" in metafunc.fixturenames:
+        metafunc.parametrize("diagrams", _sizes(metafunc.config, "--synthetic-diagrams"), scope="session")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items):
+    # Before `-m` deselects, so the default `-m "not benchmark"` in pyproject.toml skips this suite
+    for item in items:
+        if BENCHMARKS_DIR in item.path.parents:
+            item.add_marker(pytest.mark.benchmark)
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json):
+    """Record the generator settings with the results, so runs can be matched up."""
+    output_json["synthetic"] = {
+        "triples": _sizes(config, "--synthetic-triples"),
+        "diagrams": _sizes(config, "--synthetic-diagrams"),
+        "seed": config.getoption("--synthetic-seed"),
+        "fleet_size": config.getoption("--fleet-size"),
+    }
+
+
+@pytest.fixture(scope="session")
+def seed(request) -> int:
+    return request.config.getoption("--synthetic-seed")
+
+
+@pytest.fixture(scope="session")
+def rounds(request) -> int:
+    """Rounds for benchmarks that need fresh state each round."""
+    return request.config.getoption("benchmark_min_rounds")
+
+
+@pytest.fixture(scope="session")
+def synthetic_project(tmp_path_factory, triples, seed):
+    """A synthetic project of `triples` triples, with the template's SPARQL tests."""
+    synthetic = tools_module("build.synthetic")
+    root = tmp_path_factory.mktemp(f"project-{triples}")
+    project = synthetic.generate_project(root, triples=triples, diagrams=0, seed=seed)
+    for suite in TEST_SUITES:
+        shutil.copytree(REPO_ROOT / suite, root / suite)
+    return project
+
+
+@pytest.fixture(scope="session")
+def diagram_project(tmp_path_factory, diagrams, seed):
+    """A small synthetic project with `diagrams` diagram sources."""
+    synthetic = tools_module("build.synthetic")
+    root = tmp_path_factory.mktemp(f"diagrams-{diagrams}")
+    return synthetic.generate_project(root, triples=1000, diagrams=diagrams, seed=seed)
+
+
+@pytest.fixture(scope="session")
+def stub_bin(tmp_path_factory) -> Path:
+    directory = tmp_path_factory.mktemp("bin")
+    for name, script in STUBS.items():
+        path = directory / name
+        path.write_text(script)
+        path.chmod(0o755)
+    return directory
+
+
+def _git(*args: str, cwd: Path) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True,
+                          env={**os.environ, **GIT_IDENTITY}).stdout
+
+
+def _bare_repo(remotes: Path, name: str, files: Dict[str, str], branches: List[str]) -> Path:
+    """A bare repository with one commit on main and the given branches one commit ahead."""
+    work = remotes / f"{name}.work"
+    work.mkdir()
+    _git("init", "--quiet", "--initial-branch", "main", cwd=work)
+    for relative, text in files.items():
+        (work / relative).parent.mkdir(parents=True, exist_ok=True)
+        (work / relative).write_text(text)
+    _git("add", "-A", cwd=work)
+    _git("commit", "--quiet", "-m", "Initial", cwd=work)
+    for branch in branches:
+        _git("checkout", "--quiet", "-b", branch, "main", cwd=work)
+        (work / f"{branch}.txt").write_text(branch)
+        _git("add", "-A", cwd=work)
+        _git("commit", "--quiet", "-m", f"Work on {branch}", cwd=work)
+    bare = remotes / f"{name}.git"
+    _git("clone", "--quiet", "--bare", str(work), str(bare), cwd=remotes)
+    # Let blobless clones filter objects, as GitHub does
+    _git("config", "uploadpack.allowFilter", "true", cwd=bare)
+    shutil.rmtree(work)
+    return bare
+
+
+@pytest.fixture(scope="session")
+def remotes(tmp_path_factory, request) -> Dict[str, Path]:
+    """Local bare remotes: ies-core, a new ontology repository and a fleet of set-up ones."""
+    directory = tmp_path_factory.mktemp("remotes")
+    synthetic = tools_module("build.synthetic")
+    core = synthetic.generate_project(directory / "core-src", triples=5000, diagrams=4)
+    core_files = {
+        str(path.relative_to(core.root)): path.read_text()
+        for path in [core.ontology, core.data, *core.diagrams]
+    }
+    repos = {"ies-core": _bare_repo(directory, "ies-core", core_files, [])}
+    ontology_files = {
+        ".github/workflows/setup-labels.yml": (REPO_ROOT / ".github/workflows/setup-labels.yml").read_text(),
+        "src/ontology/ontology.ttl": (REPO_ROOT / "src/ontology/ontology.ttl").read_text(),
+    }
+    # Only main, as created from the template, for setup-repo to complete
+    repos["ontology-new"] = _bare_repo(directory, "ontology-new", ontology_files, [])
+    for i in range(request.config.getoption("--fleet-size")):
+        name = f"ontology-{i}"
+        repos[name] = _bare_repo(directory, name, ontology_files, ["develop", "rc"])
+    return repos
+
+
+@pytest.fixture
+def tool_env(monkeypatch, stub_bin, remotes):
+    """Stub binaries first on PATH, git identity, and the remotes for `gh repo clone`."""
+    monkeypatch.setenv("PATH", f"{stub_bin}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("GH_STUB_REMOTES", str(remotes["ies-core"].parent))
+    for name, value in GIT_IDENTITY.items():
+        monkeypatch.setenv(name, value)
+
+
+@pytest.fixture
+def fresh_remote(tmp_path):
+    """Copies a bare remote per benchmark round, so each round starts from the same refs."""
+    copies = itertools.count()
+
+    def copy(bare: Path) -> Path:
+        target = tmp_path / f"{bare.stem}-{next(copies)}.git"
+        shutil.copytree(bare, target)
+        return target
+
+    return copy
@@ -0,0 +1,39 @@
+"""Linting, SPARQL tests and validation on a loaded workspace."""
+
+import pytest
+
+from . import tools_module
+
+checks = tools_module("build.checks")
+workspace = tools_module("build.workspace")
+
+
+@pytest.fixture
+def loaded_workspace(synthetic_project):
+    ws = workspace.Workspace(synthetic_project.root)
+    ws.refresh()
+    return ws
+
+
+def test_lint(benchmark, loaded_workspace, synthetic_project):
+    benchmark.extra_info["triples"] = synthetic_project.triples
+    report = benchmark(checks.lint, loaded_workspace)
+    # The generator leaves some terms without definitions
+    assert any(issue["rule"] == "missing-definition" for issue in report["issues"])
+
+
+@pytest.mark.parametrize("operation", ["run_tests", "validate"])
+def test_queries(benchmark, loaded_workspace, synthetic_project, rounds, operation):
+    """Each round starts with an empty query cache, so every query is evaluated."""
+    benchmark.extra_info["triples"] = synthetic_project.triples
+    report = benchmark.pedantic(getattr(checks, operation), args=(loaded_workspace,),
+                                setup=loaded_workspace.cache.clear, rounds=rounds)
+    assert report["checks"]
+
+
+def test_run_tests_cached(benchmark, loaded_workspace, synthetic_project):
+    """Repeated test runs against an unchanged workspace, answered from the query cache."""
+    benchmark.extra_info["triples"] = synthetic_project.triples
+    checks.run_tests(loaded_workspace)
+    benchmark(checks.run_tests, loaded_workspace)
+    assert loaded_workspace.cache.hits
@@ -0,0 +1,24 @@
+"""Diagram builds against stub `mmdc` and `dot`, and the ontology overview."""
+
+from . import tools_module
+
+build = tools_module("build.build")
+ontology_diagram = tools_module("build.ontology_diagram")
+
+
+def test_build_diagrams(benchmark, tool_env, diagram_project):
+    """Per-diagram overhead of `ies-build build-diagrams`: discovery and one renderer call per format."""
+    benchmark.extra_info["diagrams"] = len(diagram_project.diagrams)
+    builder = build.DiagramBuilder(diagram_project.root)
+    benchmark(builder.generate_all_diagrams)
+    outputs = list(builder.build_diagrams.iterdir())
+    assert len(outputs) == len(diagram_project.diagrams) * len(builder.OUTPUT_FORMATS)
+
+
+def test_ontology_diagram(benchmark, synthetic_project, tmp_path):
+    benchmark.extra_info["triples"] = synthetic_project.triples
+    generator = ontology_diagram.OntologyDiagramGenerator(
+        [synthetic_project.ontology], output=tmp_path / "ontology-overview.dot"
+    )
+    written = benchmark(generator.generate, force=True)
+    assert written
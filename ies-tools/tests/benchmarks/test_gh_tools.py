@@ -0,0 +1,102 @@
+"""gh-tools flows against a stub `gh` and local bare remotes."""
+
+import asyncio
+import itertools
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from . import REPO_ROOT, tools_module
+
+fleet = tools_module("github-tools.fleet")
+repo_setup = tools_module("github-tools.repo_setup")
+steps = tools_module("github-tools.steps")
+submodules = tools_module("github-tools.submodules")
+toolsync = tools_module("github-tools.toolsync")
+
+SUBMODULE_MODES = {
+    "full": {},
+    "fast": {"shallow": True, "blobless": True, "sparse_paths": list(submodules.CORE_SPARSE_PATHS)},
+}
+
+
+def _quiet(message: str) -> None:
+    pass
+
+
+@pytest.mark.parametrize("mode", SUBMODULE_MODES)
+def test_setup_repo(benchmark, tool_env, remotes, fresh_remote, tmp_path, monkeypatch, rounds, mode):
+    """The setup-repo pipeline in a new clone: tool checks, core submodule, branches and labels."""
+    options = submodules.SubmoduleOptions(url=remotes["ies-core"].as_uri(), **SUBMODULE_MODES[mode])
+    clones = itertools.count()
+    monkeypatch.chdir(tmp_path)
+
+    def clone():
+        work = tmp_path / f"work-{next(clones)}"
+        subprocess.run(["git", "clone", "--quiet", str(fresh_remote(remotes["ontology-new"])), str(work)],
+                       check=True)
+        os.chdir(work)
+
+    def run():
+        return steps.StepExecutor(repo_setup.setup_repo_steps(options), echo=_quiet).run()
+
+    report = benchmark.pedantic(run, setup=clone, rounds=rounds)
+    assert report.ok, [(r.name, r.message) for r in report.failures]
+
+
+def test_fleet_branch_status(benchmark, tool_env, remotes, tmp_path, rounds):
+    """Cloning the fleet through `gh repo clone` and reporting its branches."""
+    size = len(remotes) - 2
+    targets = [fleet.RepoTarget(f"benchmark/ontology-{i}") for i in range(size)]
+    benchmark.extra_info["repositories"] = size
+    workdirs = (tmp_path / f"fleet-{n}" for n in itertools.count())
+
+    def run():
+        return asyncio.run(fleet.run_fleet("branch-status", targets, next(workdirs)))
+
+    results = benchmark.pedantic(run, rounds=rounds)
+    assert all(r.status == fleet.FleetStatus.OK for r in results), [r.summary for r in results]
+
+
+def test_fleet_setup_repo(benchmark, tool_env, remotes, fresh_remote, tmp_path, rounds):
+    """`gh-tools fleet setup-repo` over new repositories, one gh-tools process each."""
+    size = len(remotes) - 2
+    benchmark.extra_info["repositories"] = size
+    workdirs = (tmp_path / f"fleet-{n}" for n in itertools.count())
+    extra = ["--fast", "--core-url", remotes["ies-core"].as_uri()]
+
+    def targets():
+        return ([fleet.RepoTarget(str(fresh_remote(remotes["ontology-new"]))) for _ in range(size)],), {}
+
+    def run(targets):
+        return asyncio.run(fleet.run_fleet("setup-repo", targets, next(workdirs), extra=extra))
+
+    results = benchmark.pedantic(run, setup=targets, rounds=rounds)
+    assert all(r.status == fleet.FleetStatus.OK for r in results), [r.summary for r in results]
+
+
+def test_plan_sync(benchmark, remotes, tmp_path):
+    """Planning an ies-tools sync from the template across the fleet."""
+    template = tmp_path / "template"
+    ignore = shutil.ignore_patterns(*toolsync.IGNORED_DIRS, *(f"*{s}" for s in toolsync.IGNORED_SUFFIXES))
+    for name in toolsync.SYNC_DIRS:
+        shutil.copytree(REPO_ROOT / name, template / name, ignore=ignore)
+    for name in toolsync.SYNC_FILES:
+        shutil.copy2(REPO_ROOT / name, template / name)
+
+    targets = []
+    for i in range(len(remotes) - 2):
+        target = tmp_path / f"target-{i}"
+        shutil.copytree(template, target)
+        # Every other target has drifted from the template
+        if i % 2:
+            (target / "justfile").write_text("# local changes\n")
+            shutil.rmtree(target / "ies-tools" / "src" / "just")
+        targets.append(target)
+    benchmark.extra_info["repositories"] = len(targets)
+
+    plans = benchmark(toolsync.plan_sync, template, targets)
+    assert sum(plan.has_changes for plan in plans) == len(targets) // 2
+
@@ -0,0 +1,35 @@
+"""Loading the synthetic ontology and data."""
+
+import pytest
+
+from . import tools_module
+
+ontology = tools_module("build.ontology")
+turtle_loader = tools_module("build.turtle_loader")
+workspace = tools_module("build.workspace")
+
+
+def test_load_graph(benchmark, synthetic_project):
+    benchmark.extra_info["triples"] = synthetic_project.triples
+    graph = benchmark(ontology.load_graph, [synthetic_project.ontology, synthetic_project.data])
+    assert len(graph) == synthetic_project.triples
+
+
+@pytest.mark.parametrize("jobs", [1, None], ids=["serial", "parallel"])
+def test_load_turtle(benchmark, synthetic_project, jobs):
+    benchmark.extra_info["triples"] = synthetic_project.triples
+    load = benchmark(turtle_loader.load_turtle, [synthetic_project.ontology, synthetic_project.data], jobs=jobs)
+    assert len(load.store) == synthetic_project.triples
+
+
+def test_workspace_refresh(benchmark, synthetic_project):
+    """A cold workspace load, as done by the daemon and endpoint at startup."""
+    benchmark.extra_info["triples"] = synthetic_project.triples
+
+    def load():
+        ws = workspace.Workspace(synthetic_project.root)
+        ws.refresh()
+        return ws
+
+    ws = benchmark(load)
+    assert ws.loaded
@@ -0,0 +1,181 @@
+"""Provisioning the core submodule from a local bare repository."""
+
+import asyncio
+import fcntl
+import importlib
+import os
+import random
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import click
+import pytest
+
+submodules = importlib.import_module("ies-tools.src.github-tools.submodules")
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.org",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.org",
+    # Submodules are cloned from local file:// remotes
+    "GIT_CONFIG_COUNT": "1",
+    "GIT_CONFIG_KEY_0": "protocol.file.allow",
+    "GIT_CONFIG_VALUE_0": "always",
+}
+CORE_COMMITS = 3
+
+
+def git(*args, cwd=None) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def core_remote(tmp_path_factory, monkeypatch) -> str:
+    """A bare ies-core with a few commits, the ontology and some other files."""
+    for name, value in GIT_ENV.items():
+        monkeypatch.setenv(name, value)
+    work = tmp_path_factory.mktemp("core-work")
+    git("init", "--quiet", "--initial-branch", "main", cwd=work)
+    (work / "src" / "ontology").mkdir(parents=True)
+    (work / "docs").mkdir()
+    for i in range(CORE_COMMITS):
+        (work / "src" / "ontology" / "ontology.ttl").write_text(f"# version {i}\n")
+        # Incompressible, so object sizes dominate the git directory
+        (work / "docs" / "figure.png").write_bytes(random.Random(i).randbytes(50000))
+        git("add", "-A", cwd=work)
+        git("commit", "--quiet", "-m", f"Version {i}", cwd=work)
+    bare = tmp_path_factory.mktemp("remotes") / "ies-core.git"
+    git("clone", "--quiet", "--bare", str(work), str(bare))
+    git("config", "uploadpack.allowFilter", "true", cwd=bare)
+    return bare.as_uri()
+
+
+@pytest.fixture
+def superproject(tmp_path, monkeypatch) -> Path:
+    project = tmp_path / "project"
+    project.mkdir()
+    git("init", "--quiet", "--initial-branch", "main", cwd=project)
+    git("commit", "--quiet", "--allow-empty", "-m", "Initial", cwd=project)
+    monkeypatch.chdir(project)
+    return project
+
+
+def provision(**options):
+    return asyncio.run(submodules.provision_submodule(submodules.SubmoduleOptions(**options)))
+
+
+def test_full_clone(core_remote, superproject):
+    report = provision(url=core_remote)
+    assert git("-C", "core", "rev-list", "--count", "HEAD") == str(CORE_COMMITS)
+    assert (superproject / "core" / "docs" / "figure.png").exists()
+    assert report.cache_bytes == 0
+
+
+def test_shallow_clone(core_remote, superproject):
+    provision(url=core_remote, shallow=True)
+    assert git("-C", "core", "rev-list", "--count", "HEAD") == "1"
+    assert git("config", "-f", ".gitmodules", "submodule.core.shallow") == "true"
+
+
+def test_blobless_clone(core_remote, superproject):
+    provision(url=core_remote, blobless=True)
+    assert git("-C", "core", "config", "remote.origin.partialclonefilter") == "blob:none"
+    assert (superproject / "core" / "src" / "ontology" / "ontology.ttl").read_text() == "# version 2\n"
+
+
+def test_sparse_checkout(core_remote, superproject):
+    provision(url=core_remote, sparse_paths=list(submodules.CORE_SPARSE_PATHS))
+    assert (superproject / "core" / "src" / "ontology" / "ontology.ttl").exists()
+    assert not (superproject / "core" / "docs").exists()
+
+
+def test_reference_cache(core_remote, superproject, tmp_path):
+    cache = tmp_path / "cache"
+    report = provision(url=core_remote, shallow=True, reference_cache=cache)
+    mirror = submodules.cache_repo_path(cache, core_remote)
+    assert (mirror / "HEAD").exists()
+    assert_unlocked(mirror.with_name(mirror.name + ".lock"))
+    assert report.cache_bytes > 0
+
+    # Dissociated: the submodule keeps working once the cache is gone
+    alternates = Path(git("-C", "core", "rev-parse", "--git-path", "objects/info/alternates"))
+    assert not (superproject / "core" / alternates).exists()
+    shutil.rmtree(cache)
+    git("-C", "core", "fsck", "--no-progress")
+    assert (superproject / "core" / "src" / "ontology" / "ontology.ttl").exists()
+
+
+def test_report(core_remote, superproject, capsys):
+    full = provision(url=core_remote)
+    git("submodule", "deinit", "--quiet", "--force", "core")
+    git("rm", "--quiet", "--force", "core")
+    shutil.rmtree(superproject / ".git" / "modules" / "core")
+    sparse = provision(url=core_remote, shallow=True, blobless=True, sparse_paths=["src/ontology"])
+
+    for report in (full, sparse):
+        assert report.seconds > 0
+        assert report.worktree_bytes > 0 and report.gitdir_bytes > 0
+        assert report.total_bytes == report.worktree_bytes + report.gitdir_bytes
+    assert sparse.worktree_bytes < full.worktree_bytes
+    assert sparse.gitdir_bytes < full.gitdir_bytes
+
+    submodules.echo_provision_report(sparse)
+    output = capsys.readouterr().out
+    assert "Submodule provisioned in" in output
+    assert submodules.format_size(sparse.total_bytes) in output
+
+
+def assert_unlocked(lock: Path) -> None:
+    with open(lock) as f:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def test_lock_of_dead_process_is_free(tmp_path):
+    """Two waiters on a lock file left by a dead process take it in turn."""
+    lock = tmp_path / "ies-core.git.lock"
+    exited = subprocess.Popen(["true"])
+    exited.wait()
+    lock.write_text(str(exited.pid))
+    holders, overlaps = [], []
+
+    async def waiter(name):
+        fd = await submodules._acquire_lock(lock, timeout=5)
+        try:
+            if holders:
+                overlaps.append(name)
+            holders.append(name)
+            await asyncio.sleep(0.2)
+            holders.remove(name)
+        finally:
+            submodules._release_lock(fd)
+
+    async def both():
+        await asyncio.gather(waiter("a"), waiter("b"))
+
+    asyncio.run(both())
+    assert not overlaps
+    assert lock.read_text() == str(os.getpid())
+    assert_unlocked(lock)
+
+
+def test_held_lock_is_waited_for(tmp_path):
+    lock = tmp_path / "ies-core.git.lock"
+    holder = subprocess.Popen(
+        [sys.executable, "-c",
+         "import fcntl, sys, time; f = open(sys.argv[1], 'w'); fcntl.flock(f, fcntl.LOCK_EX); "
+         "print('locked', flush=True); time.sleep(60)", str(lock)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        assert holder.stdout.readline().strip() == "locked"
+        with pytest.raises(click.ClickException):
+            asyncio.run(submodules._acquire_lock(lock, timeout=0.1))
+    finally:
+        # Killing the holder releases its lock
+        holder.kill()
+        holder.wait()
+        holder.stdout.close()
+    submodules._release_lock(asyncio.run(submodules._acquire_lock(lock, timeout=5)))
@@ -0,0 +1,57 @@
+"""Lazy loading of the ies-build and gh-tools subcommands."""
+
+import importlib
+import sys
+
+import click
+import pytest
+from click.testing import CliRunner
+
+cli = importlib.import_module("ies-tools.src.cli")
+
+CLIS = ["ies-tools.src.build.build", "ies-tools.src.github-tools.github"]
+
+
+def lazy_modules(group):
+    return {f"{group.package}.{path.split(':')[0]}" for path, _ in group.lazy_subcommands.values()}
+
+
+@pytest.fixture(params=CLIS)
+def group(request, monkeypatch):
+    """A CLI group with none of its lazy subcommand modules imported yet."""
+    group = importlib.import_module(request.param).cli
+    for name in lazy_modules(group):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    # Commands loaded by an earlier invocation are cached on the group
+    monkeypatch.setattr(group, "commands", {
+        name: command for name, command in group.commands.items() if name not in group.lazy_subcommands})
+    return group
+
+
+def test_help_lists_lazy_commands_without_importing_them(group):
+    result = CliRunner().invoke(group, ["--help"])
+    assert result.exit_code == 0, result.output
+    for name, (_, short_help) in group.lazy_subcommands.items():
+        assert name in result.output
+        assert short_help[:30] in " ".join(result.output.split())
+    assert not lazy_modules(group) & set(sys.modules)
+
+
+def test_subcommand_is_imported_when_invoked(group):
+    name, (import_path, _) = sorted(group.lazy_subcommands.items())[0]
+    module = f"{group.package}.{import_path.split(':')[0]}"
+    result = CliRunner().invoke(group, [name, "--help"])
+    assert result.exit_code == 0, result.output
+    assert module in sys.modules
+    assert lazy_modules(group) & set(sys.modules) == {module}
+
+
+def test_lazy_import_paths_resolve(group):
+    for name in group.lazy_subcommands:
+        assert isinstance(group.get_command(click.Context(group), name), click.Command), name
+
+
+def test_import_path_must_name_a_command():
+    group = cli.LazyGroup(lazy_subcommands={"bad": ("ies-tools.src.cli:LazyGroup", "Not a command")})
+    with pytest.raises(click.ClickException, match="is not a click command"):
+        group.get_command(click.Context(group), "bad")
@@ -0,0 +1,108 @@
+"""Content negotiation and result caching of the SPARQL endpoint."""
+
+import http.client
+import importlib
+import threading
+from http import HTTPStatus
+from urllib.parse import quote
+
+import pytest
+
+endpoint = importlib.import_module("ies-tools.src.build.endpoint")
+workspace = importlib.import_module("ies-tools.src.build.workspace")
+
+DATA = """@prefix ex: <http://example.org/ex#> .
+ex:a ex:tag "tag #1" .
+ex:b ex:tag "tag #2" .
+"""
+
+
+@pytest.fixture
+def sparql(tmp_path):
+    data = tmp_path / "data.ttl"
+    data.write_text(DATA)
+    ws = workspace.Workspace(tmp_path, sources=[data])
+    ws.refresh()
+    return endpoint.SparqlEndpoint(ws, reload_interval=None)
+
+
+def test_cache_is_keyed_on_negotiated_media_type(sparql):
+    query = "SELECT ?s WHERE { ?s ?p ?o }"
+    first = sparql.execute(query, "application/sparql-results+json")
+    second = sparql.execute(query, "application/sparql-results+json, text/csv;q=0.5")
+    assert second == first
+    assert sparql.workspace.cache.hits == 1
+
+    csv = sparql.execute(query, "text/csv")
+    assert csv[1].startswith("text/csv")
+    assert sparql.workspace.cache.hits == 1
+
+
+def test_not_acceptable_for_query_form(sparql):
+    status, _, _ = sparql.execute("SELECT ?s WHERE { ?s ?p ?o }", "text/turtle")
+    assert status == HTTPStatus.NOT_ACCEPTABLE
+    status, content_type, _ = sparql.execute("CONSTRUCT WHERE { ?s ?p ?o }", "text/turtle")
+    assert status == HTTPStatus.OK and content_type.startswith("text/turtle")
+
+
+def test_literals_with_hash_are_cached_apart(sparql):
+    template = 'SELECT ?s WHERE {{ ?s ?p "tag #{}" }}'
+    first = sparql.execute(template.format(1), "text/csv")
+    second = sparql.execute(template.format(2), "text/csv")
+    assert b"example.org/ex#a" in first[2] and b"example.org/ex#b" in second[2]
+
+
+@pytest.fixture
+def serve(sparql):
+    """Start the endpoint on a free port; returns a function making one HTTP request."""
+    servers = []
+
+    def start(cors_origin=None):
+        sparql.cors_origin = cors_origin
+        server = endpoint.PooledHTTPServer(("127.0.0.1", 0), sparql, workers=2)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+        def request(method, path, body=None, headers=None):
+            connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+            connection.putrequest(method, path)
+            for name, value in (headers or {}).items():
+                connection.putheader(name, value)
+            connection.endheaders(body)
+            response = connection.getresponse()
+            response.read()
+            connection.close()
+            return response
+        return request
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+QUERY_PATH = "/sparql?query=" + quote("ASK { ?s ?p ?o }")
+
+
+def test_no_cors_header_by_default(serve):
+    response = serve()("GET", QUERY_PATH)
+    assert response.status == HTTPStatus.OK
+    assert response.getheader("Access-Control-Allow-Origin") is None
+
+
+def test_cors_origin(serve):
+    response = serve("http://localhost:8080")("GET", QUERY_PATH)
+    assert response.getheader("Access-Control-Allow-Origin") == "http://localhost:8080"
+
+
+@pytest.mark.parametrize("length, body", [
+    ("abc", b"ASK {}"),
+    ("-1", b""),
+    (None, "ASK { ?s ?p 'é' }".encode("latin-1")),
+])
+def test_malformed_post_is_bad_request(serve, length, body):
+    request = serve()
+    headers = {"Content-Type": "application/sparql-query", "Content-Length": length or str(len(body))}
+    assert request("POST", "/sparql", body, headers).status == HTTPStatus.BAD_REQUEST
+    # The endpoint keeps answering
+    assert request("GET", QUERY_PATH).status == HTTPStatus.OK
@@ -0,0 +1,129 @@
+"""Running gh-tools operations across a fleet of repositories."""
+
+import asyncio
+import importlib
+import subprocess
+from pathlib import Path
+
+import click
+import pytest
+
+fleet = importlib.import_module("ies-tools.src.github-tools.fleet")
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.org",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.org",
+}
+
+
+def git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.mark.parametrize("spec, is_url, slug", [
+    ("Acme-Ontologies/ies-core", False, "Acme-Ontologies__ies-core"),
+    ("https://github.com/Acme-Ontologies/ies-core.git", True, "Acme-Ontologies__ies-core"),
+    ("git@github.com:Acme-Ontologies/ies-core.git", True, "Acme-Ontologies__ies-core"),
+    ("/srv/git/ies-core/", True, "git__ies-core"),
+    ("./ies-core", True, ".__ies-core"),
+])
+def test_repo_target(spec, is_url, slug):
+    target = fleet.RepoTarget(spec)
+    assert (target.is_url, target.slug) == (is_url, slug)
+
+
+def test_read_repos_file(tmp_path):
+    repos = tmp_path / "repos.txt"
+    repos.write_text("# The fleet\nAcme-Ontologies/ies-core\n\n  https://example.org/a/b.git  # mirror\n")
+    targets = fleet.read_repos_file(repos)
+    assert [t.spec for t in targets] == ["Acme-Ontologies/ies-core", "https://example.org/a/b.git"]
+    repos.write_text("# nothing yet\n")
+    with pytest.raises(click.ClickException):
+        fleet.read_repos_file(repos)
+
+
+@pytest.mark.parametrize("operation, code, output, status, summary", [
+    (fleet.op_setup_repo, 0, "Working...\n🎉 Repository setup complete!\n", fleet.FleetStatus.OK,
+     "🎉 Repository setup complete!"),
+    (fleet.op_setup_repo, 1, "❌ Error: no develop branch\nAborted!\n", fleet.FleetStatus.FAILED,
+     "❌ Error: no develop branch"),
+    (fleet.op_sync, 2, "", fleet.FleetStatus.FAILED, ""),
+    (fleet.op_sync_tools, 0, "🔄 /repo: 1 added, 0 modified, 0 deleted\n  ✨ Added: justfile\n"
+     "✨ Tools synced\n", fleet.FleetStatus.OK, "🔄 /repo: 1 added, 0 modified, 0 deleted"),
+    (fleet.op_sync_tools, 0, "✓ /repo: in sync\n", fleet.FleetStatus.OK, "✓ /repo: in sync"),
+    (fleet.op_sync_tools, 1, "❌ Error: Failed to update template cache\nAborted!\n", fleet.FleetStatus.FAILED,
+     "❌ Error: Failed to update template cache"),
+])
+def test_status_from_exit_code(operation, code, output, status, summary, tmp_path, monkeypatch):
+    async def run_gh_tools(repo_dir, args):
+        return code, output
+
+    monkeypatch.setattr(fleet, "run_gh_tools", run_gh_tools)
+    result = asyncio.run(operation(fleet.RepoTarget("owner/name"), tmp_path, []))
+    assert (result.status, result.summary) == (status, summary)
+
+
+@pytest.fixture
+def remote(tmp_path, monkeypatch):
+    """A local repository with main, develop and rc branches."""
+    for name, value in GIT_ENV.items():
+        monkeypatch.setenv(name, value)
+    repo = tmp_path / "remote" / "ies-core"
+    repo.mkdir(parents=True)
+    git(repo, "init", "--quiet", "--initial-branch", "main")
+    git(repo, "commit", "--quiet", "--allow-empty", "-m", "Initial")
+    git(repo, "branch", "develop")
+    git(repo, "commit", "--quiet", "--allow-empty", "-m", "On main")
+    git(repo, "branch", "rc")
+    return repo
+
+
+def test_ensure_clone(remote, tmp_path):
+    workdir = tmp_path / "fleet"
+    workdir.mkdir()
+    target = fleet.RepoTarget(str(remote))
+    repo_dir = asyncio.run(fleet.ensure_clone(target, workdir))
+    assert repo_dir == workdir / "remote__ies-core"
+    assert git(repo_dir, "log", "--format=%s").split("\n")[0] == "On main"
+
+    # A second run fetches into the existing clone
+    git(remote, "commit", "--quiet", "--allow-empty", "-m", "Later")
+    asyncio.run(fleet.ensure_clone(target, workdir))
+    assert git(repo_dir, "log", "--format=%s", "origin/main").split("\n")[0] == "Later"
+    assert [p.name for p in workdir.iterdir()] == ["remote__ies-core"]
+
+
+def test_failed_clone_leaves_nothing_behind(tmp_path):
+    workdir = tmp_path / "fleet"
+    workdir.mkdir()
+    target = fleet.RepoTarget(str(tmp_path / "missing" / "repo"))
+    with pytest.raises(subprocess.CalledProcessError):
+        asyncio.run(fleet.ensure_clone(target, workdir))
+    assert list(workdir.iterdir()) == []
+
+
+def test_interrupted_clone_leaves_nothing_behind(remote, tmp_path, monkeypatch):
+    workdir = tmp_path / "fleet"
+    workdir.mkdir()
+
+    async def run_process(args, **kwargs):
+        # Part of the clone is written before it is cancelled
+        (Path(args[-1]) / ".git").mkdir()
+        raise asyncio.TimeoutError()
+
+    monkeypatch.setattr(fleet, "run_process", run_process)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(fleet.ensure_clone(fleet.RepoTarget(str(remote)), workdir))
+    assert list(workdir.iterdir()) == []
+
+
+def test_run_fleet(remote, tmp_path):
+    targets = [fleet.RepoTarget(str(remote)), fleet.RepoTarget(str(tmp_path / "missing" / "repo"))]
+    results = asyncio.run(fleet.run_fleet("branch-status", targets, workdir=tmp_path / "fleet", jobs=2))
+    ok, failed = results
+    assert (ok.status, ok.summary) == (fleet.FleetStatus.OK, "develop +0/-1, rc +0/-0")
+    assert ok.details["branches"] == {"main": True, "develop": True, "rc": True}
+    assert failed.status == fleet.FleetStatus.FAILED
+    assert not (tmp_path / "fleet" / "missing__repo").exists()
@@ -0,0 +1,111 @@
+"""Ontology metrics across the git history."""
+
+import importlib
+import subprocess
+
+import pytest
+
+history = importlib.import_module("ies-tools.src.build.history")
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.org",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.org",
+}
+PREFIXES = """@prefix ex: <http://example.org/ex#> .
+@prefix imp: <http://example.org/imp#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix skos: <http://www.w3.org/2004/02/skos/core#> .
+"""
+ONTOLOGY = PREFIXES + """<http://example.org/ex> a owl:Ontology ; owl:imports <http://example.org/imp> .
+ex:A a owl:Class ; rdfs:label "A" ; skos:definition "An A." ; rdfs:subClassOf imp:B .
+ex:p a owl:ObjectProperty ; rdfs:label "p" .
+"""
+IMPORTED = PREFIXES + """imp:B a owl:Class ; rdfs:label "B" ; rdfs:subClassOf imp:Top .
+imp:Top a owl:Class ; rdfs:label "Top" .
+"""
+CATALOG = """<?xml version="1.0" encoding="UTF-8"?>
+<catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">
+    <uri name="http://example.org/imp" uri="file://${PROJECT_ROOT}/imports/imp.ttl"/>
+</catalog>
+"""
+
+
+def git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    for name, value in GIT_ENV.items():
+        monkeypatch.setenv(name, value)
+    repo = tmp_path / "project"
+    (repo / "src" / "ontology").mkdir(parents=True)
+    (repo / "imports").mkdir()
+    git(repo, "init", "--quiet", "--initial-branch", "main")
+
+    def commit(message, **files):
+        for name, text in files.items():
+            (repo / name).write_text(text)
+        git(repo, "add", "-A")
+        git(repo, "commit", "--quiet", "-m", message)
+
+    commit("Initial", **{"src/ontology/ontology.ttl": ONTOLOGY, "imports/imp.ttl": IMPORTED,
+                         "catalog.xml": CATALOG})
+    commit("Add C", **{"src/ontology/ontology.ttl": ONTOLOGY + "ex:C a owl:Class ; rdfs:subClassOf ex:A .\n"})
+    commit("README only", **{"README.md": "Docs\n"})
+    commit("Break the catalog", **{"catalog.xml": CATALOG[:60]})
+    return repo
+
+
+def test_summarise():
+    summary = history.summarise(ONTOLOGY.encode(), "turtle")
+    assert summary["terms"] == {"http://example.org/ex#A": "class", "http://example.org/ex#p": "object_property"}
+    assert summary["labelled"] == ["http://example.org/ex#A", "http://example.org/ex#p"]
+    assert summary["defined"] == ["http://example.org/ex#A"]
+    assert summary["subclass"] == [["http://example.org/ex#A", "http://example.org/imp#B"]]
+    assert summary["imports"] == ["http://example.org/imp"]
+    assert "error" in history.summarise(b"ex:A a", "turtle")
+
+
+def test_hierarchy_depth():
+    parents = {"c": {"b"}, "b": {"a"}, "d": {"a", "c"}}
+    assert history.hierarchy_depth(["a", "b", "c", "d"], parents) == 3
+    assert history.hierarchy_depth([], parents) == 0
+
+
+def test_hierarchy_depth_with_cycle():
+    parents = {"a": {"b"}, "b": {"c"}, "c": {"a"}, "d": {"a"}}
+    assert history.hierarchy_depth(["d"], parents) == 3
+    assert history.hierarchy_depth(["a", "b", "c"], parents) <= 2
+
+
+def test_imports_closure(project, tmp_path):
+    revisions = history.list_revisions(project, history.commits(project, "HEAD"), jobs=1)
+    cache = history.BlobCache(tmp_path / "blobs")
+    closures, parsed = history.imports_closure(revisions[:1], cache, history.ImportResolver(project), jobs=1)
+    assert parsed == 2
+    assert closures[0]["http://example.org/imp"] == revisions[0].blobs["imports/imp.ttl"]
+
+
+def test_ontology_history(project, tmp_path):
+    metrics, parsed = history.ontology_history(project, cache_dir=tmp_path / "blobs", jobs=1)
+    assert [m.subject for m in metrics] == ["Initial", "Add C", "README only", "Break the catalog"]
+    # Two ontology versions and the imported file
+    assert parsed == 3
+    first, added, unchanged, broken = metrics
+    assert (first.classes, first.properties, first.missing_definitions) == (1, 1, 1)
+    assert (first.imports, first.unresolved_imports, first.hierarchy_depth) == (1, 0, 2)
+    assert first.import_triples == 5 and first.parse_errors == 0
+    assert (added.classes, added.hierarchy_depth, added.missing_labels) == (2, 3, 1)
+    assert unchanged.classes == added.classes
+
+    # The malformed catalog is read as empty rather than failing the run
+    assert broken.parse_errors == 1
+    assert (broken.imports, broken.unresolved_imports, broken.import_triples) == (1, 1, 0)
+
+    rerun, parsed = history.ontology_history(project, cache_dir=tmp_path / "blobs", jobs=1)
+    assert parsed == 0
+    assert rerun == metrics
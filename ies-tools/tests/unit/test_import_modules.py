@@ -0,0 +1,164 @@
+"""Locality-based modules of the imports."""
+
+import importlib
+
+import pytest
+from rdflib import BNode, Graph, URIRef
+
+import_modules = importlib.import_module("ies-tools.src.build.import_modules")
+workspace = importlib.import_module("ies-tools.src.build.workspace")
+
+IMP = "http://example.org/imp#"
+PREFIXES = """@prefix ex: <http://example.org/ex#> .
+@prefix imp: <http://example.org/imp#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+"""
+IMPORTED = PREFIXES + """<http://example.org/imp> a owl:Ontology .
+imp:Top a owl:Class ; rdfs:label "Top" .
+imp:B a owl:Class ; rdfs:label "B" ;
+    rdfs:subClassOf imp:Top , [ a owl:Restriction ; owl:onProperty imp:p ; owl:someValuesFrom imp:C ] .
+imp:p a owl:ObjectProperty ; rdfs:domain imp:Top .
+imp:C a owl:Class .
+imp:Sub a owl:Class ; rdfs:subClassOf imp:B .
+imp:Unused a owl:Class ; rdfs:label "Unused" ; rdfs:subClassOf imp:Other .
+[] a owl:AllDisjointClasses ; owl:members ( imp:Top imp:Other ) .
+"""
+ONTOLOGY = PREFIXES + """<http://example.org/ex> a owl:Ontology ; owl:imports <http://example.org/imp> .
+ex:A a owl:Class ; rdfs:subClassOf imp:B .
+"""
+CATALOG = """<?xml version="1.0" encoding="UTF-8"?>
+<catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">
+    <uri name="http://example.org/imp" uri="file://${PROJECT_ROOT}/imports/imp.ttl"/>
+</catalog>
+"""
+
+
+def parse(text):
+    return Graph().parse(data=PREFIXES + text, format="turtle")
+
+
+def imp(name):
+    return URIRef(IMP + name)
+
+
+def test_axioms_grouping():
+    graph = Graph().parse(data=IMPORTED, format="turtle")
+    by_kind = {}
+    for axiom in import_modules.axioms(graph):
+        by_kind.setdefault(axiom.kind, []).append(axiom)
+    # The ontology header is skipped
+    assert all(axiom.subject != URIRef("http://example.org/imp") for axiom in sum(by_kind.values(), []))
+    assert len(by_kind["declaration"]) == 6
+    assert len(by_kind["annotation"]) == 3
+    assert len(by_kind["domain"]) == 1
+    assert len(by_kind["disjoint"]) == 1
+    assert by_kind["disjoint"][0].args == (imp("Top"), imp("Other"))
+
+    # The restriction is one axiom together with its blank node
+    restriction = next(a for a in by_kind["subclass"] if isinstance(a.args[1], BNode))
+    assert len(restriction.triples) == 4
+    assert restriction.signature == {imp("B"), imp("p"), imp("C")}
+    assert len(by_kind["subclass"]) == 4
+
+
+def restriction(graph):
+    return next(graph.subjects(URIRef(import_modules.OWL + "onProperty"), None))
+
+
+@pytest.mark.parametrize("text, signature, mode, expected", [
+    ("[] owl:onProperty imp:p ; owl:someValuesFrom imp:C .", {"p", "C"}, "bottom", None),
+    ("[] owl:onProperty imp:p ; owl:someValuesFrom imp:C .", {"C"}, "bottom", "bottom"),
+    ("[] owl:onProperty imp:p ; owl:someValuesFrom imp:C .", {"C"}, "top", None),
+    ("[] owl:onProperty imp:p ; owl:someValuesFrom imp:C .", set(), "top", "top"),
+    ("[] owl:onProperty imp:p ; owl:allValuesFrom imp:C .", {"C"}, "bottom", "top"),
+    ("[] owl:onProperty imp:p ; owl:minCardinality 0 .", {"p"}, "bottom", "top"),
+    ("[] owl:onProperty imp:p ; owl:minCardinality 2 .", set(), "bottom", "bottom"),
+    ("[] owl:onProperty imp:p ; owl:minCardinality 2 .", {"p"}, "bottom", None),
+    ("[] owl:onProperty imp:p ; owl:maxCardinality 1 .", set(), "bottom", "top"),
+    ("[] owl:onProperty imp:p ; owl:maxCardinality 1 .", {"p"}, "bottom", None),
+    ("[] owl:onProperty imp:p ; owl:cardinality 0 .", set(), "bottom", "top"),
+    ("[] owl:onProperty imp:p ; owl:qualifiedCardinality 2 ; owl:onClass imp:C .", {"p"}, "bottom", "bottom"),
+    ("[] owl:onProperty imp:p ; owl:hasValue imp:x .", set(), "top", "top"),
+])
+def test_restriction_locality(text, signature, mode, expected):
+    graph = parse(text)
+    locality = import_modules.Locality(graph, mode, {imp(name) for name in signature})
+    assert locality.cls(restriction(graph)) == expected
+
+
+def test_boolean_class_expressions():
+    graph = parse("""imp:X owl:equivalentClass [ owl:intersectionOf ( imp:A imp:B ) ] .
+imp:Y owl:equivalentClass [ owl:unionOf ( imp:A imp:B ) ] .
+imp:Z owl:equivalentClass [ owl:complementOf imp:A ] .""")
+
+    def expression(name):
+        return graph.value(imp(name), URIRef(import_modules.OWL + "equivalentClass"))
+
+    bottom = import_modules.Locality(graph, "bottom", {imp("A")})
+    assert bottom.cls(expression("X")) == "bottom"
+    assert bottom.cls(expression("Y")) is None
+    assert bottom.cls(expression("Z")) is None
+    top = import_modules.Locality(graph, "top", set())
+    assert top.cls(expression("X")) == "top"
+    assert top.cls(expression("Y")) == "top"
+    assert top.cls(expression("Z")) == "bottom"
+
+
+def test_is_local():
+    graph = Graph().parse(data=IMPORTED, format="turtle")
+    axioms = {(a.kind, a.args): a for a in import_modules.axioms(graph)}
+    subclass = axioms[("subclass", (imp("B"), imp("Top")))]
+    domain = axioms[("domain", (imp("p"), imp("Top")))]
+
+    outside = import_modules.Locality(graph, "bottom", set())
+    assert outside.is_local(subclass) and outside.is_local(domain)
+    inside = import_modules.Locality(graph, "bottom", {imp("B"), imp("p")})
+    assert not inside.is_local(subclass) and not inside.is_local(domain)
+    top = import_modules.Locality(graph, "top", {imp("B")})
+    assert top.is_local(subclass)
+
+
+def test_extract():
+    graph = Graph().parse(data=IMPORTED, format="turtle")
+    logical = [a for a in import_modules.axioms(graph) if a.kind not in ("declaration", "annotation")]
+    module = [logical[i] for i in import_modules.extract(graph, logical, {imp("B")}, "bottom")]
+    signature = set().union(*(a.signature for a in module))
+    # Everything above B, and what that pulls in, but nothing below or beside it
+    assert {imp("B"), imp("Top"), imp("p"), imp("C")} <= signature
+    assert imp("Sub") not in signature and imp("Unused") not in signature
+    assert import_modules.extract(graph, logical, set(), "bottom") == set()
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "src" / "ontology").mkdir(parents=True)
+    (tmp_path / "src" / "ontology" / "ontology.ttl").write_text(ONTOLOGY)
+    (tmp_path / "imports").mkdir()
+    (tmp_path / "imports" / "imp.ttl").write_text(IMPORTED)
+    (tmp_path / "catalog.xml").write_text(CATALOG)
+    return tmp_path
+
+
+def test_extract_modules(project):
+    reports = import_modules.extract_modules(project)
+    assert [(r.iri, r.source, r.module) for r in reports] == [
+        ("http://example.org/imp", "imports/imp.ttl", "build/imports/imp.ttl")]
+    assert reports[0].module_triples < reports[0].source_triples
+
+    module = Graph().parse(project / "build" / "imports" / "imp.ttl")
+    subclass_of = URIRef(import_modules.RDFS_SUBCLASSOF)
+    assert (imp("B"), subclass_of, imp("Top")) in module
+    assert any(isinstance(o, BNode) for o in module.objects(imp("B"), subclass_of))
+    assert (imp("Top"), URIRef(import_modules.RDFS + "label"), None) in module
+    assert (imp("Unused"), None, None) not in module and (imp("Sub"), None, None) not in module
+
+    modules = workspace.read_catalog(project, import_modules.MODULE_CATALOG)
+    assert modules["http://example.org/imp"] == project / "build" / "imports" / "imp.ttl"
+
+
+def test_star_module_is_smaller(project):
+    bottom = import_modules.extract_modules(project)[0].module_triples
+    star = import_modules.extract_modules(project, "star")[0].module_triples
+    assert star < bottom
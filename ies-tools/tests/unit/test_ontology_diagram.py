@@ -0,0 +1,71 @@
+"""Generating the ontology overview diagram."""
+
+import importlib
+
+import click
+import pytest
+
+ontology_diagram = importlib.import_module("ies-tools.src.build.ontology_diagram")
+
+EX = "http://example.org/ex#"
+PREFIXES = """@prefix ex: <http://example.org/ex#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+"""
+
+
+@pytest.fixture
+def ontology(tmp_path):
+    """One namespace: a tree of seven classes, a tree of two and a subclass cycle."""
+    lines = [PREFIXES, "ex:A a owl:Class . ex:B a owl:Class . ex:B1 a owl:Class ; rdfs:subClassOf ex:B ."]
+    lines += [f"ex:A{i} a owl:Class ; rdfs:subClassOf ex:{'A' if i < 3 else 'A0'} ." for i in range(6)]
+    lines.append("ex:C a owl:Class ; rdfs:subClassOf ex:D . ex:D a owl:Class ; rdfs:subClassOf ex:C .")
+    path = tmp_path / "ontology.ttl"
+    path.write_text("\n".join(lines))
+    return path
+
+
+def names(group):
+    return sorted(iri[len(EX):] for iri in group)
+
+
+def test_oversized_namespace_is_split_by_subtree(ontology):
+    model = ontology_diagram.extract_model(ontology_diagram.load_graph([ontology]))
+    groups = ontology_diagram.partition_namespace(model, EX, 4)
+    assert all(len(group) <= 4 for group in groups)
+    assert sorted(iri for group in groups for iri in group) == sorted(model.nodes)
+    # A's subtree is too big, so it is split below A; A0's subtree is kept whole
+    assert ["A0", "A3", "A4", "A5"] in [names(group) for group in groups]
+    assert ["C", "D"] in [names(group) for group in groups]
+
+
+def test_split_views(ontology, tmp_path):
+    output = tmp_path / "overview.dot"
+    written = ontology_diagram.OntologyDiagramGenerator([ontology], output, split_threshold=4).generate()
+    assert written[0] == output
+    assert [path.name for path in written[1:]] == [f"overview-ex-{i}.dot" for i in range(1, 5)]
+    assert "overview-ex-4.dot" in output.read_text()
+
+
+def test_hand_written_output_is_kept(ontology, tmp_path):
+    output = tmp_path / "overview.dot"
+    output.write_text("digraph ontology {}\n")
+    with pytest.raises(click.ClickException):
+        ontology_diagram.OntologyDiagramGenerator([ontology], output).generate()
+    assert output.read_text() == "digraph ontology {}\n"
+    assert ontology_diagram.OntologyDiagramGenerator([ontology], output).generate(force=True) == [output]
+
+
+def test_empty_ontology_writes_nothing(tmp_path):
+    empty = tmp_path / "empty.ttl"
+    empty.write_text(PREFIXES)
+    output = tmp_path / "overview.dot"
+    with pytest.raises(click.ClickException):
+        ontology_diagram.OntologyDiagramGenerator([empty], output).generate()
+    assert not output.exists()
+
+
+def test_overview_layout_uses_split_threshold(ontology):
+    model = ontology_diagram.extract_model(ontology_diagram.load_graph([ontology]))
+    assert "layout=sfdp;" in ontology_diagram.render_overview(model, "hash", {}, 0)
+    assert "rankdir=BT;" in ontology_diagram.render_overview(model, "hash", {}, 4)
@@ -0,0 +1,127 @@
+"""Incremental RDFS and OWL 2 RL materialisation."""
+
+import importlib
+import random
+
+import pytest
+from rdflib import Graph, URIRef
+
+reasoner = importlib.import_module("ies-tools.src.build.reasoner")
+reasoner_benchmark = importlib.import_module("ies-tools.src.build.reasoner_benchmark")
+
+EX = "http://example.org/ex#"
+PREFIXES = """@prefix ex: <http://example.org/ex#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+"""
+# Every rule fires at least once, several triples have more than one derivation
+ONTOLOGY = """ex:Dog rdfs:subClassOf ex:Mammal . ex:Mammal rdfs:subClassOf ex:Animal .
+ex:Hound owl:equivalentClass ex:Dog .
+ex:owns rdfs:domain ex:Person ; rdfs:range ex:Animal ; owl:inverseOf ex:ownedBy .
+ex:keeps rdfs:subPropertyOf ex:owns . ex:looksAfter owl:equivalentProperty ex:keeps .
+ex:Person rdfs:subClassOf ex:Agent .
+ex:knows a owl:SymmetricProperty . ex:partOf a owl:TransitiveProperty .
+ex:alice ex:looksAfter ex:rex ; ex:knows ex:bob . ex:rex a ex:Hound .
+ex:tail ex:partOf ex:rex . ex:tip ex:partOf ex:tail . ex:bob ex:owns ex:rex .
+"""
+
+
+def ex(name):
+    return URIRef(EX + name)
+
+
+def parse(text):
+    return list(Graph().parse(data=PREFIXES + text, format="turtle"))
+
+
+def materialise(triples):
+    result = reasoner.Reasoner()
+    result.add(triples)
+    return result
+
+
+def decoded(result):
+    decode = result.dictionary.decode_triple
+    return {decode(t) for t in result.store}
+
+
+@pytest.mark.parametrize("rule, text, expected", [
+    ("rdfs2 prp-dom", "ex:p rdfs:domain ex:C . ex:x ex:p ex:y .", "ex:x a ex:C ."),
+    ("rdfs3 prp-rng", "ex:p rdfs:range ex:C . ex:x ex:p ex:y .", "ex:y a ex:C ."),
+    ("rdfs5 scm-spo", "ex:p rdfs:subPropertyOf ex:q . ex:q rdfs:subPropertyOf ex:r .",
+     "ex:p rdfs:subPropertyOf ex:r ."),
+    ("rdfs7 prp-spo1", "ex:p rdfs:subPropertyOf ex:q . ex:x ex:p ex:y .", "ex:x ex:q ex:y ."),
+    ("rdfs9 cax-sco", "ex:C rdfs:subClassOf ex:D . ex:x a ex:C .", "ex:x a ex:D ."),
+    ("rdfs11 scm-sco", "ex:C rdfs:subClassOf ex:D . ex:D rdfs:subClassOf ex:E .", "ex:C rdfs:subClassOf ex:E ."),
+    ("scm-dom1", "ex:p rdfs:domain ex:C . ex:C rdfs:subClassOf ex:D .", "ex:p rdfs:domain ex:D ."),
+    ("scm-dom2", "ex:p rdfs:subPropertyOf ex:q . ex:q rdfs:domain ex:C .", "ex:p rdfs:domain ex:C ."),
+    ("scm-rng1", "ex:p rdfs:range ex:C . ex:C rdfs:subClassOf ex:D .", "ex:p rdfs:range ex:D ."),
+    ("scm-rng2", "ex:p rdfs:subPropertyOf ex:q . ex:q rdfs:range ex:C .", "ex:p rdfs:range ex:C ."),
+    ("scm-eqc1", "ex:C owl:equivalentClass ex:D .", "ex:C rdfs:subClassOf ex:D . ex:D rdfs:subClassOf ex:C ."),
+    ("scm-eqp1", "ex:p owl:equivalentProperty ex:q .",
+     "ex:p rdfs:subPropertyOf ex:q . ex:q rdfs:subPropertyOf ex:p ."),
+    ("prp-inv1", "ex:p owl:inverseOf ex:q . ex:x ex:p ex:y .", "ex:y ex:q ex:x ."),
+    ("prp-inv2", "ex:p owl:inverseOf ex:q . ex:x ex:q ex:y .", "ex:y ex:p ex:x ."),
+    ("prp-symp", "ex:p a owl:SymmetricProperty . ex:x ex:p ex:y .", "ex:y ex:p ex:x ."),
+    ("prp-trp", "ex:p a owl:TransitiveProperty . ex:x ex:p ex:y . ex:y ex:p ex:z .", "ex:x ex:p ex:z ."),
+])
+def test_rule(rule, text, expected):
+    for order in (1, -1):
+        # Premises arriving in either order
+        result = materialise(parse(text)[::order])
+        assert set(parse(expected)) <= decoded(result), rule
+
+
+def test_literals_are_not_typed():
+    result = materialise(parse('ex:p rdfs:range ex:C . ex:x ex:p "text" .'))
+    assert result.inferred_count == 0
+
+
+def test_remove_keeps_what_is_still_entailed():
+    result = materialise(parse(ONTOLOGY))
+    # rex is an Animal through the range of owns and through the class hierarchy
+    owns = (ex("bob"), ex("owns"), ex("rex"))
+    result.remove([owns])
+    assert (ex("rex"), URIRef(reasoner.RDF_TYPE), ex("Animal")) in decoded(result)
+    # alice still owns rex through looksAfter, so ownedBy survives too
+    assert (ex("rex"), ex("ownedBy"), ex("alice")) in decoded(result)
+    assert (ex("rex"), ex("ownedBy"), ex("bob")) not in decoded(result)
+    assert not result.remove([owns])
+
+
+def test_every_single_change_matches_recomputation():
+    triples = parse(ONTOLOGY)
+    full = decoded(materialise(triples))
+    for triple in triples:
+        rest = [t for t in triples if t != triple]
+        result = materialise(triples)
+        result.remove([triple])
+        assert decoded(result) == decoded(materialise(rest)), triple
+        result.add([triple])
+        assert decoded(result) == full, triple
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_batches_match_recomputation(seed):
+    triples = reasoner_benchmark.synthetic_graph(1000, seed)
+    triples += parse(ONTOLOGY)
+    rng = random.Random(seed)
+    held = rng.sample(triples, 50)
+    base = [t for t in triples if t not in held]
+
+    result = materialise(base)
+    result.add(held)
+    assert decoded(result) == decoded(materialise(triples))
+    result.remove(held)
+    assert decoded(result) == decoded(materialise(base))
+    assert {result.dictionary.decode_triple(t) for t in result.explicit} == set(base)
+
+
+def test_replace():
+    old = parse("ex:C rdfs:subClassOf ex:D . ex:x a ex:C .")
+    new = parse("ex:C rdfs:subClassOf ex:E . ex:x a ex:C .")
+    result = materialise(old)
+    result.replace(old, new)
+    assert decoded(result) == decoded(materialise(new))
+    assert result.stats() == {"explicit": 2, "inferred": 1, "total": 3, "terms": len(result.dictionary)}
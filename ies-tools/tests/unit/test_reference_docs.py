@@ -0,0 +1,54 @@
+"""Incremental builds of the HTML term reference."""
+
+import importlib
+
+import pytest
+
+reference_docs = importlib.import_module("ies-tools.src.build.reference_docs")
+
+ONTOLOGY = """@prefix ex: <http://example.org/ex#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+ex:Kept a owl:Class ; rdfs:label "Kept" .
+"""
+
+
+@pytest.mark.parametrize("force", [False, True])
+def test_pages_of_deleted_terms_are_removed(tmp_path, force):
+    ontology = tmp_path / "ontology.ttl"
+    output = tmp_path / "reference"
+    builder = reference_docs.ReferenceBuilder([ontology], output, jobs=1)
+    ontology.write_text(ONTOLOGY + 'ex:Deleted a owl:Class ; rdfs:label "Deleted" .\n')
+    builder.build()
+    pages = {path.name for path in output.glob("*.html")} - {"index.html"}
+    assert len(pages) == 2
+
+    ontology.write_text(ONTOLOGY)
+    rendered, unchanged, removed = builder.build(force=force)
+    assert removed == 1
+    assert rendered == (1 if force else 0)
+    remaining = {path.name for path in output.glob("*.html")} - {"index.html"}
+    assert len(remaining) == 1 and remaining < pages
+    assert set(builder._load_manifest()) == {str(page) for page in remaining}
+
+
+def test_page_names_are_unique(tmp_path):
+    ontology = tmp_path / "ontology.ttl"
+    ontology.write_text("""@prefix ex: <http://example.org/ex#> .
+@prefix ex_a: <http://example.org/ex_a#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+ex:a_b a owl:Class .
+ex_a:b a owl:Class .
+<http://x.org/a#b> a owl:Class .
+<http://x.org/a/b> a owl:Class .
+ex:Solo a owl:Class .
+""")
+    terms = reference_docs.collect_terms(reference_docs.load_graph([ontology]))
+    pages = {term.iri: term.page for term in terms}
+    assert len(set(pages.values())) == len(terms) == 5
+    assert pages["http://example.org/ex#Solo"] == "ex_Solo.html"
+    assert pages["http://example.org/ex#a_b"].startswith("ex_a_b-")
+
+    output = tmp_path / "reference"
+    reference_docs.ReferenceBuilder([ontology], output, jobs=1).build()
+    assert len(list(output.glob("*.html"))) == 6
@@ -0,0 +1,126 @@
+"""The asyncio step executor behind the gh-tools pipelines."""
+
+import asyncio
+import importlib
+import os
+import sys
+
+import pytest
+
+steps = importlib.import_module("ies-tools.src.github-tools.steps")
+
+Step, StepExecutor, StepStatus = steps.Step, steps.StepExecutor, steps.StepStatus
+
+
+def action(log, name, result=True, delay=0.0):
+    async def run():
+        log.append(f"{name} started")
+        await asyncio.sleep(delay)
+        log.append(f"{name} done")
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return run
+
+
+def execute(*pipeline):
+    return StepExecutor(pipeline, echo=lambda message: None).run()
+
+
+def statuses(report):
+    return {r.name: r.status for r in report.results}
+
+
+def test_dependencies_run_first():
+    log = []
+    report = execute(
+        Step("deploy", action(log, "deploy"), depends_on=("build", "test")),
+        Step("build", action(log, "build", delay=0.02)),
+        Step("test", action(log, "test", delay=0.01), depends_on=("lint",)),
+        Step("lint", action(log, "lint")),
+    )
+    assert report.ok
+    assert log.index("deploy started") > max(log.index("build done"), log.index("test done"))
+    assert log.index("test started") > log.index("lint done")
+    # Independent steps overlap
+    assert log.index("lint started") < log.index("build done")
+    assert [r.name for r in report.results][-1] == "deploy"
+
+
+@pytest.mark.parametrize("pipeline, error", [
+    ([Step("a", None, depends_on=("b",)), Step("b", None, depends_on=("c",)), Step("c", None, depends_on=("a",))],
+     "cycle"),
+    ([Step("a", None, depends_on=("a",))], "cycle"),
+    ([Step("a", None, depends_on=("missing",))], "unknown step 'missing'"),
+    ([Step("a", None), Step("a", None)], "Duplicate step name"),
+])
+def test_invalid_pipelines(pipeline, error):
+    with pytest.raises(ValueError, match=error):
+        StepExecutor(pipeline)
+
+
+def test_dependents_of_a_failure_are_skipped():
+    log = []
+    report = execute(
+        Step("fetch", action(log, "fetch", result=False)),
+        Step("raise", action(log, "raise", result=RuntimeError("boom"))),
+        Step("parse", action(log, "parse"), depends_on=("fetch",)),
+        Step("report", action(log, "report"), depends_on=("parse", "other")),
+        Step("other", action(log, "other")),
+    )
+    assert statuses(report) == {
+        "fetch": StepStatus.FAILED,
+        "raise": StepStatus.FAILED,
+        "other": StepStatus.SUCCESS,
+        "parse": StepStatus.SKIPPED,
+        "report": StepStatus.SKIPPED,
+    }
+    assert "parse started" not in log and "report started" not in log
+    results = {r.name: r for r in report.results}
+    assert results["raise"].message == "boom"
+    assert results["report"].message == "dependency failed: parse"
+    assert not report.ok and len(report.failures) == 4
+
+
+def test_step_timeout():
+    log = []
+    report = execute(
+        Step("slow", action(log, "slow", delay=5), timeout=0.05),
+        Step("after", action(log, "after"), depends_on=("slow",)),
+    )
+    assert statuses(report) == {"slow": StepStatus.TIMEOUT, "after": StepStatus.SKIPPED}
+    assert "slow done" not in log
+    assert report.wall_time < 1
+    assert "timed out" in report.results[0].message
+
+
+def test_cancelled_process_is_killed(tmp_path):
+    pid_file = tmp_path / "pid"
+    script = f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); time.sleep(60)"
+
+    async def run():
+        await steps.run_process([sys.executable, "-c", script])
+        return True
+
+    report = execute(Step("sleep", run, timeout=1))
+    assert statuses(report) == {"sleep": StepStatus.TIMEOUT}
+    pid = int(pid_file.read_text())
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+
+def test_run_process():
+    result = asyncio.run(steps.run_process([sys.executable, "-c", "print('out')"]))
+    assert (result.returncode, result.stdout) == (0, "out\n")
+    failing = [sys.executable, "-c", "import sys; sys.exit(3)"]
+    assert asyncio.run(steps.run_process(failing, check=False)).returncode == 3
+    with pytest.raises(steps.subprocess.CalledProcessError):
+        asyncio.run(steps.run_process(failing))
+
+
+def test_timing_report():
+    report = execute(Step("a", action([], "a")), Step("bb", action([], "bb"), depends_on=("a",)))
+    lines = steps.format_timing_report(report)
+    assert lines[0].split() == ["Step", "Status", "Time"]
+    assert [line.split()[:2] for line in lines[2:4]] == [["a", "success"], ["bb", "success"]]
+    assert lines[-1].startswith("sum of steps")
@@ -0,0 +1,21 @@
+"""The synthetic projects used by the benchmarks."""
+
+import importlib
+
+import pytest
+from rdflib import Graph
+
+synthetic = importlib.import_module("ies-tools.src.build.synthetic")
+
+
+@pytest.mark.parametrize("triples, seed", [(100, 0), (100, 1), (103, 0), (250, 2), (1000, 0)])
+def test_triple_count_is_exact(tmp_path, triples, seed):
+    project = synthetic.generate_project(tmp_path, triples=triples, diagrams=0, seed=seed)
+    assert len(Graph().parse(project.ontology)) == project.ontology_triples
+    assert len(Graph().parse(project.data)) == project.data_triples
+    assert project.ontology_triples + project.data_triples == triples
+
+
+def test_diagrams(tmp_path):
+    project = synthetic.generate_project(tmp_path, triples=200, diagrams=3)
+    assert [path.suffix for path in project.diagrams] == [".mmd", ".dot", ".mmd"]
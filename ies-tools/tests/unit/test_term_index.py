@@ -0,0 +1,106 @@
+"""The persistent term index used by `find-term`."""
+
+import importlib
+import os
+
+import pytest
+
+term_index = importlib.import_module("ies-tools.src.build.term_index")
+
+PREFIXES = """@prefix ex: <http://example.org/ex#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix skos: <http://www.w3.org/2004/02/skos/core#> .
+"""
+PEOPLE = PREFIXES + """ex:Person a owl:Class ; rdfs:label "Person" ;
+    skos:definition "A human being." .
+ex:PersonState a owl:Class ; rdfs:label "Person State" ; skos:altLabel "State of a person" .
+ex:Vehicle a owl:Class ; rdfs:label "Vehicle" ; skos:definition "Something that carries a person." .
+ex:hasOwner a owl:ObjectProperty ; rdfs:label "has owner" .
+"""
+PLACES = PREFIXES + """ex:Location a owl:Class ; rdfs:label "Location" .
+"""
+
+
+def test_tokenize():
+    assert term_index.tokenize("PersonState") == ["person", "state"]
+    assert term_index.tokenize("has_owner of the IRIValue2") == ["has", "owner", "iri", "value", "2"]
+    assert term_index.tokenize("") == []
+
+
+def test_edit_distance():
+    assert term_index.edit_distance("vehicle", "vehicel", 2) == 2
+    assert term_index.edit_distance("person", "persn", 1) == 1
+    # Gives up past the limit
+    assert term_index.edit_distance("person", "vehicle", 1) == 2
+    assert [term_index.max_edits(t) for t in ("own", "owner", "locations")] == [0, 1, 2]
+
+
+@pytest.fixture
+def sources(tmp_path):
+    people, places = tmp_path / "people.ttl", tmp_path / "places.ttl"
+    people.write_text(PEOPLE)
+    places.write_text(PLACES)
+    return [people, places]
+
+
+def search(index_dir, query, **kwargs):
+    with term_index.TermIndex(index_dir / term_index.INDEX_FILE) as index:
+        return [match.record["curie"] for match in index.search(query, **kwargs)]
+
+
+def test_exact_search_ranking(sources, tmp_path):
+    index_dir = tmp_path / "index"
+    term_index.update_index(sources, index_dir)
+    # A label covered by the query outranks labels and definitions that merely contain it
+    ranked = search(index_dir, "person", prefix=False, fuzzy=False)
+    assert ranked == ["ex:Person", "ex:PersonState", "ex:Vehicle"]
+    # Terms matching more query words come first
+    assert search(index_dir, "person state")[0] == "ex:PersonState"
+    assert search(index_dir, "owner") == ["ex:hasOwner"]
+    assert search(index_dir, "person", limit=1) == ["ex:Person"]
+
+
+def test_prefix_and_fuzzy_search(sources, tmp_path):
+    index_dir = tmp_path / "index"
+    term_index.update_index(sources, index_dir)
+    assert search(index_dir, "loc") == ["ex:Location"]
+    assert search(index_dir, "loc", prefix=False) == []
+    assert search(index_dir, "vehicte") == ["ex:Vehicle"]
+    assert search(index_dir, "vehicte", fuzzy=False) == []
+    # A typo ranks below the exact match
+    assert search(index_dir, "persn")[:2] == ["ex:Person", "ex:PersonState"]
+
+    with term_index.TermIndex(index_dir / term_index.INDEX_FILE) as index:
+        exact, typo = index.search("vehicle")[0], index.search("vehicte")[0]
+    assert typo.score < exact.score
+
+
+def test_update_index(sources, tmp_path):
+    index_dir = tmp_path / "index"
+    people, places = sources
+    assert term_index.update_index(sources, index_dir) == (True, sources)
+    assert term_index.index_is_current(sources, index_dir)
+    assert term_index.update_index(sources, index_dir) == (False, [])
+
+    # Adding a term re-parses only the changed file
+    places.write_text(PLACES + 'ex:Region a owl:Class ; rdfs:label "Region" .\n')
+    assert not term_index.index_is_current(sources, index_dir)
+    assert term_index.update_index(sources, index_dir) == (True, [places])
+    assert search(index_dir, "region") == ["ex:Region"]
+
+    # Removing it again drops the term and the records cached for the old content
+    places.write_text(PLACES)
+    assert term_index.update_index(sources, index_dir) == (True, [places])
+    assert search(index_dir, "region") == []
+    assert len(list((index_dir / term_index.RECORDS_DIR).glob("*.json"))) == 2
+
+    # Touching a file without changing it does not rebuild the index
+    stat = people.stat()
+    os.utime(people, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert term_index.update_index(sources, index_dir) == (False, [])
+
+    # Dropping a source removes its terms
+    assert term_index.update_index([people], index_dir) == (True, [])
+    assert search(index_dir, "location") == []
+    assert search(index_dir, "person")[0] == "ex:Person"
@@ -0,0 +1,130 @@
+"""Syncing the shared tools from the template by content hash."""
+
+import importlib
+import json
+import subprocess
+
+import pytest
+from click.testing import CliRunner
+
+toolsync = importlib.import_module("ies-tools.src.github-tools.toolsync")
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.org",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.org",
+}
+TEMPLATE_FILES = {
+    ".github/workflows/ci.yml": "on: push\n",
+    "ies-tools/src/build/build.py": "print('build')\n",
+    "ies-tools/src/cli.py": "print('cli')\n",
+    "justfile": "build:\n",
+    "pyproject.toml": "[tool.poetry]\n",
+}
+
+
+def git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout
+
+
+def write(root, files):
+    for name, text in files.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(text)
+
+
+@pytest.fixture
+def template(tmp_path, monkeypatch):
+    for name, value in GIT_ENV.items():
+        monkeypatch.setenv(name, value)
+    root = tmp_path / "template"
+    write(root, TEMPLATE_FILES)
+    git(root, "init", "--quiet")
+    git(root, "add", "-A")
+    git(root, "commit", "--quiet", "-m", "Template")
+    return root
+
+
+@pytest.fixture
+def target(tmp_path):
+    """A project whose tools have drifted from the template."""
+    root = tmp_path / "target"
+    write(root, {
+        ".github/workflows/ci.yml": "on: push\n",
+        "ies-tools/src/build/build.py": "print('old build')\n",
+        "ies-tools/src/build/removed.py": "print('removed')\n",
+        "ies-tools/src/build/__pycache__/build.cpython-311.pyc": "cached",
+        "ies-tools/src/old/module.py": "print('old')\n",
+        "pyproject.toml": "[tool.poetry]\n",
+        "poetry.lock": "# project lock\n",
+        "src/ontology/ontology.ttl": "# the project's own ontology\n",
+    })
+    return root
+
+
+def test_list_sync_files(target):
+    assert toolsync.list_sync_files(target) == [
+        ".github/workflows/ci.yml",
+        "ies-tools/src/build/build.py",
+        "ies-tools/src/build/removed.py",
+        "ies-tools/src/old/module.py",
+        "poetry.lock",
+        "pyproject.toml",
+    ]
+
+
+def test_sync_drifted_target(template, target):
+    [plan] = toolsync.plan_sync(template, [target])
+    assert plan.added == ["ies-tools/src/cli.py", "justfile"]
+    assert plan.modified == ["ies-tools/src/build/build.py"]
+    # Individually synced files such as poetry.lock are never deleted
+    assert plan.deleted == ["ies-tools/src/build/removed.py", "ies-tools/src/old/module.py"]
+
+    toolsync.apply_plan(plan, template)
+    assert toolsync.build_manifest(target) == toolsync.build_manifest(template) | {
+        "poetry.lock": toolsync.hash_file(target / "poetry.lock")}
+    assert not (target / "ies-tools" / "src" / "old").exists()
+    assert (target / "ies-tools/src/build/__pycache__/build.cpython-311.pyc").exists()
+    assert (target / "src/ontology/ontology.ttl").exists()
+    assert not toolsync.plan_sync(template, [target])[0].has_changes
+
+
+def test_template_manifest_is_cached_under_git(template):
+    cache = template / ".git" / toolsync.MANIFEST_CACHE_FILE
+    manifest = toolsync.load_template_manifest(template)
+    assert sorted(manifest) == sorted(TEMPLATE_FILES)
+    cached = json.loads(cache.read_text())
+    assert cached == {"revision": git(template, "rev-parse", "HEAD").strip(), "manifest": manifest}
+
+    # The cache is trusted while the commit is unchanged...
+    cache.write_text(json.dumps({**cached, "manifest": {"justfile": "stale"}}))
+    assert toolsync.load_template_manifest(template) == {"justfile": "stale"}
+    # ...but not for a dirty tree
+    (template / "justfile").write_text("build: test\n")
+    assert toolsync.load_template_manifest(template)["justfile"] == toolsync.hash_file(template / "justfile")
+    # and it is rewritten for a new commit
+    git(template, "commit", "--quiet", "-am", "Change the justfile")
+    assert toolsync.load_template_manifest(template) == toolsync.build_manifest(template)
+    assert json.loads(cache.read_text())["revision"] == git(template, "rev-parse", "HEAD").strip()
+
+
+def test_sync_tools_command(template, target, tmp_path, monkeypatch):
+    github_env = tmp_path / "github-env"
+    monkeypatch.setenv("GITHUB_ENV", str(github_env))
+    report = tmp_path / "plans.json"
+    runner = CliRunner()
+
+    args = [str(target), "--template", str(template), "--json-output", str(report)]
+    result = runner.invoke(toolsync.sync_tools, args)
+    assert result.exit_code == 0, result.output
+    assert "2 added, 1 modified, 2 deleted" in result.output
+    assert (target / "ies-tools/src/build/removed.py").exists()
+    assert json.loads(report.read_text())[0]["has_changes"] is True
+
+    result = runner.invoke(toolsync.sync_tools, args + ["--apply"])
+    assert result.exit_code == 0, result.output
+    assert "Tools synced" in result.output
+    result = runner.invoke(toolsync.sync_tools, args)
+    assert "in sync" in result.output
+    assert github_env.read_text().splitlines() == ["has_changes=true", "has_changes=true", "has_changes=false"]
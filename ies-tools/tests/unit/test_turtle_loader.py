@@ -0,0 +1,57 @@
+"""Splitting and parallel parsing of large Turtle files."""
+
+import importlib
+import time
+
+turtle_loader = importlib.import_module("ies-tools.src.build.turtle_loader")
+
+TURTLE = b"""@prefix ex: <http://example.org/ex#> .
+# a comment with "a quote and a . dot
+ex:a ex:p \"\"\"long "" string.
+ with . dots\"\"\" , 'not # a comment' , "escaped \\" . quote" , 1.5 ; # trailing
+   ex:q <http://example.org/x#.y> , _:shared .
+PREFIX ex2: <http://example.org/other#>
+ex2:b ex:p '''x''' , _:shared .
+"""
+
+
+def test_statement_boundaries():
+    chunks = turtle_loader.split_statements(TURTLE, 1)
+    statements = [TURTLE[chunk.start:chunk.end].strip() for chunk in chunks]
+    # '.' and '#' inside strings, IRIs, decimals and comments do not end a statement
+    assert len(statements) == 5 and statements[-1] == b""
+    assert statements[1].startswith(b"# a comment") and statements[1].endswith(b"_:shared .")
+    assert statements[2] == b"PREFIX ex2: <http://example.org/other#>"
+    assert chunks[-1].header == b"@prefix ex: <http://example.org/ex#> .\nPREFIX ex2: <http://example.org/other#>\n"
+
+
+def test_unterminated_statement_fails_fast():
+    statement = b'ex:a ex:p "s #1" , """l "" x""" , <http://x/#y> , 1.5 , \'q\' ; # c "x\n'
+    buffer = b"ex:ok ex:p 1 .\n" + statement * 20000
+    start = time.perf_counter()
+    chunks = turtle_loader.split_statements(buffer, len(buffer))
+    assert time.perf_counter() - start < 5
+    assert [(chunk.start, chunk.end) for chunk in chunks] == [(0, len(buffer))]
+
+
+def test_chunked_parse_matches_whole(tmp_path, monkeypatch):
+    path = tmp_path / "data.ttl"
+    path.write_bytes(TURTLE)
+    whole = turtle_loader.load_turtle([path], jobs=1)
+    monkeypatch.setattr(turtle_loader, "PARALLEL_THRESHOLD", 0)
+    chunked = turtle_loader.load_turtle([path], jobs=2, chunk_size=1)
+    assert chunked.chunks > 1
+    assert turtle_loader.same_triples(whole, chunked)
+    # The blank node label is shared across chunks
+    assert len({o for _, _, o in chunked.triples() if o.__class__.__name__ == "BNode"}) == 1
+    assert chunked.namespaces["ex2"] == "http://example.org/other#"
+
+
+def test_parsed_whole_without_parser_state(tmp_path, monkeypatch):
+    path = tmp_path / "data.ttl"
+    path.write_bytes(TURTLE)
+    monkeypatch.setattr(turtle_loader, "PARALLEL_THRESHOLD", 0)
+    monkeypatch.setattr(turtle_loader, "_chunking_supported", lambda: False)
+    load = turtle_loader.load_turtle([path], jobs=2, chunk_size=1)
+    assert load.chunks == 1
+    assert len(load.store) == 8
@@ -0,0 +1,38 @@
+"""Query cache keys of the workspace."""
+
+import importlib
+
+import pytest
+
+workspace = importlib.import_module("ies-tools.src.build.workspace")
+normalise_query = workspace.normalise_query
+
+
+def test_comments_and_whitespace_are_ignored():
+    query = """# Every label
+    SELECT ?s   ?label   # the label
+    WHERE {
+        ?s rdfs:label ?label .
+    }
+    """
+    assert normalise_query(query) == "SELECT ?s ?label WHERE { ?s rdfs:label ?label . }"
+
+
+@pytest.mark.parametrize("first, second", [
+    ('SELECT * { ?s ?p "tag #1" }', 'SELECT * { ?s ?p "tag #2" }'),
+    ("SELECT * { ?s ?p 'tag #1' }", "SELECT * { ?s ?p 'tag #2' }"),
+    ('SELECT * { ?s ?p """a\n#1""" }', 'SELECT * { ?s ?p """a\n#2""" }'),
+    ("SELECT * { ?s ?p '''a # 1''' }", "SELECT * { ?s ?p '''a # 2''' }"),
+    ("SELECT * { <http://ex.org/o#A> ?p ?o }", "SELECT * { <http://ex.org/o#B> ?p ?o }"),
+    ('SELECT * { ?s ?p "a  b" }', 'SELECT * { ?s ?p "a b" }'),
+    (r'SELECT * { ?s ?p "say \"#1\"" }', r'SELECT * { ?s ?p "say \"#2\"" }'),
+])
+def test_literals_and_iris_are_kept(first, second):
+    assert normalise_query(first) != normalise_query(second)
+
+
+def test_cache_keeps_queries_apart():
+    cache = workspace.QueryCache()
+    cache.put(1, 'ASK { ?s ?p "tag #1" }', True)
+    assert cache.get(1, 'ASK { ?s ?p "tag #2" }') is None
+    assert cache.get(1, 'ASK {\n  ?s ?p "tag #1"  # comment\n}') is True